@@ -0,0 +1,78 @@
+"""Validation throughput of a shared validator running its rules through the
+plan interpreter against the validator generated with SIEVE_CODEGEN.
+
+    python benchmarks/codegen.py [seconds]
+
+Each mode runs in a fresh interpreter, over a mix of valid and invalid
+payloads; the reported rate is the best of three rounds.
+"""
+import os
+import sys
+import json
+import subprocess
+
+
+probe = '''
+import json
+from timeit import default_timer
+
+from flask_sieve.validator import Validator
+
+codegen, seconds = %r, %f
+
+validator = Validator(rules={
+    'name': ['required', 'string', 'max:40'],
+    'email': ['required', 'email'],
+    'age': ['sometimes', 'integer', 'between:18,120'],
+    'role': ['required', 'in:admin,editor,viewer'],
+    'code': ['bail', 'required', 'regex:^[A-Z]{3}-[0-9]{4}$', 'size:8'],
+    'terms': ['accepted'],
+    'nickname': ['required_with:age', 'string', 'min:2'],
+    'address.city': ['sometimes', 'string', 'max:60'],
+})
+validator.set_codegen(codegen)
+validator.compile()
+payloads = [
+    {'name': 'Ada Lovelace', 'email': 'ada@example.com', 'age': '36',
+     'role': 'admin', 'code': 'ABC-1234', 'terms': 'yes', 'nickname': 'ada',
+     'address': {'city': 'London'}},
+    {'name': 'x' * 50, 'email': 'not an email', 'age': '7', 'role': 'root',
+     'code': 'abc', 'terms': 'no'},
+    {'name': 'Grace', 'email': 'grace@example.com', 'role': 'viewer',
+     'code': 'XYZ-0001', 'terms': True},
+]
+best = 0.0
+for _ in range(3):
+    calls = 0
+    start = default_timer()
+    deadline = start + seconds
+    while default_timer() < deadline:
+        for payload in payloads:
+            validator.validate(payload)
+        calls += len(payloads)
+    best = max(best, calls / (default_timer() - start))
+print(json.dumps({'per_second': best}))
+'''
+
+
+def run(codegen, seconds):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [root] + [path for path in [env.get('PYTHONPATH')] if path])
+    output = subprocess.check_output(
+        [sys.executable, '-c', probe % (codegen, seconds)], env=env)
+    return json.loads(output.decode('utf-8'))['per_second']
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    interpreted = run(False, seconds)
+    generated = run(True, seconds)
+    print('%-24s %12.0f validations/s' % ('plan interpreter', interpreted))
+    print('%-24s %12.0f validations/s' % ('generated validator', generated))
+    print('%-24s %12.2fx' % ('speedup', generated / interpreted))
+
+
+if __name__ == '__main__':
+    main()
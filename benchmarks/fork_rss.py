@@ -0,0 +1,128 @@
+"""Private memory of forked workers sharing preloaded validators, with and
+without Sieve.freeze() before the fork (Linux only, reads /proc).
+
+    python benchmarks/fork_rss.py [classes] [workers] [requests]
+
+Each variant runs in a fresh interpreter that preloads the request classes,
+optionally freezes them, then forks workers like gunicorn --preload does.
+Every worker serves requests, runs a full garbage collection and reports
+the memory it no longer shares with the master.
+"""
+import os
+import sys
+import json
+import subprocess
+
+
+probe = '''
+import os
+import gc
+import sys
+import json
+
+from flask import Flask
+from flask_sieve import Sieve, JsonRequest, validate
+
+classes, workers, requests, freeze = %d, %d, %d, %s
+
+
+def make_request_class(index):
+    rules = {
+        'name_%%d' %% index: ['required', 'string', 'max:%%d' %% (index + 8)],
+        'email_%%d' %% index: ['required', 'email'],
+        'role_%%d' %% index: ['in:admin,editor,viewer,guest_%%d' %% index],
+        'code_%%d' %% index: ['sometimes', 'regex:^[A-Z]{%%d}$' %% (index %% 7 + 1)],
+        'age_%%d' %% index: ['sometimes', 'integer', 'between:%%d,120' %% (index %% 18)],
+    }
+    return type('Request%%d' %% index, (JsonRequest,),
+                {'rules': lambda self: rules})
+
+
+app = Flask(__name__)
+request_classes = [make_request_class(index) for index in range(classes)]
+for index, Request in enumerate(request_classes):
+    app.add_url_rule('/%%d' %% index, 'view_%%d' %% index,
+                     validate(Request)(lambda: 'ok'), methods=['POST'])
+app.config['SIEVE_PRELOAD'] = request_classes
+sieve = Sieve(app)
+if freeze:
+    sieve.freeze()
+
+
+def memory():
+    fields = {}
+    with open('/proc/self/smaps_rollup') as smaps:
+        for line in smaps:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    return fields
+
+
+pipes = []
+for worker in range(workers):
+    read_end, write_end = os.pipe()
+    if os.fork() == 0:
+        os.close(read_end)
+        client = app.test_client()
+        for call in range(requests):
+            index = (worker + call) %% classes
+            client.post('/%%d' %% index, json={
+                'name_%%d' %% index: 'x', 'email_%%d' %% index: 'a@b.com'})
+        gc.collect()
+        os.write(write_end, json.dumps(memory()).encode('utf-8'))
+        os._exit(0)
+    os.close(write_end)
+    pipes.append(read_end)
+
+samples = []
+for read_end in pipes:
+    data = b''
+    while True:
+        chunk = os.read(read_end, 65536)
+        if not chunk:
+            break
+        data += chunk
+    samples.append(json.loads(data.decode('utf-8')))
+    os.wait()
+print(json.dumps(samples))
+'''
+
+
+def measure(classes, workers, requests, freeze):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [root] + [path for path in [env.get('PYTHONPATH')] if path])
+    output = subprocess.check_output(
+        [sys.executable, '-c',
+         probe % (classes, workers, requests, freeze)], env=env)
+    return json.loads(output.decode('utf-8'))
+
+
+def mean(samples, *fields):
+    return sum(sum(sample.get(field, 0) for field in fields)
+               for sample in samples) / float(len(samples))
+
+
+def main():
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        print('needs Linux 4.14 or later for /proc/self/smaps_rollup')
+        return
+    classes = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    requests = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+    print('%d request classes, %d workers, %d requests each' % (
+        classes, workers, requests))
+    print('%-10s %16s %14s %12s' % ('variant', 'private KiB', 'shared KiB',
+                                    'RSS KiB'))
+    for name, freeze in [('warm', False), ('frozen', True)]:
+        samples = measure(classes, workers, requests, freeze)
+        print('%-10s %16.0f %14.0f %12.0f' % (
+            name, mean(samples, 'Private_Clean', 'Private_Dirty'),
+            mean(samples, 'Shared_Clean', 'Shared_Dirty'),
+            mean(samples, 'Rss')))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Import time and peak memory of the Flask-free core against the full
+Flask integration, each measured in a fresh interpreter.
+
+    python benchmarks/import_cost.py [runs]
+"""
+import sys
+import json
+import subprocess
+
+
+probe = '''
+import sys
+import json
+import resource
+from timeit import default_timer
+
+start = default_timer()
+%s
+imported = default_timer() - start
+validator = Validator(rules={'email': ['required', 'email']},
+                      request={'email': 'a@b.com'})
+assert validator.passes()
+print(json.dumps({
+    'import_ms': imported * 1000.0,
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'flask_loaded': 'flask' in sys.modules,
+    'werkzeug_loaded': 'werkzeug' in sys.modules,
+}))
+'''
+
+variants = [
+    ('flask_sieve.core', 'from flask_sieve.core import Validator'),
+    ('flask_sieve + Flask', 'from flask_sieve import Sieve, Validator'),
+]
+
+
+def measure(statement, runs):
+    samples = []
+    for _ in range(runs):
+        output = subprocess.check_output(
+            [sys.executable, '-c', probe % (statement,)])
+        samples.append(json.loads(output.decode('utf-8')))
+    samples.sort(key=lambda sample: sample['import_ms'])
+    return samples[len(samples) // 2]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print('%-22s %12s %14s %8s' % ('variant', 'import ms', 'max RSS KiB',
+                                   'flask'))
+    for name, statement in variants:
+        sample = measure(statement, runs)
+        print('%-22s %12.1f %14d %8s' % (
+            name, sample['import_ms'], sample['max_rss_kb'],
+            sample['flask_loaded'] or sample['werkzeug_loaded'],
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Boot time of an app preloading many request classes, compiling every rule
+set against loading it from SIEVE_PLAN_CACHE_DIR.
+
+    python benchmarks/plan_cache.py [classes] [runs]
+
+Each boot runs in a fresh interpreter; the cache directory is emptied before
+the first cached boot, which writes it.
+"""
+import os
+import sys
+import json
+import shutil
+import tempfile
+import subprocess
+
+
+probe = '''
+import sys
+import json
+from timeit import default_timer
+
+from flask import Flask
+from flask_sieve import Sieve, JsonRequest
+
+classes, cache_dir = %d, %r
+
+
+def make_request_class(index):
+    rules = {
+        'name_%%d' %% index: ['required', 'string', 'max:%%d' %% (index + 8)],
+        'email_%%d' %% index: ['required', 'email'],
+        'role_%%d' %% index: ['in:admin,editor,viewer,guest_%%d' %% index],
+        'code_%%d' %% index: ['sometimes',
+                             'regex:^([A-Z]+|[0-9]{%%d})(-[a-z]+)*$' %% (index %% 7 + 1)],
+        'when_%%d' %% index: ['sometimes', 'after:2020-01-01'],
+        'age_%%d' %% index: ['sometimes', 'integer', 'between:%%d,120' %% (index %% 18)],
+    }
+    return type('Request%%d' %% index, (JsonRequest,),
+                {'rules': lambda self: rules})
+
+
+app = Flask(__name__)
+app.config['SIEVE_PRELOAD'] = [make_request_class(index)
+                               for index in range(classes)]
+app.config['SIEVE_REGEX_SAFETY'] = 'warn'
+if cache_dir is not None:
+    app.config['SIEVE_PLAN_CACHE_DIR'] = cache_dir
+# the parsers the rules import are loaded either way
+import dateutil.parser
+import requests
+start = default_timer()
+Sieve(app)
+print(json.dumps({'boot_ms': (default_timer() - start) * 1000.0}))
+'''
+
+
+def boot(classes, cache_dir):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [root] + [path for path in [env.get('PYTHONPATH')] if path])
+    output = subprocess.check_output(
+        [sys.executable, '-c', probe % (classes, cache_dir)], env=env)
+    return json.loads(output.decode('utf-8'))['boot_ms']
+
+
+def median(samples):
+    samples = sorted(samples)
+    return samples[len(samples) // 2]
+
+
+def main():
+    classes = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+    cache_dir = tempfile.mkdtemp()
+    try:
+        compiled = median([boot(classes, None) for _ in range(runs)])
+        writing = boot(classes, cache_dir)
+        cached = median([boot(classes, cache_dir) for _ in range(runs)])
+    finally:
+        shutil.rmtree(cache_dir)
+    print('%d request classes, median of %d boots' % (classes, runs))
+    print('%-24s %10.1f ms' % ('compiled', compiled))
+    print('%-24s %10.1f ms' % ('compiled, writing cache', writing))
+    print('%-24s %10.1f ms' % ('loaded from cache', cached))
+
+
+if __name__ == '__main__':
+    main()
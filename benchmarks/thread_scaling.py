@@ -0,0 +1,230 @@
+"""Throughput of one shared validator from 1 to N threads, and the functions
+whose share of the run grows with the thread count (contention hotspots).
+
+    python benchmarks/thread_scaling.py [--threads N] [--seconds S]
+                                        [--python INTERPRETER ...]
+
+Every interpreter is measured in a fresh process: the running one, those
+named with --python, and free-threaded builds (python3.13t, python3.14t)
+found on the PATH.
+"""
+import os
+import sys
+import json
+import shutil
+import pstats
+import cProfile
+import argparse
+import threading
+import subprocess
+from timeit import default_timer
+
+
+free_threaded_names = ['python3.13t', 'python3.14t', 'python3t']
+
+# only rules without third-party dependencies, so any interpreter can run them
+rules = {
+    'name': ['required', 'string', 'max:64'],
+    'email': ['required', 'email'],
+    'age': ['required', 'integer', 'between:18,120'],
+    'role': ['required', 'in:admin,editor,viewer'],
+    'nickname': ['required_with:age', 'alpha_dash'],
+    'website': ['sometimes', 'regex:^https?://'],
+    'tags': ['array', 'distinct'],
+}
+
+
+def corpus(size=256):
+    payloads = []
+    for index in range(size):
+        payload = {
+            'name': 'user %d' % index,
+            'email': 'user%d@example.com' % index,
+            'age': str(18 + index % 90),
+            'role': ['admin', 'editor', 'viewer'][index % 3],
+            'nickname': 'user_%d' % index,
+            'website': 'https://example.com/%d' % index,
+            'tags': ['a', 'b', 'c'],
+        }
+        # a quarter of the corpus fails, so messages are built too
+        if index % 4 == 0:
+            payload['email'] = 'not an email'
+            payload['tags'] = ['a', 'a']
+        payloads.append(payload)
+    return payloads
+
+
+def shared_validator():
+    from flask_sieve.core import Validator
+    validator = Validator(rules=rules)
+    # compile before timing
+    validator.validate(corpus(1)[0])
+    return validator
+
+
+def validate_payloads(validator, payloads, offset, calls):
+    for call in range(calls):
+        result = validator.validate(payloads[(offset + call) % len(payloads)])
+        if result.fails():
+            result.messages()
+
+
+def throughput(validator, payloads, threads, seconds):
+    start = threading.Barrier(threads + 1)
+    stop = threading.Event()
+    counts = [0] * threads
+
+    def work(worker):
+        start.wait()
+        offset = worker * 17
+        while not stop.is_set():
+            validate_payloads(validator, payloads, offset, 32)
+            offset += 32
+            counts[worker] += 32
+
+    workers = [threading.Thread(target=work, args=(worker,))
+               for worker in range(threads)]
+    for worker in workers:
+        worker.start()
+    start.wait()
+    began = default_timer()
+    stop.wait(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return sum(counts) / (default_timer() - began)
+
+
+def profile_shares(validator, payloads, threads, calls):
+    start = threading.Barrier(threads)
+    profiles = [cProfile.Profile() for _ in range(threads)]
+
+    def work(worker):
+        start.wait()
+        # a profiler only sees the thread that enabled it
+        profiles[worker].enable()
+        validate_payloads(validator, payloads, worker * 17, calls)
+        profiles[worker].disable()
+
+    workers = [threading.Thread(target=work, args=(worker,))
+               for worker in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    stats = pstats.Stats(profiles[0])
+    for profile in profiles[1:]:
+        stats.add(profile)
+    total = sum(entry[2] for entry in stats.stats.values()) or 1.0
+    shares = {}
+    for (filename, line, name), entry in stats.stats.items():
+        label = '%s:%d(%s)' % (os.path.basename(filename), line, name)
+        shares[label] = entry[2] / total
+    return shares
+
+
+def hotspots(base, scaled, count=10):
+    growth = []
+    for label, share in scaled.items():
+        growth.append((share - base.get(label, 0.0), label,
+                       base.get(label, 0.0), share))
+    growth.sort(reverse=True)
+    return [entry for entry in growth[:count] if entry[0] > 0]
+
+
+def thread_counts(max_threads):
+    counts = [1]
+    while counts[-1] * 2 <= max_threads:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_threads:
+        counts.append(max_threads)
+    return counts
+
+
+def gil_enabled():
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def run_worker(max_threads, seconds):
+    validator = shared_validator()
+    payloads = corpus()
+    scaling = [(threads, throughput(validator, payloads, threads, seconds))
+               for threads in thread_counts(max_threads)]
+    calls = 2000
+    base = profile_shares(validator, payloads, 1, calls)
+    scaled = profile_shares(validator, payloads, max_threads,
+                            calls // max_threads or 1)
+    print(json.dumps({
+        'version': sys.version.split()[0],
+        'gil_enabled': gil_enabled(),
+        'scaling': scaling,
+        'hotspots': hotspots(base, scaled),
+    }))
+
+
+def interpreters(extra):
+    found = [sys.executable] + list(extra)
+    for name in free_threaded_names:
+        path = shutil.which(name)
+        if path is not None:
+            found.append(path)
+    unique = []
+    for interpreter in found:
+        if os.path.realpath(interpreter) not in \
+                [os.path.realpath(known) for known in unique]:
+            unique.append(interpreter)
+    return unique
+
+
+def measure(interpreter, max_threads, seconds):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [root] + [path for path in [env.get('PYTHONPATH')] if path])
+    output = subprocess.check_output(
+        [interpreter, os.path.abspath(__file__), '--worker',
+         '--threads', str(max_threads), '--seconds', str(seconds)], env=env)
+    return json.loads(output.decode('utf-8'))
+
+
+def report(interpreter, sample):
+    print('%s (Python %s, GIL %s)' % (
+        interpreter, sample['version'],
+        'enabled' if sample['gil_enabled'] else 'disabled'))
+    print('%8s %16s %9s %11s' % ('threads', 'validations/s', 'speedup',
+                                 'efficiency'))
+    single = sample['scaling'][0][1]
+    for threads, rate in sample['scaling']:
+        print('%8d %16.0f %8.2fx %10.0f%%' % (
+            threads, rate, rate / single, 100.0 * rate / single / threads))
+    print('contention hotspots, share of profiled time at 1 -> %d threads:'
+          % (sample['scaling'][-1][0],))
+    for growth, label, base, scaled in sample['hotspots']:
+        print('  %+6.1f%%  %5.1f%% -> %5.1f%%  %s' % (
+            100.0 * growth, 100.0 * base, 100.0 * scaled, label))
+    print('')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int,
+                        default=min(8, os.cpu_count() or 1))
+    parser.add_argument('--seconds', type=float, default=2.0)
+    parser.add_argument('--python', action='append', default=[])
+    parser.add_argument('--worker', action='store_true')
+    args = parser.parse_args()
+    if args.worker:
+        run_worker(args.threads, args.seconds)
+        return
+    for interpreter in interpreters(args.python):
+        try:
+            sample = measure(interpreter, args.threads, args.seconds)
+        except (OSError, subprocess.CalledProcessError) as error:
+            print('%s: skipped (%s)\n' % (interpreter, error))
+            continue
+        report(interpreter, sample)
+
+
+if __name__ == '__main__':
+    main()
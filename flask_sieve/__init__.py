@@ -1,13 +1,50 @@
-from .requests import JsonRequest, FormRequest
-from .validator import validate, Validator
-from .exceptions import ValidationException, register_error_handler
+import sys
+from importlib import import_module
 
 
-class Sieve:
-    def __init__(self, app=None):
-        if app is not None:
-            self.init_app(app)
+__version__ = '2.0.1'
 
-    @staticmethod
-    def init_app(app):
-        register_error_handler(app)
+# the Flask integration is only imported once one of its names is used, so
+# flask_sieve.core can validate plain dicts without loading Flask
+_exports = {
+    'Sieve': 'flask_sieve.extension',
+    'JsonRequest': 'flask_sieve.requests',
+    'FormRequest': 'flask_sieve.requests',
+    'validate': 'flask_sieve.validator',
+    'async_validate': 'flask_sieve.validator',
+    'Validator': 'flask_sieve.validator',
+    'Hooks': 'flask_sieve.hooks',
+    'Metrics': 'flask_sieve.metrics',
+    'CostTable': 'flask_sieve.cost_table',
+    'UrlChecker': 'flask_sieve.url_checker',
+    'LRUResultCache': 'flask_sieve.result_cache',
+    'SQLiteResultCache': 'flask_sieve.result_cache',
+    'DatabaseLookup': 'flask_sieve.lookups',
+    'RegexMatcher': 'flask_sieve.regex_safety',
+    'PayloadLimits': 'flask_sieve.payload_limits',
+    'StreamingRequest': 'flask_sieve.streaming',
+    'ValidationException': 'flask_sieve.exceptions',
+    'register_error_handler': 'flask_sieve.exceptions',
+}
+
+__all__ = sorted(_exports)
+
+
+def __getattr__(name):
+    module = _exports.get(name)
+    if module is None:
+        raise AttributeError(
+            "module 'flask_sieve' has no attribute '%s'" % (name,))
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
+
+
+# module __getattr__ needs Python 3.7
+if sys.version_info < (3, 7):
+    for _name in __all__:
+        __getattr__(_name)
@@ -0,0 +1,3 @@
+cacheable_rules = [
+    'active_url',
+]
@@ -0,0 +1,241 @@
+import re
+
+from .rules_processor import email_pattern, accepted_values, boolean_values
+from .conditional_inclusion_rules import conditional_inclusion_rules
+
+
+string_type_rules = ['alpha', 'alpha_dash', 'string']
+
+
+class _Source:
+    def __init__(self):
+        self.lines = []
+        self.constants = {}
+
+    def line(self, depth, text):
+        self.lines.append('    ' * depth + text)
+
+    def constant(self, value):
+        name = '_c%d' % (len(self.constants),)
+        self.constants[name] = value
+        return name
+
+    def text(self):
+        return '\n'.join(self.lines) + '\n'
+
+
+def generate_validator(processor, plan):
+    # writes the plan out as one function filling validations the way the
+    # processor would; None for plans it doesn't cover, which the processor
+    # then runs itself
+    source = _Source()
+    source.line(0, 'def generated_validator(request, validations, '
+                   'guard_attribute):')
+    source.line(1, 'passes = True')
+    for attribute, rules, should_bail, steps in plan:
+        if not _write_attribute(processor, source, attribute, rules,
+                                should_bail, steps):
+            return None
+    source.line(1, 'return passes')
+    text = source.text()
+    namespace = dict(source.constants)
+    exec(compile(text, '<flask_sieve generated validator>', 'exec'),
+         namespace)
+    generated = namespace['generated_validator']
+    generated.source = text
+    return generated
+
+
+def _write_attribute(processor, source, attribute, rules, should_bail,
+                     steps):
+    names = [rule['name'] for rule in rules]
+    conditional_rules = [rule for rule in rules
+                         if rule['name'] in conditional_inclusion_rules]
+    for rule in conditional_rules:
+        # nullability is worked out once an attribute, which only holds
+        # for the built-in conditional rules
+        if 'validate_' + rule['name'] in processor.custom_handlers():
+            return False
+    for step in steps:
+        if step[3]:
+            return False
+    attribute_name = source.constant(attribute)
+    rules_name = source.constant(rules)
+    source.line(1, 'guard = guard_attribute(%s) '
+                   'if guard_attribute is not None else None'
+                % (attribute_name,))
+    source.line(1, 'if guard is not None:')
+    source.line(2, 'validations[%s] = [guard]' % (attribute_name,))
+    source.line(2, 'passes = False')
+    if should_bail:
+        source.line(2, 'return False')
+    source.line(1, 'else:')
+    if not steps:
+        source.line(2, 'validations[%s] = []' % (attribute_name,))
+        return True
+    _write_lookup(source, attribute)
+    is_nullable = _write_nullable(processor, source, attribute_name,
+                                  rules_name, names, conditional_rules)
+    if any(name in string_type_rules for name in names):
+        source.line(2, "attribute_type = 'string'")
+    else:
+        source.line(2, 'attribute_type = %s(value, %s)' % (
+            source.constant(processor._get_type), rules_name))
+    source.line(2, 'validated = [None] * %d' % (len(steps),))
+    if should_bail:
+        # stopping at the first failure in written order runs no rule that
+        # written order would have skipped
+        steps = sorted(steps, key=lambda step: step[0])
+    for index, rule, handler, _, is_async, _ in steps:
+        params_name = source.constant(rule['params'])
+        depth = 2
+        if is_nullable:
+            source.line(2, 'if value is None and nullable:')
+            source.line(3, 'is_valid = True')
+            source.line(2, 'else:')
+            depth = 3
+        check = _inline_check(processor, source, rule, handler, params_name,
+                              rules_name)
+        if check is None:
+            call = '%s(value=value, attribute=%s, params=%s, ' \
+                'nullable=nullable, rules=%s)' % (
+                    source.constant(handler), attribute_name, params_name,
+                    rules_name)
+            if is_async:
+                call = '%s(%s)' % (source.constant(processor._run_coroutine),
+                                   call)
+            check = ['is_valid = ' + call]
+        for line in check:
+            source.line(depth, line)
+        source.line(2, 'validated[%d] = {%r: %s, %r: %r, %r: is_valid, '
+                       '%r: attribute_type, %r: %s}' % (
+                           index, 'attribute', attribute_name, 'rule',
+                           rule['name'], 'is_valid', 'attribute_type',
+                           'params', params_name))
+        source.line(2, 'if not is_valid:')
+        source.line(3, 'passes = False')
+        if should_bail:
+            source.line(3, 'validations[%s] = validated[:%d]'
+                        % (attribute_name, index + 1))
+            source.line(3, 'return False')
+    source.line(2, 'validations[%s] = validated' % (attribute_name,))
+    return True
+
+
+def _write_lookup(source, attribute):
+    # the same walk as the processor's, without splitting the name each time
+    source.line(2, 'value = None')
+    source.line(2, 'present = False')
+    source.line(2, 'node = request')
+    accessors = attribute.split('.')
+    depth = 2
+    for accessor in accessors[:-1]:
+        source.line(depth, 'if %r in node:' % (accessor,))
+        source.line(depth + 1, 'node = node[%r]' % (accessor,))
+        depth += 1
+    source.line(depth, 'if %r in node:' % (accessors[-1],))
+    source.line(depth + 1, 'value = node[%r]' % (accessors[-1],))
+    source.line(depth + 1, 'present = True')
+
+
+def _write_nullable(processor, source, attribute_name, rules_name, names,
+                    conditional_rules):
+    if 'nullable' in names:
+        source.line(2, 'nullable = True')
+        return True
+    checks = ['%s(value=value, attribute=%s, params=%s, nullable=False, '
+              'rules=%s)' % (
+                  source.constant(processor._get_rule_handler(rule['name'])),
+                  attribute_name, source.constant(rule['params']),
+                  rules_name)
+              for rule in conditional_rules]
+    if 'sometimes' in names:
+        if checks:
+            source.line(2, 'nullable = True if value is None else bool(%s)'
+                        % (' and '.join(checks),))
+        else:
+            source.line(2, 'nullable = value is None')
+        return True
+    if checks:
+        source.line(2, 'nullable = bool(%s)' % (' and '.join(checks),))
+        return True
+    source.line(2, 'nullable = False')
+    return False
+
+
+def _inline_check(processor, source, rule, handler, params_name, rules_name):
+    name = rule['name']
+    params = rule['params']
+    # wrapped handlers (metrics, hooks, result cache) and custom rules are
+    # called as they are
+    if 'validate_' + name in processor.custom_handlers() or \
+            handler != getattr(processor, 'validate_' + name, None):
+        return None
+    if name in ['bail', 'nullable', 'sometimes']:
+        return ['is_valid = True']
+    if name == 'accepted':
+        return ['is_valid = value in %s' % (
+            source.constant(tuple(accepted_values)),)]
+    if name == 'boolean':
+        return ['is_valid = value in %s' % (
+            source.constant(tuple(boolean_values)),)]
+    if name == 'string':
+        return ['is_valid = isinstance(value, str)']
+    if name == 'integer':
+        return ['is_valid = str(value).isdigit()']
+    if name == 'in':
+        return ['is_valid = value in %s' % (params_name,)]
+    if name == 'not_in':
+        return ['is_valid = not (value in %s)' % (params_name,)]
+    if name == 'required':
+        return ['is_valid = False if ((not value and value != False and '
+                'value != 0) and not nullable) else present']
+    if name == 'email':
+        return ['is_valid = %s.match(str(value)) is not None'
+                % (source.constant(email_pattern),)]
+    if name in ['regex', 'not_regex'] and params and \
+            processor._regex_matcher is None:
+        try:
+            pattern = source.constant(re.compile(params[0]))
+        except Exception:
+            return None
+        if name == 'regex':
+            return ['is_valid = %s.match(value) is not None' % (pattern,)]
+        return ['is_valid = %s.match(value) is None' % (pattern,)]
+    if name in ['max', 'min', 'between', 'size']:
+        return _inline_size_check(processor, source, name, params,
+                                  rules_name)
+    return None
+
+
+def _inline_size_check(processor, source, name, params, rules_name):
+    # the bounds are parameters, so their sizes are worked out once here
+    try:
+        if name == 'size':
+            float(params[0])
+            bound = float(params[0]) if params[0].count('.') > 0 \
+                else int(params[0])
+        else:
+            bounds = [processor._get_size(param)
+                      for param in params[:2 if name == 'between' else 1]]
+    except Exception:
+        return None
+    # missing parameters are left to the handler, which reports them
+    if name != 'size' and len(bounds) < (2 if name == 'between' else 1):
+        return None
+    get_size = source.constant(processor._get_size)
+    if name == 'size':
+        return ['is_valid = %s(value, %s) == %s'
+                % (get_size, rules_name, source.constant(bound))]
+    if name == 'min':
+        return ['is_valid = %s(value, %s) >= %s'
+                % (get_size, rules_name, source.constant(bounds[0]))]
+    if name == 'max':
+        return ['if not value and value != 0:',
+                '    is_valid = False',
+                'else:',
+                '    is_valid = %s(value, %s) <= %s'
+                % (get_size, rules_name, source.constant(bounds[0]))]
+    return ['size = %s(value, %s)' % (get_size, rules_name),
+            'is_valid = %s <= size and size <= %s'
+            % (source.constant(bounds[0]), source.constant(bounds[1]))]
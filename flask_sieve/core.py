@@ -0,0 +1,20 @@
+# Validation without Flask: nothing imported here loads Flask or Werkzeug,
+# so queue consumers and batch jobs can validate plain dicts cheaply.
+from flask_sieve.parser import Parser
+from flask_sieve.translator import Translator
+from flask_sieve.rules_processor import RulesProcessor
+from flask_sieve.validator import Validator, ValidationResult
+from flask_sieve.validation_context import ValidationContext
+from flask_sieve.payload_limits import PayloadLimits
+from flask_sieve.exceptions import ValidationException
+
+__all__ = [
+    'Parser',
+    'PayloadLimits',
+    'RulesProcessor',
+    'Translator',
+    'ValidationContext',
+    'ValidationException',
+    'ValidationResult',
+    'Validator',
+]
@@ -0,0 +1,19 @@
+from flask_sieve.rule_costs import rule_costs, io_cost
+
+
+class CostTable:
+    def __init__(self, costs=None, default_cost=io_cost):
+        self._costs = dict(rule_costs)
+        self._costs.update(costs or {})
+        self._default_cost = default_cost
+
+    def cost(self, rule):
+        return self._costs.get(rule, self._default_cost)
+
+    def set_cost(self, rule, cost):
+        self._costs[rule] = cost
+
+    def learn(self, metrics, min_calls=100):
+        for rule, counters in metrics.as_dict()['rules'].items():
+            if counters['calls'] >= min_calls:
+                self._costs[rule] = counters['seconds'] / counters['calls']
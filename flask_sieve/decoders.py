@@ -0,0 +1,64 @@
+import io
+import json
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+
+ndjson_mimetypes = ['application/x-ndjson', 'application/ndjson',
+                    'application/jsonl']
+msgpack_mimetypes = ['application/msgpack', 'application/x-msgpack',
+                     'application/vnd.msgpack']
+cbor_mimetypes = ['application/cbor']
+
+
+class NdjsonDecoder:
+    def __call__(self, data):
+        return [item for _, item in self.iter_items(io.BytesIO(data))]
+
+    @staticmethod
+    def iter_items(stream):
+        index = 0
+        for line in stream:
+            if not line.strip():
+                continue
+            yield index, json.loads(line)
+            index += 1
+
+
+def decode_msgpack(data):
+    return msgpack.unpackb(data, raw=False)
+
+
+def decode_cbor(data):
+    return cbor2.loads(data)
+
+
+def default_decoders():
+    decoders = {}
+    for mimetype in ndjson_mimetypes:
+        decoders[mimetype] = NdjsonDecoder()
+    if msgpack is not None:
+        for mimetype in msgpack_mimetypes:
+            decoders[mimetype] = decode_msgpack
+    if cbor2 is not None:
+        for mimetype in cbor_mimetypes:
+            decoders[mimetype] = decode_cbor
+    return decoders
+
+
+def iter_decoded_items(decoder, stream):
+    # decoders of record formats can hand out one item at a time
+    if hasattr(decoder, 'iter_items'):
+        return decoder.iter_items(stream)
+    items = decoder(stream.read())
+    if not isinstance(items, list):
+        raise ValueError('Decoded body is not a list')
+    return enumerate(items)
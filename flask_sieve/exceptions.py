@@ -1,12 +1,11 @@
-from flask import jsonify
-
-
 class ValidationException(Exception):
     def __init__(self, errors):
         self.errors = errors
 
 
 def register_error_handler(app):
+    from flask import jsonify
+
     def validations_error_handler(ex):
         response = {
             'message': app.config.get('SIEVE_RESPONSE_MESSAGE', 'Validation error'),
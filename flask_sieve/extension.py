@@ -0,0 +1,177 @@
+import gc
+
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Response, abort, request
+
+from .hooks import Hooks
+from .metrics import Metrics
+from .cost_table import CostTable
+from .url_checker import UrlChecker
+from .result_cache import LRUResultCache
+from .regex_safety import RegexMatcher
+from .payload_limits import PayloadLimits
+from .plan_cache import PlanCache
+from .streaming import streaming_request_class
+from .decoders import default_decoders
+from .exceptions import register_error_handler
+from .validator import validated_requests
+
+
+class Sieve:
+    def __init__(self, app=None):
+        self.metrics = None
+        self.slow_validation_ms = None
+        self.cost_table = None
+        self.io_executor = None
+        self.io_timeout = None
+        self.async_timeout = None
+        self.max_field_length = None
+        self.validation_deadline_ms = None
+        self.url_checker = None
+        self.result_cache = None
+        self.lookup = None
+        self.regex_safety = 'warn'
+        self.regex_matcher = None
+        self.payload_limits = None
+        self.decoders = {}
+        self.validators = {}
+        self.validator_cache_size = 1024
+        self.plan_cache = None
+        self.codegen = False
+        self.hooks = Hooks()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        register_error_handler(app)
+        self.slow_validation_ms = app.config.get('SIEVE_SLOW_VALIDATION_MS')
+        if app.config.get('SIEVE_RULE_ORDERING', False):
+            self.cost_table = CostTable(app.config.get('SIEVE_RULE_COSTS'))
+        if app.config.get('SIEVE_CONCURRENT_IO', False):
+            self.io_executor = ThreadPoolExecutor(
+                max_workers=app.config.get('SIEVE_IO_MAX_WORKERS', 8))
+            self.io_timeout = app.config.get('SIEVE_IO_TIMEOUT', 10.0)
+        self.url_checker = UrlChecker(
+            timeout=app.config.get('SIEVE_ACTIVE_URL_TIMEOUT', 5.0),
+            ttl=app.config.get('SIEVE_ACTIVE_URL_CACHE_TTL', 300.0),
+        )
+        self.result_cache = app.config.get('SIEVE_RESULT_CACHE')
+        if self.result_cache is True:
+            self.result_cache = LRUResultCache()
+        self.lookup = app.config.get('SIEVE_LOOKUP')
+        self.async_timeout = app.config.get('SIEVE_ASYNC_TIMEOUT', 10.0)
+        self.max_field_length = app.config.get('SIEVE_MAX_FIELD_LENGTH')
+        self.validation_deadline_ms = \
+            app.config.get('SIEVE_VALIDATION_DEADLINE_MS')
+        self.regex_safety = app.config.get('SIEVE_REGEX_SAFETY', 'warn')
+        regex_timeout = app.config.get('SIEVE_REGEX_TIMEOUT')
+        if regex_timeout is not None:
+            self.regex_matcher = RegexMatcher(timeout=regex_timeout)
+        payload_limits = PayloadLimits(
+            max_depth=app.config.get('SIEVE_MAX_DEPTH'),
+            max_keys=app.config.get('SIEVE_MAX_KEYS'),
+            max_array_len=app.config.get('SIEVE_MAX_ARRAY_LEN'),
+            max_files=app.config.get('SIEVE_MAX_FILES'),
+            strict_keys=app.config.get('SIEVE_STRICT_KEYS', False),
+            body_size_slack=app.config.get('SIEVE_BODY_SIZE_SLACK'),
+        )
+        if payload_limits.is_enabled():
+            self.payload_limits = payload_limits
+        self.decoders.update(default_decoders())
+        self.decoders.update(app.config.get('SIEVE_DECODERS', {}))
+        self.validator_cache_size = \
+            app.config.get('SIEVE_VALIDATOR_CACHE_SIZE', 1024)
+        plan_cache_dir = app.config.get('SIEVE_PLAN_CACHE_DIR')
+        if plan_cache_dir is not None:
+            self.plan_cache = PlanCache(plan_cache_dir)
+        self.codegen = app.config.get('SIEVE_CODEGEN', False)
+        if app.config.get('SIEVE_STREAMING_UPLOADS', False):
+            app.request_class = streaming_request_class(app.request_class)
+        if app.config.get('SIEVE_METRICS', False):
+            self.metrics = Metrics()
+            endpoint = app.config.get('SIEVE_METRICS_ENDPOINT')
+            if endpoint:
+                app.add_url_rule(endpoint, 'sieve_metrics', self._metrics_view)
+        app.extensions['sieve'] = self
+        preload = app.config.get('SIEVE_PRELOAD', False)
+        if preload:
+            self.preload(app, None if preload is True else preload)
+
+    def preload(self, app, requests=None):
+        # compiles every request class up front, so rule definition errors
+        # stop the boot and the first requests skip the compilation
+        if requests is None:
+            requests = validated_requests
+        seen = set()
+        with app.test_request_context(json={}):
+            for Request in requests:
+                if Request in seen:
+                    continue
+                seen.add(Request)
+                Request().compile()
+        if self.plan_cache is not None:
+            self.plan_cache.flush()
+
+    def freeze(self):
+        # call once warmed up, right before a preforking server forks
+        for validator in list(self.validators.values()):
+            validator.freeze()
+        gc.collect()
+        # gc.freeze needs Python 3.7
+        if hasattr(gc, 'freeze'):
+            gc.freeze()
+
+    def shared_validator(self, key, build):
+        if key is None:
+            return build()
+        validator = self.validators.get(key)
+        if validator is None:
+            validator = build()
+            if len(self.validators) < self.validator_cache_size:
+                self.validators[key] = validator
+        return validator
+
+    def configure_validator(self, validator):
+        validator.set_metrics(self.metrics)
+        validator.set_hooks(self.hooks)
+        validator.set_cost_table(self.cost_table)
+        validator.set_io_executor(self.io_executor, self.io_timeout)
+        validator.set_url_checker(self.url_checker)
+        validator.set_result_cache(self.result_cache)
+        validator.set_lookup(self.lookup)
+        validator.set_max_length(self.max_field_length)
+        validator.set_regex_safety(self.regex_safety)
+        validator.set_regex_matcher(self.regex_matcher)
+        validator.set_payload_limits(self.payload_limits)
+        validator.set_decoders(self.decoders)
+        validator.set_plan_cache(self.plan_cache)
+        validator.set_codegen(self.codegen)
+        if self.validation_deadline_ms is not None:
+            validator.set_deadline(self.validation_deadline_ms / 1000.0)
+        validator.set_attribute_timing(self.slow_validation_ms is not None)
+
+    def learn_rule_costs(self, min_calls=100):
+        if self.cost_table is None or self.metrics is None:
+            raise ValueError(
+                'Sieve: learning rule costs requires SIEVE_RULE_ORDERING '
+                'and SIEVE_METRICS to be enabled'
+            )
+        self.cost_table.learn(self.metrics, min_calls=min_calls)
+        # shared validators ordered their rules by the old costs
+        self.validators.clear()
+
+    def register_decoder(self, mimetype, decoder):
+        self.decoders[mimetype] = decoder
+        return decoder
+
+    def register_hook(self, event, hook):
+        # shared validators copied the hooks they were configured with
+        self.validators.clear()
+        return self.hooks.register(event, hook)
+
+    def _metrics_view(self):
+        if request.remote_addr not in ['127.0.0.1', '::1']:
+            abort(404)
+        return Response(self.metrics.prometheus_text(),
+                        mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,96 @@
+import io
+import os
+import mmap
+import hashlib
+
+from contextlib import contextmanager
+
+
+chunk_size = 64 * 1024
+
+
+def file_descriptor(value):
+    stream = getattr(value, 'stream', value)
+    # a spooled file still held in memory would be written out by fileno()
+    if getattr(stream, '_rolled', True) is False:
+        return None
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        return None
+    try:
+        stream.flush()
+    except (AttributeError, OSError, ValueError):
+        pass
+    return fd
+
+
+def file_size(value):
+    fd = file_descriptor(value)
+    if fd is not None:
+        return os.fstat(fd).st_size
+    value.seek(0, os.SEEK_END)
+    size = value.tell()
+    value.seek(0)
+    return size
+
+
+def file_head(value, size=512):
+    fd = file_descriptor(value)
+    if fd is not None and hasattr(os, 'pread'):
+        return os.pread(fd, size, 0)
+    value.seek(0)
+    head = value.stream.read(size)
+    value.seek(0)
+    return head
+
+
+@contextmanager
+def file_view(value):
+    fd = file_descriptor(value)
+    if fd is None or os.fstat(fd).st_size == 0:
+        yield None
+        return
+    view = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    try:
+        yield view
+    finally:
+        view.close()
+
+
+def iter_chunks(value, overlap=0):
+    value.seek(0)
+    tail = b''
+    try:
+        while True:
+            chunk = value.stream.read(chunk_size)
+            if not chunk:
+                return
+            yield tail + chunk
+            tail = chunk[-overlap:] if overlap else b''
+    finally:
+        value.seek(0)
+
+
+def file_digest(value, algorithm):
+    digest = hashlib.new(algorithm)
+    with file_view(value) as view:
+        if view is not None:
+            digest.update(view)
+            return digest.hexdigest()
+    for chunk in iter_chunks(value):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_contains(value, needle):
+    if not needle:
+        return True
+    with file_view(value) as view:
+        if view is not None:
+            return view.find(needle) != -1
+    # chunks overlap so a match across their boundary is still found
+    for chunk in iter_chunks(value, overlap=len(needle) - 1):
+        if needle in chunk:
+            return True
+    return False
@@ -0,0 +1,34 @@
+from collections.abc import Mapping
+
+
+class FormView(Mapping):
+    def __init__(self, form, files):
+        self._form = form
+        self._files = files
+
+    def __getitem__(self, key):
+        # files shadow form fields of the same name
+        for multidict in [self._files, self._form]:
+            values = multidict.getlist(key)
+            if len(values) == 1:
+                return values[0]
+            if values:
+                return values
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self._files or key in self._form
+
+    def __iter__(self):
+        for key in self._files:
+            yield key
+        for key in self._form:
+            if key not in self._files:
+                yield key
+
+    def __len__(self):
+        return len(self._files) + sum(
+            1 for key in self._form if key not in self._files)
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, dict(self.items()))
@@ -0,0 +1,80 @@
+import asyncio
+
+from timeit import default_timer
+
+
+hook_events = [
+    'before_request',
+    'after_request',
+    'before_rule',
+    'after_rule',
+]
+
+
+class Hooks:
+    def __init__(self, hooks=None):
+        self._hooks = dict((event, []) for event in hook_events)
+        if hooks is not None:
+            for event in hook_events:
+                self._hooks[event].extend(hooks.registered(event))
+
+    def register(self, event, hook):
+        if event not in self._hooks:
+            raise ValueError(
+                'Hooks: unknown event %s, expected one of %s'
+                % (event, ', '.join(hook_events))
+            )
+        self._hooks[event].append(hook)
+        return hook
+
+    def registered(self, event):
+        return list(self._hooks[event])
+
+    def wrap_request(self, request, run):
+        return self._wrap(run, self._hooks['before_request'],
+                          self._hooks['after_request'],
+                          lambda _kwargs: {'request': request})
+
+    def wrap_rule(self, rule, handler):
+        if not self._hooks['before_rule'] and not self._hooks['after_rule']:
+            return handler
+        return self._wrap(handler, self._hooks['before_rule'],
+                          self._hooks['after_rule'],
+                          lambda kwargs: {
+                              'attribute': kwargs['attribute'],
+                              'rule': rule,
+                              'params': kwargs['params'],
+                          })
+
+    @staticmethod
+    def _wrap(fn, before, after, describe):
+        before = tuple(before)
+        after = tuple(after)
+        if not before and not after:
+            return fn
+
+        if asyncio.iscoroutinefunction(fn):
+            async def hooked(**kwargs):
+                description = describe(kwargs)
+                for hook in before:
+                    hook(elapsed=None, result=None, **description)
+                start = default_timer()
+                result = await fn(**kwargs)
+                elapsed = default_timer() - start
+                for hook in after:
+                    hook(elapsed=elapsed, result=result, **description)
+                return result
+        else:
+            def hooked(**kwargs):
+                description = describe(kwargs)
+                for hook in before:
+                    hook(elapsed=None, result=None, **description)
+                start = default_timer()
+                result = fn(**kwargs)
+                elapsed = default_timer() - start
+                for hook in after:
+                    hook(elapsed=elapsed, result=result, **description)
+                return result
+
+        hooked.__name__ = fn.__name__
+        return hooked
@@ -0,0 +1,18 @@
+io_rules = [
+    'active_url',
+]
+
+# rules worth moving off the event loop when validating asynchronously
+blocking_rules = [
+    'after',
+    'after_or_equal',
+    'before',
+    'before_or_equal',
+    'checksum',
+    'contains_bytes',
+    'date',
+    'date_equals',
+    'dimensions',
+    'extension',
+    'mime_types',
+]
@@ -0,0 +1,105 @@
+import json
+import codecs
+
+
+chunk_size = 64 * 1024
+whitespace = ' \t\n\r'
+# the longest token a chunk can cut short without leaving the decoder at the
+# end of the buffer, -Infinity
+longest_token = 9
+
+
+class JsonArrayReader:
+    def __init__(self, stream, chunk_size=chunk_size):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._position = 0
+        self._offset = 0
+        self._eof = False
+
+    def __iter__(self):
+        self._expect('[')
+        if self._peek() == ']':
+            self._position += 1
+            self._expect_end()
+            return
+        index = 0
+        while True:
+            yield index, self._decode_value()
+            index += 1
+            separator = self._peek()
+            if separator not in [',', ']']:
+                self._fail('expected , or ]')
+            self._position += 1
+            if separator == ']':
+                self._expect_end()
+                return
+
+    def _decode_value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer,
+                                                      self._position)
+            except ValueError as error:
+                # only a value cut short by the chunk can be completed, an
+                # error earlier in the buffer fails without reading further
+                if self._eof or not self._is_cut_short(error):
+                    self._fail('invalid value')
+                self._fill()
+                continue
+            # a number at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and not self._eof:
+                self._fill()
+                continue
+            self._position = end
+            return value
+
+    def _is_cut_short(self, error):
+        position = getattr(error, 'pos', None)
+        if position is None:
+            return True
+        return len(self._buffer) - position <= longest_token or \
+            error.msg.startswith('Unterminated string')
+
+    def _peek(self):
+        while True:
+            while self._position < len(self._buffer) and \
+                    self._buffer[self._position] in whitespace:
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if self._eof:
+                return ''
+            self._fill()
+
+    def _expect(self, char):
+        if self._peek() != char:
+            self._fail('expected %s' % (char,))
+        self._position += 1
+
+    def _expect_end(self):
+        if self._peek() != '':
+            self._fail('unexpected data after the array')
+
+    def _fill(self):
+        # only the value being decoded is kept in the buffer
+        self._offset += self._position
+        self._buffer = self._buffer[self._position:]
+        self._position = 0
+        # a value spanning many chunks is decoded again from its start on
+        # every read, so reads grow with it to keep that linear
+        chunk = self._stream.read(max(self._chunk_size, len(self._buffer)))
+        self._eof = not chunk
+        self._buffer += self._text_decoder.decode(chunk, final=self._eof)
+
+    def _fail(self, reason):
+        raise ValueError('Invalid JSON array at offset %d: %s'
+                         % (self._offset + self._position, reason))
+
+
+def iter_json_array(stream, chunk_size=chunk_size):
+    return iter(JsonArrayReader(stream, chunk_size=chunk_size))
@@ -16,7 +16,9 @@ rule_messages = {
         'array': 'The :attribute must have between :min_0 and :max_1 items.',
     },
     'boolean': 'The :attribute field must be true or false.',
+    'checksum': 'The :attribute checksum does not match.',
     'confirmed': 'The :attribute confirmation does not match.',
+    'contains_bytes': 'The :attribute must contain :value_0.',
     'date': 'The :attribute is not a valid date.',
     'date_equals': 'The :attribute must be a date equal to :date_0.',
     'date_format': 'The :attribute does not match the format :format_0.',
@@ -44,6 +46,7 @@ rule_messages = {
     'image': 'The :attribute must be an image.',
     'in': 'The selected :attribute is invalid.',
     'in_array': 'The :attribute field does not exist in :other_0.',
+    'input_too_long': 'The :attribute is too long.',
     'integer': 'The :attribute must be an integer.',
     'ip': 'The :attribute must be a valid IP address.',
     'ipv4': 'The :attribute must be a valid IPv4 address.',
@@ -78,9 +81,17 @@ rule_messages = {
         'array': 'The :attribute must have at least :min_0 items.',
         'empty': 'The :attribute could not be validated since it is empty.'
     },
+    'not_allowed': 'The :attribute field is not allowed.',
     'not_in': 'The selected :attribute is invalid.',
     'not_regex': 'The :attribute format is invalid.',
     'numeric': 'The :attribute must be a number.',
+    'payload_array_too_long': 'The :attribute has too many items.',
+    'payload_not_object': 'The :attribute must be an object.',
+    'payload_too_deep': 'The :attribute is nested too deeply.',
+    'payload_too_large': 'The :attribute is too large.',
+    'payload_too_many_files': 'The :attribute has too many files.',
+    'payload_too_many_keys': 'The :attribute has too many fields.',
+    'payload_undecodable': 'The :attribute could not be decoded.',
     'present': 'The :attribute field must be present.',
     'regex': 'The :attribute format is invalid.',
     'required': 'The :attribute field is required.',
@@ -104,4 +115,5 @@ rule_messages = {
     'uploaded': 'The :attribute failed to upload.',
     'url': 'The :attribute format is invalid.',
     'uuid': 'The :attribute must be a valid UUID.',
+    'validation_timeout': 'The :attribute could not be validated in time.',
 }
@@ -0,0 +1,90 @@
+import re
+import threading
+
+
+_identifier = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?$')
+
+_placeholders = {
+    'qmark': lambda index: '?',
+    'format': lambda index: '%s',
+    'numeric': lambda index: ':%d' % (index + 1,),
+    'named': lambda index: ':p%d' % (index,),
+    'pyformat': lambda index: '%%(p%d)s' % (index,),
+}
+
+
+class CallableLookup:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def existing(self, table, column, values):
+        return self._fn(table, column, values)
+
+
+class DatabaseLookup:
+    def __init__(self, connection=None, paramstyle='qmark', batch_size=500,
+                 connect=None):
+        if paramstyle not in _placeholders:
+            raise ValueError('DatabaseLookup: unsupported paramstyle %s'
+                             % (paramstyle,))
+        if (connection is None) == (connect is None):
+            raise ValueError('DatabaseLookup: pass either a connection or '
+                             'a connect function')
+        # a single connection is shared by every thread validating with it,
+        # connect() opens one per thread for drivers that can't share them
+        self._connection = connection
+        self._connect = connect
+        self._local = threading.local()
+        self._paramstyle = paramstyle
+        self._batch_size = batch_size
+
+    def existing(self, table, column, values):
+        assert_identifier(table)
+        assert_identifier(column)
+        values = list(values)
+        found = []
+        cursor = self._thread_connection().cursor()
+        try:
+            for start in range(0, len(values), self._batch_size):
+                batch = values[start:start + self._batch_size]
+                cursor.execute(
+                    'SELECT DISTINCT %s FROM %s WHERE %s IN (%s)' % (
+                        column, table, column,
+                        ', '.join(_placeholders[self._paramstyle](index)
+                                  for index in range(len(batch)))
+                    ),
+                    self._params(batch)
+                )
+                found.extend(row[0] for row in cursor.fetchall())
+        finally:
+            cursor.close()
+        return found
+
+    def _thread_connection(self):
+        if self._connect is None:
+            return self._connection
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return connection
+
+    def _params(self, batch):
+        if self._paramstyle in ['named', 'pyformat']:
+            return dict(('p%d' % index, value)
+                        for index, value in enumerate(batch))
+        return batch
+
+
+def make_lookup(backend):
+    if backend is None or hasattr(backend, 'existing'):
+        return backend
+    if hasattr(backend, 'cursor'):
+        return DatabaseLookup(backend)
+    if callable(backend):
+        return CallableLookup(backend)
+    raise ValueError('Lookups: cannot look up values with %r' % (backend,))
+
+
+def assert_identifier(name):
+    if not _identifier.match(name):
+        raise ValueError('Lookups: invalid table or column name %s' % (name,))
@@ -0,0 +1,129 @@
+import asyncio
+import weakref
+import threading
+from timeit import default_timer
+
+
+class _ThreadCounters:
+    def __init__(self):
+        self.counters = {}
+
+
+class Metrics:
+    def __init__(self):
+        # reentrant, as a thread's counters may be retired by a collection
+        # that runs while the lock is held
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._thread_counters = {}
+        self._retired_counters = {}
+
+    def timed(self, rule, handler):
+        record = self._record
+
+        if asyncio.iscoroutinefunction(handler):
+            async def timed_handler(**kwargs):
+                start = default_timer()
+                is_valid = await handler(**kwargs)
+                record('rule', rule, default_timer() - start, is_valid)
+                return is_valid
+        else:
+            def timed_handler(**kwargs):
+                start = default_timer()
+                is_valid = handler(**kwargs)
+                record('rule', rule, default_timer() - start, is_valid)
+                return is_valid
+
+        timed_handler.__name__ = handler.__name__
+        return timed_handler
+
+    def record_rule(self, rule, elapsed, is_valid):
+        self._record('rule', rule, elapsed, is_valid)
+
+    def record_request(self, request, elapsed, is_valid):
+        self._record('request', request, elapsed, is_valid)
+
+    def as_dict(self):
+        metrics = {'rules': {}, 'requests': {}}
+        for (kind, name), (calls, failures, seconds) in self._merged().items():
+            metrics[kind + 's'][name] = {
+                'calls': calls,
+                'failures': failures,
+                'seconds': seconds,
+            }
+        return metrics
+
+    def prometheus_text(self):
+        merged = self._merged()
+        lines = []
+        for kind in ['rule', 'request']:
+            counters = sorted(
+                (name, counter) for (counter_kind, name), counter
+                in merged.items() if counter_kind == kind
+            )
+            for index, (suffix, description) in enumerate([
+                ('calls_total', 'Number of %s validations run.' % kind),
+                ('failures_total', 'Number of failed %s validations.' % kind),
+                ('seconds_total', 'Time spent in %s validations.' % kind),
+            ]):
+                metric = 'sieve_%s_%s' % (kind, suffix)
+                lines.append('# HELP %s %s' % (metric, description))
+                lines.append('# TYPE %s counter' % (metric,))
+                for name, counter in counters:
+                    lines.append('%s{%s="%s"} %s' % (
+                        metric, kind, self._escape_label(name), counter[index]
+                    ))
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            for counters in self._thread_counters.values():
+                counters.clear()
+            self._retired_counters.clear()
+
+    def _record(self, kind, name, elapsed, is_valid):
+        try:
+            counters = self._local.thread_counters.counters
+        except AttributeError:
+            thread_counters = self._local.thread_counters = _ThreadCounters()
+            counters = thread_counters.counters
+            with self._lock:
+                self._thread_counters[id(counters)] = counters
+            # the thread-local goes with its thread, whose counts are then
+            # folded into one total instead of being kept per thread
+            weakref.finalize(thread_counters, self._retire, counters)
+        counter = counters.get((kind, name))
+        if counter is None:
+            counter = counters[(kind, name)] = [0, 0, 0.0]
+        counter[0] += 1
+        if not is_valid:
+            counter[1] += 1
+        counter[2] += elapsed
+
+    def _retire(self, counters):
+        with self._lock:
+            self._thread_counters.pop(id(counters), None)
+            self._add_counters(self._retired_counters, counters)
+
+    def _merged(self):
+        with self._lock:
+            thread_counters = [dict(counters) for counters
+                               in self._thread_counters.values()]
+            merged = dict((key, list(total)) for key, total
+                          in self._retired_counters.items())
+        for counters in thread_counters:
+            self._add_counters(merged, counters)
+        return merged
+
+    @staticmethod
+    def _add_counters(merged, counters):
+        for key, (calls, failures, seconds) in counters.items():
+            total = merged.setdefault(key, [0, 0, 0.0])
+            total[0] += calls
+            total[1] += failures
+            total[2] += seconds
+
+    @staticmethod
+    def _escape_label(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"') \
+            .replace('\n', '\\n')
@@ -0,0 +1,155 @@
+from collections.abc import Mapping
+
+
+# worst case encoding of one character: a JSON-escaped surrogate pair or
+# a percent-encoded four-byte UTF-8 sequence
+max_char_bytes = 12
+# multipart boundary and part headers
+part_overhead = 1024
+body_overhead = 1024
+file_rules = ['file', 'image', 'dimensions', 'mime_types', 'extension',
+              'checksum', 'contains_bytes']
+string_rules = ['alpha', 'alpha_dash', 'string']
+
+
+class PayloadLimits:
+    def __init__(self, max_depth=None, max_keys=None, max_array_len=None,
+                 max_files=None, strict_keys=False, body_size_slack=None):
+        self.max_depth = max_depth
+        self.max_keys = max_keys
+        self.max_array_len = max_array_len
+        self.max_files = max_files
+        self.strict_keys = strict_keys
+        self.body_size_slack = body_size_slack
+
+    def is_enabled(self):
+        return self.strict_keys or any(limit is not None for limit in [
+            self.max_depth, self.max_keys, self.max_array_len, self.max_files,
+            self.body_size_slack,
+        ])
+
+    def check_content_length(self, content_length, bound):
+        # only a request limited to the declared keys has a size bound
+        if content_length is None or bound is None or \
+                not self.strict_keys or self.body_size_slack is None:
+            return []
+        if content_length > bound * self.body_size_slack + body_overhead:
+            return [rejection('request', 'payload_too_large')]
+        return []
+
+    def check_form(self, form, files):
+        # counted on the multidicts, before they are copied into a payload
+        if self.max_files is not None and \
+                sum(1 for _ in files.items(multi=True)) > self.max_files:
+            return [rejection('request', 'payload_too_many_files')]
+        if self.max_keys is not None and \
+                len(form) + len(files) > self.max_keys:
+            return [rejection('request', 'payload_too_many_keys')]
+        return []
+
+    def check(self, payload, rule_paths=None):
+        if not self.strict_keys:
+            rule_paths = None
+        if rule_paths is None and self.max_depth is None and \
+                self.max_keys is None and self.max_array_len is None:
+            return []
+        allowed, prefixes = rule_paths or (None, None)
+        keys = 0
+        unknown = []
+        stack = [(payload, '', 1, rule_paths is not None)]
+        while stack:
+            value, path, depth, strict = stack.pop()
+            if isinstance(value, Mapping):
+                keys += len(value)
+                if self.max_keys is not None and keys > self.max_keys:
+                    return [rejection('request', 'payload_too_many_keys')]
+                children = value.items()
+            elif isinstance(value, list):
+                if self.max_array_len is not None and \
+                        len(value) > self.max_array_len:
+                    return [rejection(path or 'request',
+                                      'payload_array_too_long')]
+                children = enumerate(value)
+                strict = False
+            else:
+                continue
+            if self.max_depth is not None and depth > self.max_depth:
+                return [rejection('request', 'payload_too_deep')]
+            for key, child in children:
+                child_path = '%s.%s' % (path, key) if path else str(key)
+                child_strict = False
+                if strict:
+                    if child_path in prefixes:
+                        child_strict = True
+                    elif child_path not in allowed:
+                        unknown.append(child_path)
+                        continue
+                if child_strict or isinstance(child, (Mapping, list)):
+                    stack.append((child, child_path, depth + 1, child_strict))
+        return [rejection(path, 'not_allowed') for path in sorted(unknown)]
+
+
+def rule_paths(attributes):
+    allowed = set(attributes)
+    prefixes = set()
+    for attribute in allowed:
+        accessors = attribute.split('.')
+        for index in range(1, len(accessors)):
+            prefixes.add('.'.join(accessors[:index]))
+    # a field with rules of its own may hold anything
+    return allowed, prefixes - allowed
+
+
+def body_size_bound(parsed_rules, is_json):
+    bound = 2
+    for attribute, rules in parsed_rules.items():
+        value_bound = _value_bound(rules, is_json)
+        if value_bound is None:
+            return None
+        # every key along the path, quoted, with its colon, comma and braces
+        accessors = attribute.split('.')
+        bound += value_bound + sum(
+            len(accessor) * max_char_bytes + 6 for accessor in accessors)
+    return bound
+
+
+def _value_bound(rules, is_json):
+    names = dict((rule['name'], rule['params']) for rule in rules)
+    if not is_json and any(name in names for name in file_rules):
+        for name in ['max', 'size', 'between']:
+            if name in names:
+                kilobytes = float(names[name][-1])
+                # sizes are rounded to whole kilobytes before comparing
+                return int((kilobytes + 1) * 1024) + part_overhead
+        return None
+    if 'in' in names:
+        chars = max(len(param) for param in names['in'])
+    elif 'boolean' in names or 'accepted' in names:
+        chars = 5
+    elif 'uuid' in names:
+        chars = 37
+    elif 'digits' in names:
+        chars = int(names['digits'][0]) + 1
+    elif 'digits_between' in names:
+        chars = int(names['digits_between'][1]) + 1
+    elif any(name in names for name in string_rules):
+        for name in ['max', 'size', 'between']:
+            if name in names:
+                chars = int(float(names[name][-1]))
+                break
+        else:
+            return None
+    else:
+        return None
+    # quoted, with every character escaped or percent-encoded at worst
+    return chars * max_char_bytes + 2 + (0 if is_json else part_overhead)
+
+
+def rejection(attribute, rule):
+    return {
+        'attribute': attribute,
+        'rule': rule,
+        'is_valid': False,
+        'attribute_type': 'string',
+        'params': [],
+    }
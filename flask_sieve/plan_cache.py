@@ -0,0 +1,77 @@
+import os
+import sys
+import json
+import marshal
+import hashlib
+import tempfile
+import threading
+
+from flask_sieve import __version__
+
+
+class PlanCache:
+    def __init__(self, directory):
+        self._directory = directory
+        self._lock = threading.Lock()
+        # every entry lives in one file, read once and written by flush()
+        self._entries = None
+        self._is_dirty = False
+
+    @staticmethod
+    def fingerprint(rules, custom_handlers):
+        # anything that changes how rules compile invalidates the entry
+        handlers = sorted(
+            (name, handler['handler'].__module__,
+             getattr(handler['handler'], '__qualname__', name),
+             handler['params_count'], handler['io'], handler['cacheable'])
+            for name, handler in custom_handlers.items()
+        )
+        source = json.dumps([__version__, rules, handlers],
+                            sort_keys=True, default=repr)
+        return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+    def load(self, fingerprint):
+        with self._lock:
+            return self._loaded_entries().get(fingerprint)
+
+    def store(self, fingerprint, schema):
+        with self._lock:
+            self._loaded_entries()[fingerprint] = schema
+            self._is_dirty = True
+
+    def flush(self):
+        with self._lock:
+            if not self._is_dirty:
+                return
+            # a directory that can't be written to only costs the next boot
+            try:
+                os.makedirs(self._directory, exist_ok=True)
+                fd, path = tempfile.mkstemp(dir=self._directory,
+                                            suffix='.tmp')
+            except OSError:
+                return
+            # written aside and renamed, so readers never see half a file
+            try:
+                with os.fdopen(fd, 'wb') as cached:
+                    marshal.dump(self._entries, cached)
+                os.replace(path, self._path())
+            except BaseException:
+                os.unlink(path)
+                raise
+            self._is_dirty = False
+
+    def _loaded_entries(self):
+        if self._entries is None:
+            try:
+                with open(self._path(), 'rb') as cached:
+                    self._entries = marshal.load(cached)
+            except (OSError, EOFError, ValueError, TypeError):
+                self._entries = {}
+            if not isinstance(self._entries, dict):
+                self._entries = {}
+        return self._entries
+
+    def _path(self):
+        # marshal's format changes between Python versions
+        return os.path.join(self._directory, 'plans-%s-py%d%d.marshal' % (
+            __version__, sys.version_info[0], sys.version_info[1]))
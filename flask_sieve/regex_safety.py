@@ -0,0 +1,274 @@
+import os
+import re
+import threading
+import multiprocessing
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+try:
+    import regex as regex_module
+except ImportError:
+    regex_module = None
+
+
+_repeats = [sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT]
+# atomic constructs never backtrack into their body
+_atomic = [getattr(sre_parse, 'POSSESSIVE_REPEAT', None),
+           getattr(sre_parse, 'ATOMIC_GROUP', None)]
+_zero_width = [sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT]
+
+_probe_chars = [chr(code) for code in range(128)] + \
+    [' ', 'é', 'ß', '٠', '中']
+_all_chars = frozenset(_probe_chars)
+_categories = dict(
+    (getattr(sre_parse, name), frozenset(
+        char for char in _probe_chars if re.match(pattern, char)))
+    for name, pattern in [
+        ('CATEGORY_DIGIT', r'\d'), ('CATEGORY_NOT_DIGIT', r'\D'),
+        ('CATEGORY_WORD', r'\w'), ('CATEGORY_NOT_WORD', r'\W'),
+        ('CATEGORY_SPACE', r'\s'), ('CATEGORY_NOT_SPACE', r'\S'),
+    ]
+)
+
+
+def regex_risks(pattern):
+    risks = []
+    _find_risks(sre_parse.parse(pattern), risks)
+    return risks
+
+
+def assert_safe_regex(pattern, attribute=None, risks=None):
+    # risks already worked out for the pattern can be passed in
+    if risks is None:
+        risks = regex_risks(pattern)
+    if risks:
+        raise ValueError(
+            'Regex pattern %s%s risks catastrophic backtracking: %s'
+            % (pattern, '' if attribute is None else ' for ' + attribute,
+               '; '.join(risks))
+        )
+
+
+def _find_risks(items, risks):
+    for op, av in items:
+        if op in _repeats:
+            low, high, body = av
+            if high == sre_parse.MAXREPEAT:
+                _check_repeated_body(list(body), risks)
+            _find_risks(body, risks)
+        elif op == sre_parse.SUBPATTERN:
+            _find_risks(av[-1], risks)
+        elif op == sre_parse.BRANCH:
+            for branch in av[1]:
+                _find_risks(branch, risks)
+        elif op in _atomic and op is not None:
+            continue
+        elif op in [sre_parse.ASSERT, sre_parse.ASSERT_NOT]:
+            _find_risks(av[1], risks)
+
+
+def _check_repeated_body(body, risks):
+    body_first = _first_chars(body)
+    # a repeat inside the body that may end an iteration can also start the
+    # next one: the engine tries every way of splitting the input
+    for index, (op, av) in enumerate(body):
+        if op in _repeats and av[1] > 1 and _is_nullable(body[index + 1:]) \
+                and _first_chars(av[2]) & body_first:
+            risks.append('nested quantifiers')
+            return
+        # an optional item ending an iteration, as in (a|aa)+ which parses
+        # to a(?:|a), may match what starts the next iteration instead
+        if _is_optional(op, av) and not _is_nullable(body[:index]) \
+                and _is_nullable(body[index + 1:]) \
+                and _item_first_chars(op, av) & body_first:
+            risks.append('overlapping alternation')
+            return
+        if op == sre_parse.SUBPATTERN and _is_nullable(body[index + 1:]) \
+                and _is_nullable(body[:index]):
+            _check_repeated_body(list(av[-1]), risks)
+            if risks:
+                return
+    for op, av in _top_level(body):
+        if op == sre_parse.BRANCH:
+            firsts = [_first_chars(branch) for branch in av[1]]
+            for i in range(len(firsts)):
+                for j in range(i + 1, len(firsts)):
+                    if firsts[i] & firsts[j]:
+                        risks.append('overlapping alternation')
+                        return
+
+
+def _top_level(items):
+    for op, av in items:
+        if op == sre_parse.SUBPATTERN:
+            for item in _top_level(av[-1]):
+                yield item
+        else:
+            yield op, av
+
+
+def _first_chars(items):
+    chars = set()
+    for op, av in items:
+        chars |= _item_first_chars(op, av)
+        if not _is_nullable([(op, av)]):
+            break
+    return chars
+
+
+def _item_first_chars(op, av):
+    if op == sre_parse.LITERAL:
+        return {chr(av)}
+    if op == sre_parse.NOT_LITERAL:
+        return set(_all_chars - {chr(av)})
+    if op == sre_parse.IN:
+        return _class_chars(av)
+    if op in _repeats or op == getattr(sre_parse, 'POSSESSIVE_REPEAT', None):
+        return _first_chars(av[2])
+    if op in [sre_parse.SUBPATTERN, getattr(sre_parse, 'ATOMIC_GROUP', None)]:
+        return _first_chars(av if op != sre_parse.SUBPATTERN else av[-1])
+    if op == sre_parse.BRANCH:
+        chars = set()
+        for branch in av[1]:
+            chars |= _first_chars(branch)
+        return chars
+    if op in _zero_width:
+        return set()
+    # ANY, group references and anything unusual may start with anything
+    return set(_all_chars)
+
+
+def _class_chars(items):
+    chars = set()
+    negate = False
+    for op, av in items:
+        if op == sre_parse.NEGATE:
+            negate = True
+        elif op == sre_parse.LITERAL:
+            chars.add(chr(av))
+        elif op == sre_parse.RANGE:
+            chars |= set(char for char in _probe_chars
+                         if av[0] <= ord(char) <= av[1])
+        elif op == sre_parse.CATEGORY:
+            chars |= _categories.get(av, _all_chars)
+        else:
+            chars |= _all_chars
+    return set(_all_chars - chars) if negate else chars
+
+
+def _is_optional(op, av):
+    if op in _repeats:
+        return av[0] == 0 and av[1] == 1
+    if op == sre_parse.BRANCH:
+        return _is_nullable([(op, av)])
+    return False
+
+
+def _is_nullable(items):
+    for op, av in items:
+        if op in _zero_width:
+            continue
+        if op in _repeats or op == getattr(sre_parse, 'POSSESSIVE_REPEAT', None):
+            if av[0] == 0 or _is_nullable(av[2]):
+                continue
+            return False
+        if op == sre_parse.SUBPATTERN:
+            if _is_nullable(av[-1]):
+                continue
+            return False
+        if op == sre_parse.BRANCH:
+            if any(_is_nullable(branch) for branch in av[1]):
+                continue
+            return False
+        return False
+    return True
+
+
+class RegexTimeout(Exception):
+    pass
+
+
+class RegexMatcher:
+    def __init__(self, timeout=0.1, max_workers=None):
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        # one worker process per match in flight, so a pattern running out
+        # of time only holds up its own match
+        self._slots = threading.BoundedSemaphore(
+            max_workers or os.cpu_count() or 4)
+        self._idle = []
+        self._workers = set()
+
+    def match(self, pattern, value):
+        if regex_module is not None:
+            try:
+                return regex_module.match(pattern, value,
+                                          timeout=self._timeout) is not None
+            except TimeoutError:
+                raise RegexTimeout(pattern)
+        # the re module cannot be interrupted, so match in a worker process
+        # that is replaced whenever it runs out of time
+        with self._slots:
+            worker = self._take_worker()
+            _, connection = worker
+            connection.send((pattern, value))
+            if not connection.poll(self._timeout):
+                self._stop_worker(worker)
+                raise RegexTimeout(pattern)
+            is_match, error = connection.recv()
+            with self._lock:
+                if worker in self._workers:
+                    self._idle.append(worker)
+        if error is not None:
+            raise ValueError(error)
+        return is_match
+
+    def close(self):
+        with self._lock:
+            workers = list(self._workers)
+        for worker in workers:
+            self._stop_worker(worker)
+
+    def _take_worker(self):
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker[0].is_alive():
+                    return worker
+                self._workers.discard(worker)
+        connection, child_connection = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_match_worker, args=(child_connection,))
+        process.daemon = True
+        process.start()
+        worker = (process, connection)
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def _stop_worker(self, worker):
+        process, connection = worker
+        with self._lock:
+            if worker not in self._workers:
+                return
+            self._workers.discard(worker)
+            if worker in self._idle:
+                self._idle.remove(worker)
+        process.terminate()
+        process.join()
+        connection.close()
+
+
+def _match_worker(connection):
+    while True:
+        try:
+            pattern, value = connection.recv()
+        except EOFError:
+            return
+        try:
+            connection.send((re.match(pattern, value) is not None, None))
+        except Exception as e:
+            connection.send((False, str(e)))
@@ -1,21 +1,98 @@
+from timeit import default_timer
+
+from flask import current_app, has_app_context
 from flask import request as flask_request
 
 from flask_sieve.validator import Validator
+from flask_sieve.slow_log import log_slow_validation
+from flask_sieve.json_stream import iter_json_array
+from flask_sieve.decoders import iter_decoded_items
 from flask_sieve.exceptions import ValidationException
 
 
 class FormRequest:
     def __init__(self, request=None):
         request = request or flask_request
-        self._validator = Validator(rules=self.rules(), request=request)
-        self._validator.set_custom_messages(self.messages())
-        self._validator.set_custom_handlers(self.custom_handlers())
+        sieve = current_sieve()
+        self._metrics = sieve.metrics if sieve is not None else None
+        self._slow_validation_ms = sieve.slow_validation_ms \
+            if sieve is not None else None
+        self._async_timeout = sieve.async_timeout \
+            if sieve is not None else None
+        rules = self.rules()
+        self._request = request
+        self._result = None
+        # validators are compiled once and shared by the requests of a sieve
+        if sieve is not None:
+            self._validator = sieve.shared_validator(
+                self._schema_key(rules),
+                lambda: self._make_validator(sieve, rules))
+        else:
+            self._validator = self._make_validator(sieve, rules)
+        # lets a streaming request abort uploads while they are parsed
+        if request and hasattr(request, 'set_upload_rules') and \
+                not request.is_json:
+            request.set_upload_rules(rules, self.messages())
 
     def validate(self):
-        if self._validator.fails():
-            raise ValidationException(self._validator.messages())
+        if self._metrics is None and self._slow_validation_ms is None:
+            self._result = self._validator.validate(self._request)
+        else:
+            start = default_timer()
+            self._result = self._validator.validate(self._request)
+            self._record_timing(default_timer() - start,
+                                self._result.passes())
+        if self._result.fails():
+            raise ValidationException(self._result.messages())
+        return True
+
+    async def validate_async(self):
+        start = default_timer()
+        self._result = await self._validator.validate_async(
+            self._request, timeout=self._async_timeout)
+        if self._metrics is not None or self._slow_validation_ms is not None:
+            self._record_timing(default_timer() - start,
+                                self._result.passes())
+        if self._result.fails():
+            raise ValidationException(self._result.messages())
         return True
 
+    def compile(self):
+        self._validator.compile()
+
+    def _make_validator(self, sieve, rules):
+        validator = Validator(rules=rules, name=self.__class__.__name__)
+        if sieve is not None:
+            sieve.configure_validator(validator)
+        validator.set_custom_messages(self.messages())
+        validator.set_custom_handlers(self.custom_handlers())
+        validator.set_max_lengths(self.max_lengths())
+        return validator
+
+    def _schema_key(self, rules):
+        # rules() may differ between requests, so they are part of the key
+        try:
+            return (self.__class__, _frozen(rules), _frozen(self.messages()),
+                    _frozen([_handler_key(handler)
+                             for handler in self.custom_handlers()]),
+                    _frozen(self.max_lengths()))
+        except TypeError:
+            return None
+
+    def _record_timing(self, elapsed, passes):
+        if self._metrics is not None:
+            self._metrics.record_request(
+                self.__class__.__name__, elapsed, passes)
+        if self._slow_validation_ms is not None and \
+                elapsed * 1000.0 >= self._slow_validation_ms:
+            log_slow_validation(
+                logger=current_app.logger,
+                request=self.__class__.__name__,
+                elapsed=elapsed,
+                attribute_timings=self._result.attribute_timings(),
+                payload=self._result.payload(),
+            )
+
     @staticmethod
     def messages():
         return {}
@@ -24,14 +101,117 @@ class FormRequest:
     def custom_handlers():
         return {}
 
+    @staticmethod
+    def max_lengths():
+        return {}
+
     def rules(self):
         return {}
 
 
 class JsonRequest(FormRequest):
+    # validate a top-level array item by item as it is read from the body
+    streaming = False
+    # reading stops once this many errors are collected
+    max_stream_errors = 100
+
     def __init__(self, request=None):
         request = request or flask_request
-        if not request.is_json:
+        sieve = current_sieve()
+        self._decoder = sieve.decoders.get(request.mimetype) \
+            if sieve is not None and not request.is_json else None
+        if not request.is_json and self._decoder is None:
             raise ValidationException(
                 {'request': 'Request must be valid JSON'})
-        self._validator = Validator(rules=self.rules(), request=request)
+        self._stream = request.stream if self.streaming else None
+        super(JsonRequest, self).__init__(request)
+
+    def validate(self):
+        if not self.streaming:
+            return super(JsonRequest, self).validate()
+        start = default_timer()
+        errors = {}
+        for index, item in self._stream_items(errors):
+            self._result = self._validator.validate(item)
+            if self._result.passes():
+                self.accept(index, item)
+            else:
+                self._add_item_errors(errors, index)
+        return self._finish_stream(start, errors)
+
+    async def validate_async(self):
+        if not self.streaming:
+            return await super(JsonRequest, self).validate_async()
+        start = default_timer()
+        errors = {}
+        for index, item in self._stream_items(errors):
+            self._result = await self._validator.validate_async(
+                item, timeout=self._async_timeout)
+            if self._result.passes():
+                self.accept(index, item)
+            else:
+                self._add_item_errors(errors, index)
+        return self._finish_stream(start, errors)
+
+    def accept(self, index, item):
+        pass
+
+    def _stream_items(self, errors):
+        if self._decoder is None:
+            items = iter_json_array(self._stream)
+        else:
+            items = iter_decoded_items(self._decoder, self._stream)
+        try:
+            for index, item in items:
+                if not isinstance(item, dict):
+                    errors[str(index)] = ['Item must be a JSON object']
+                else:
+                    yield index, item
+                if len(errors) >= self.max_stream_errors:
+                    errors['request'] = ['Validation stopped after %d errors'
+                                         % (len(errors),)]
+                    return
+        except ValueError:
+            raise ValidationException({'request': 'Request must be a valid %s'
+                                       % ('JSON array' if self._decoder is None
+                                          else 'array of records')})
+
+    def _add_item_errors(self, errors, index):
+        for attribute, messages in self._result.messages().items():
+            errors['%d.%s' % (index, attribute)] = messages
+
+    def _finish_stream(self, start, errors):
+        if self._metrics is not None or self._slow_validation_ms is not None:
+            self._record_timing(default_timer() - start, not errors)
+        if errors:
+            raise ValidationException(errors)
+        return True
+
+
+def _frozen(value):
+    if isinstance(value, dict):
+        return tuple(sorted((key, _frozen(item))
+                            for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_frozen(item) for item in value)
+    hash(value)
+    return value
+
+
+def _handler_key(handler):
+    # handlers made on each call are new objects every time, so they are
+    # told apart by name, as the plan cache does; closures and handlers
+    # bound to an instance may hold per-call state and aren't shared
+    function = handler['handler']
+    owner = getattr(function, '__self__', None)
+    if getattr(function, '__closure__', None) or \
+            (owner is not None and not isinstance(owner, type)) or \
+            not hasattr(function, '__qualname__'):
+        raise TypeError('Handler %r cannot be shared' % (function,))
+    return dict(handler, handler=(function.__module__, function.__qualname__))
+
+
+def current_sieve():
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('sieve')
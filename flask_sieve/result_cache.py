@@ -0,0 +1,141 @@
+import os
+import json
+import asyncio
+import sqlite3
+import hashlib
+import threading
+
+from collections import OrderedDict
+from timeit import default_timer
+from time import time
+
+
+class LRUResultCache:
+    def __init__(self, ttl=300.0, max_entries=4096):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._results = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is None:
+                return None
+            if cached[0] <= default_timer():
+                del self._results[key]
+                return None
+            self._results.move_to_end(key)
+            return cached[1]
+
+    def set(self, key, is_valid):
+        with self._lock:
+            self._results[key] = (default_timer() + self._ttl, is_valid)
+            self._results.move_to_end(key)
+            while len(self._results) > self._max_entries:
+                self._results.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+
+class SQLiteResultCache:
+    def __init__(self, path, ttl=300.0, max_entries=100000,
+                 evict_every=1000):
+        self._path = path
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._evict_every = evict_every
+        self._writes = 0
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS sieve_results ('
+                'key TEXT PRIMARY KEY, is_valid INTEGER, expires REAL)'
+            )
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS sieve_results_expires '
+                'ON sieve_results (expires)'
+            )
+
+    def get(self, key):
+        row = self._connection().execute(
+            'SELECT is_valid FROM sieve_results WHERE key = ? AND expires > ?',
+            (key, time())
+        ).fetchone()
+        return None if row is None else bool(row[0])
+
+    def set(self, key, is_valid):
+        with self._connection() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO sieve_results VALUES (?, ?, ?)',
+                (key, int(bool(is_valid)), time() + self._ttl)
+            )
+        self._writes += 1
+        if self._writes % self._evict_every == 0:
+            self.evict()
+
+    def evict(self):
+        with self._connection() as connection:
+            connection.execute(
+                'DELETE FROM sieve_results WHERE expires <= ?', (time(),))
+            connection.execute(
+                'DELETE FROM sieve_results WHERE key IN ('
+                'SELECT key FROM sieve_results ORDER BY expires DESC '
+                'LIMIT -1 OFFSET ?)', (self._max_entries,)
+            )
+
+    def clear(self):
+        with self._connection() as connection:
+            connection.execute('DELETE FROM sieve_results')
+
+    def _connection(self):
+        # connections are neither shared across threads nor across forks
+        if getattr(self._local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(self._path, timeout=5.0)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+
+def result_cache_key(rule, handler, params, value):
+    if not isinstance(value, (str, int, float, bool, type(None))):
+        return None
+    payload = json.dumps(
+        [rule, handler, params, type(value).__name__, value],
+        separators=(',', ':')
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def cached(cache, rule, handler):
+    handler_name = '%s.%s' % (handler.__module__, handler.__qualname__)
+
+    def key(kwargs):
+        return result_cache_key(rule, handler_name, kwargs['params'],
+                                kwargs['value'])
+
+    if asyncio.iscoroutinefunction(handler):
+        async def cached_handler(**kwargs):
+            cache_key = key(kwargs)
+            is_valid = None if cache_key is None else cache.get(cache_key)
+            if is_valid is None:
+                is_valid = bool(await handler(**kwargs))
+                if cache_key is not None:
+                    cache.set(cache_key, is_valid)
+            return is_valid
+    else:
+        def cached_handler(**kwargs):
+            cache_key = key(kwargs)
+            is_valid = None if cache_key is None else cache.get(cache_key)
+            if is_valid is None:
+                is_valid = bool(handler(**kwargs))
+                if cache_key is not None:
+                    cache.set(cache_key, is_valid)
+            return is_valid
+
+    cached_handler.__name__ = handler.__name__
+    return cached_handler
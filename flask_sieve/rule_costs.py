@@ -0,0 +1,73 @@
+# Estimated seconds per call, grouped by the kind of work a rule does.
+type_check_cost = 0.000001
+parse_cost = 0.00001
+file_inspection_cost = 0.0001
+io_cost = 0.1
+
+rule_costs = {
+    'accepted': type_check_cost,
+    'alpha': type_check_cost,
+    'alpha_dash': type_check_cost,
+    'alpha_num': type_check_cost,
+    'bail': type_check_cost,
+    'boolean': type_check_cost,
+    'confirmed': type_check_cost,
+    'different': type_check_cost,
+    'file': type_check_cost,
+    'filled': type_check_cost,
+    'in': type_check_cost,
+    'integer': type_check_cost,
+    'not_in': type_check_cost,
+    'nullable': type_check_cost,
+    'present': type_check_cost,
+    'required': type_check_cost,
+    'required_if': type_check_cost,
+    'required_unless': type_check_cost,
+    'required_with': type_check_cost,
+    'required_with_all': type_check_cost,
+    'required_without': type_check_cost,
+    'required_without_all': type_check_cost,
+    'same': type_check_cost,
+    'sometimes': type_check_cost,
+    'starts_with': type_check_cost,
+    'string': type_check_cost,
+    'between': parse_cost,
+    'digits': parse_cost,
+    'digits_between': parse_cost,
+    'gt': parse_cost,
+    'gte': parse_cost,
+    'lt': parse_cost,
+    'lte': parse_cost,
+    'max': parse_cost,
+    'min': parse_cost,
+    'numeric': parse_cost,
+    'size': parse_cost,
+    'after': parse_cost,
+    'after_or_equal': parse_cost,
+    'array': parse_cost,
+    'before': parse_cost,
+    'before_or_equal': parse_cost,
+    'date': parse_cost,
+    'date_equals': parse_cost,
+    'distinct': parse_cost,
+    'email': parse_cost,
+    'in_array': parse_cost,
+    'ip': parse_cost,
+    'ipv4': parse_cost,
+    'ipv6': parse_cost,
+    'json': parse_cost,
+    'not_regex': parse_cost,
+    'regex': parse_cost,
+    'timezone': parse_cost,
+    'url': parse_cost,
+    'uuid': parse_cost,
+    'checksum': file_inspection_cost,
+    'contains_bytes': file_inspection_cost,
+    'dimensions': file_inspection_cost,
+    'extension': file_inspection_cost,
+    'image': file_inspection_cost,
+    'mime_types': file_inspection_cost,
+    'active_url': io_cost,
+    'exists': io_cost,
+    'unique': io_cost,
+}
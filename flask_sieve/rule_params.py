@@ -0,0 +1,51 @@
+# the fewest parameters each built-in rule needs
+rule_params = {
+    'after': 1,
+    'after_or_equal': 1,
+    'before': 1,
+    'before_or_equal': 1,
+    'between': 2,
+    'checksum': 2,
+    'contains_bytes': 1,
+    'date_equals': 1,
+    'different': 1,
+    'digits': 1,
+    'digits_between': 2,
+    'dimensions': 1,
+    'exists': 1,
+    'extension': 1,
+    'gt': 1,
+    'gte': 1,
+    'in_array': 1,
+    'lt': 1,
+    'lte': 1,
+    'max': 1,
+    'mime_types': 1,
+    'min': 1,
+    'not_regex': 1,
+    'regex': 1,
+    'required_if': 2,
+    'required_unless': 2,
+    'required_with': 1,
+    'required_with_all': 1,
+    'required_without': 1,
+    'required_without_all': 1,
+    'same': 1,
+    'size': 1,
+    'starts_with': 1,
+    'unique': 1,
+}
+
+# optional modules the rules import on first use
+rule_modules = {
+    'after': ['dateutil.parser'],
+    'after_or_equal': ['dateutil.parser'],
+    'before': ['dateutil.parser'],
+    'before_or_equal': ['dateutil.parser'],
+    'date': ['dateutil.parser'],
+    'date_equals': ['dateutil.parser'],
+    'dimensions': ['PIL.Image'],
+    'extension': ['filetype'],
+    'mime_types': ['filetype'],
+    'timezone': ['pytz'],
+}
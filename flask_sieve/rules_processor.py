@@ -1,31 +1,84 @@
 from __future__ import absolute_import
-import os
 import re
 import sys
 import ast
 import json
-import pytz
+import hashlib
 import operator
-import requests
-import filetype
+import asyncio
+import warnings
+import threading
+
+from functools import partial, wraps
+from importlib import import_module
+from timeit import default_timer
+from concurrent.futures import wait as wait_for_futures
+
+from .io_rules import io_rules, blocking_rules
+from .lookups import make_lookup, assert_identifier
+from .result_cache import cached
+from .cacheable_rules import cacheable_rules
+from .url_checker import default_url_checker
+from .regex_safety import RegexTimeout, regex_risks, assert_safe_regex
+from .rule_params import rule_params, rule_modules
+from .file_inspection import file_size, file_head, file_digest, file_contains
+from .conditional_inclusion_rules import conditional_inclusion_rules
+from .validation_context import ValidationContext, current_context, \
+    activate, deactivate, bound
 
-from PIL import Image
-from dateutil.parser import parse as dateparse
-from werkzeug.datastructures import FileStorage
 
-from .conditional_inclusion_rules import conditional_inclusion_rules
+email_pattern = re.compile(r"""
+    ^
+    [a-zA-Z0-9.!#$%&'*+/=?^_`{|}~-]
+    +@[a-zA-Z0-9]
+    (?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?
+    (?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*
+    $
+""", re.VERBOSE | re.IGNORECASE | re.DOTALL)
+accepted_values = [1, '1', 'true', 'yes', 'on', True]
+# the only values bound into exists and unique queries
+lookup_value_types = (str, int, float, bool)
+boolean_values = [True, False, 1, 0, '0', '1']
+
+
+# third-party parsers are imported on first use so the rules can be loaded
+# without their import cost
+def dateparse(value):
+    from dateutil.parser import parse
+    return parse(value)
 
 
 class RulesProcessor:
     def __init__(self, app=None, rules=None, request=None):
         self._app = app
         self._rules = rules or {}
-        self._request = request or {}
+        # the context of passes() and friends, run() gets one of its own
+        self._context = ValidationContext(request or {})
         self._custom_handlers = {}
-        self._attributes_validations = {}
+        self._metrics = None
+        self._hooks = None
+        self._cost_table = None
+        self._io_executor = None
+        self._io_timeout = None
+        self._url_checker = None
+        self._result_cache = None
+        self._lookup = None
+        self._plan = None
+        self._plan_lock = threading.Lock()
+        self._time_attributes = False
+        self._max_length = None
+        self._max_lengths = {}
+        self._deadline = None
+        # unsafe patterns are flagged unless the check is turned off
+        self._regex_safety = 'warn'
+        self._regex_matcher = None
+        self._regex_risks = {}
+        self._checked = False
+        self._codegen = False
+        self._generated = None
 
     def validations(self):
-        return self._attributes_validations
+        return self._context.validations
 
     def fails(self):
         return not self.passes()
@@ -33,74 +86,331 @@ class RulesProcessor:
     def custom_handlers(self):
         return self._custom_handlers
 
+    def attribute_timings(self):
+        return self._context.attribute_timings
+
     def passes(self):
+        return self.run(self._context).passes
+
+    async def passes_async(self, timeout=None):
+        context = await self.run_async(self._context, timeout=timeout)
+        return context.passes
+
+    def run(self, context):
+        if not isinstance(context, ValidationContext):
+            context = ValidationContext(context or {})
+        context.reset()
+        token = activate(context)
+        try:
+            context.passes = self._run(context)
+        finally:
+            deactivate(token)
+        return context
+
+    async def run_async(self, context, timeout=None):
+        if not isinstance(context, ValidationContext):
+            context = ValidationContext(context or {})
+        context.reset()
+        token = activate(context)
+        try:
+            context.passes = await self._run_async(context, timeout)
+        finally:
+            deactivate(token)
+        return context
+
+    def _run(self, context):
+        pending = []
+        if self._io_executor is not None:
+            deadline = default_timer() + self._io_timeout
+        plan, lookup_targets = self._compiled_plan()
+        if self._lookup is not None and lookup_targets:
+            self._prefetch_lookups(lookup_targets)
+        generated = self._generated_validator(plan)
+        if generated is not None:
+            # the attribute guard only costs a call when limits are set
+            guard_attribute = self._guard_attribute \
+                if self._max_length is not None or self._max_lengths else None
+            return generated(context.request, context.validations,
+                             guard_attribute)
+        walk = self._walk_plan(context, plan)
+        try:
+            should_bail, step, validation, kwargs = next(walk)
+            while True:
+                _, _, handler, is_io, is_async, _ = step
+                error = None
+                if is_io:
+                    pending.append((self._io_executor.submit(
+                        bound(self._call_handler), handler, is_async, kwargs
+                    ), validation))
+                    is_valid = None
+                else:
+                    try:
+                        is_valid = self._call_handler(handler, is_async, kwargs)
+                    except Exception as e:
+                        if not should_bail:
+                            raise
+                        is_valid, error = False, e
+                should_bail, step, validation, kwargs = \
+                    walk.send((is_valid, error))
+        except StopIteration as stop:
+            passes = stop.value
+        if pending and not self._join_io_rules(pending, deadline):
+            passes = False
+        return passes
+
+    async def _run_async(self, context, timeout):
+        loop = asyncio.get_event_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        pending = []
+        # blocking rules of one attribute share its value (and file stream)
+        attribute_chains = {}
+        plan, lookup_targets = self._compiled_plan()
+        # on the loop's thread, where the exists and unique rules read the
+        # results, as DB-API connections may not be shared between threads
+        if self._lookup is not None and lookup_targets:
+            self._prefetch_lookups(lookup_targets)
+        walk = self._walk_plan(context, plan)
+        try:
+            should_bail, step, validation, kwargs = next(walk)
+            while True:
+                _, _, handler, _, is_async, is_blocking = step
+                attribute = kwargs['attribute']
+                error = None
+                try:
+                    if is_async or is_blocking:
+                        if is_async:
+                            task = asyncio.ensure_future(handler(**kwargs))
+                        else:
+                            task = self._run_in_executor(
+                                loop, attribute_chains.get(attribute),
+                                handler, kwargs)
+                            attribute_chains[attribute] = task
+                        if should_bail:
+                            is_valid = await self._join_async_rules(
+                                loop, [(task, validation)], deadline)
+                        else:
+                            pending.append((task, validation))
+                            is_valid = None
+                    else:
+                        is_valid = handler(**kwargs)
+                except Exception as e:
+                    if not should_bail:
+                        raise
+                    is_valid, error = False, e
+                should_bail, step, validation, kwargs = \
+                    walk.send((is_valid, error))
+        except StopIteration as stop:
+            passes = stop.value
+        if pending and not await self._join_async_rules(
+                loop, pending, deadline):
+            passes = False
+        return passes
+
+    def _walk_plan(self, context, plan):
+        # the guard, deadline and bail handling run() and run_async() share:
+        # yields each rule to run as (should_bail, step, validation, kwargs)
+        # and is sent back (is_valid, error), is_valid None for a rule left
+        # pending; returns whether the rules run so far passed
         passes = True
-        self._attributes_validations = {}
-        for attribute, rules in self._rules.items():
-            should_bail = self._has_rule(rules, 'bail')
-            validations = []
-            for rule in rules:
-                is_valid = False
-                handler = self._get_rule_handler(rule['name'])
-                value = self._attribute_value(attribute)
-                attr_type = self._get_type(value, rules)
-                is_nullable = self._is_attribute_nullable(
-                    attribute=attribute,
-                    params=rule['params'],
-                    rules=rules,
-                )
-                if value is None and is_nullable:
+        if self._deadline is not None:
+            validation_deadline = default_timer() + self._deadline
+        for attribute, rules, should_bail, steps in plan:
+            guard = self._guard_attribute(attribute)
+            if guard is None and self._deadline is not None and \
+                    default_timer() > validation_deadline:
+                guard = self._guard_validation(attribute, 'validation_timeout')
+            if guard is not None:
+                context.validations[attribute] = [guard]
+                passes = False
+                if should_bail or guard['rule'] == 'validation_timeout':
+                    break
+                continue
+            if self._time_attributes:
+                start = default_timer()
+            validations = [None] * len(steps)
+            failed_index = None
+            errors = {}
+            for step in steps:
+                index, rule = step[0], step[1]
+                if failed_index is not None and index > failed_index:
+                    continue
+                validation, kwargs, is_skipped = \
+                    self._prepare_step(attribute, rules, rule)
+                validations[index] = validation
+                if is_skipped:
                     is_valid = True
                 else:
-                    is_valid = handler(
-                        value=value,
-                        attribute=attribute,
-                        params=rule['params'],
-                        nullable=is_nullable,
-                        rules=rules
-                    )
-                validations.append({
-                    'attribute': attribute,
-                    'rule': rule['name'],
-                    'is_valid': is_valid,
-                    'attribute_type': attr_type,
-                    'params': rule['params'],
-                })
+                    is_valid, error = \
+                        yield should_bail, step, validation, kwargs
+                    if is_valid is None:
+                        continue
+                    if error is not None:
+                        # run ahead of its turn, the error only stands if
+                        # the rules written before it pass
+                        errors[index] = error
+                validation['is_valid'] = is_valid
                 if not is_valid:
                     passes = False
                     if should_bail:
-                        self._attributes_validations[attribute] = validations
-                        return False
-            self._attributes_validations[attribute] = validations
+                        failed_index = index if failed_index is None \
+                            else min(failed_index, index)
+            if failed_index is not None:
+                # the first failure in written order is reported
+                if failed_index in errors:
+                    raise errors[failed_index]
+                validations = validations[:failed_index + 1]
+            context.validations[attribute] = validations
+            if self._time_attributes:
+                context.attribute_timings[attribute] = default_timer() - start
+            if failed_index is not None:
+                return False
         return passes
 
     def set_rules(self, rules):
         self._rules = rules
+        self._plan = None
+        self._checked = False
+
+    def compile(self):
+        # rule definition errors surface here instead of on the first request
+        plan, _ = self._compiled_plan()
+        for _, rules, _, _ in plan:
+            for rule in rules:
+                if not self._checked:
+                    self._check_rule_definition(rule)
+                for module in rule_modules.get(rule['name'], []):
+                    import_module(module)
+        self._checked = True
+        self._generated_validator(plan)
+        return plan
+
+    def schema(self):
+        # the compiled state that plain data can hold, handlers are looked up
+        # again from the rule names
+        return {
+            'rules': self._rules,
+            'regex_risks': self._regex_risks,
+            'checked': self._checked,
+        }
+
+    def load_schema(self, schema):
+        self.set_rules(schema['rules'])
+        self._regex_risks.update(schema['regex_risks'])
+        self._checked = schema['checked']
+
+    def freeze(self):
+        # an immutable plan of interned strings, so the memory pages a
+        # preforking server shares with its workers are left untouched
+        plan, lookup_targets = self._compiled_plan()
+        frozen_rules = {}
+        frozen_plan = []
+        for attribute, rules, should_bail, steps in plan:
+            attribute = sys.intern(attribute)
+            for rule in rules:
+                rule['name'] = sys.intern(rule['name'])
+                rule['params'] = tuple(sys.intern(param)
+                                       for param in rule['params'])
+            rules = tuple(rules)
+            frozen_rules[attribute] = rules
+            frozen_plan.append((attribute, rules, should_bail, tuple(steps)))
+        self._rules = frozen_rules
+        self._plan = (tuple(frozen_plan), tuple(lookup_targets))
+        self._generated_validator(self._plan[0])
+        return frozen_rules
 
     def set_request(self, request):
-        self._request = request
+        self._context = ValidationContext(request)
+
+    def set_metrics(self, metrics):
+        self._metrics = metrics
+        self._plan = None
+
+    def set_attribute_timing(self, enabled):
+        self._time_attributes = enabled
+
+    def set_cost_table(self, cost_table):
+        self._cost_table = cost_table
+        self._plan = None
+
+    def set_io_executor(self, executor, timeout=10.0):
+        self._io_executor = executor
+        self._io_timeout = timeout
+        self._plan = None
+
+    def set_url_checker(self, url_checker):
+        self._url_checker = url_checker
+
+    def set_result_cache(self, result_cache):
+        self._result_cache = result_cache
+        self._plan = None
+
+    def set_lookup(self, lookup):
+        self._lookup = make_lookup(lookup)
+        self._plan = None
+
+    def set_max_length(self, max_length):
+        self._max_length = max_length
+
+    def set_max_lengths(self, max_lengths):
+        self._max_lengths = max_lengths or {}
 
-    def register_rule_handler(self, handler, message, params_count=0):
+    def set_deadline(self, seconds):
+        self._deadline = seconds
+
+    def set_hooks(self, hooks):
+        self._hooks = hooks
+        self._plan = None
+
+    def set_regex_safety(self, mode):
+        if mode not in [None, False, 'warn', 'reject']:
+            raise ValueError('Unknown regex safety mode %s' % (mode,))
+        self._regex_safety = mode or None
+        self._plan = None
+
+    def set_regex_matcher(self, matcher):
+        self._regex_matcher = matcher
+        self._plan = None
+
+    def set_codegen(self, enabled):
+        self._codegen = enabled
+
+    def register_rule_handler(self, handler, message, params_count=0,
+                              io=False, cacheable=False):
         # add a params count check wrapper
-        def checked_handler(*args, **kwargs):
+        def assert_params_size(params):
             self._assert_params_size(
                 size=params_count,
-                params=kwargs['params'],
+                params=params,
                 rule=('custom rule %s' % (handler.__name__,))
             )
-            return handler(*args, **kwargs)
+
+        if asyncio.iscoroutinefunction(handler):
+            @wraps(handler)
+            async def checked_handler(*args, **kwargs):
+                assert_params_size(kwargs['params'])
+                return await handler(*args, **kwargs)
+        else:
+            @wraps(handler)
+            def checked_handler(*args, **kwargs):
+                assert_params_size(kwargs['params'])
+                return handler(*args, **kwargs)
 
         self._custom_handlers[handler.__name__] = {
             'handler': checked_handler,
-            'message': message or ('%s check failed' % (handler.__name__,))
+            'message': message or ('%s check failed' % (handler.__name__,)),
+            'params_count': params_count,
+            'io': io,
+            'cacheable': cacheable,
         }
+        self._plan = None
 
     @staticmethod
     def validate_accepted(value, **_kwargs):
-        return value in [1, '1', 'true', 'yes', 'on', True]
+        return value in accepted_values
 
     def validate_active_url(self, value, **_kwargs):
-        return self._can_call_with_method(requests.options, value)
+        checker = self._url_checker or default_url_checker()
+        return checker.is_active(value)
 
     def validate_after(self, value, params, **_kwargs):
         self._assert_params_size(size=1, params=params, rule='after')
@@ -137,7 +447,7 @@ class RulesProcessor:
     @staticmethod
     def validate_array(value, **_kwargs):
         try:
-            return isinstance(ast.literal_eval(str(value)), list)
+            return isinstance(RulesProcessor._as_list(value), list)
         except (ValueError, SyntaxError):
             return False
 
@@ -162,11 +472,31 @@ class RulesProcessor:
 
     @staticmethod
     def validate_boolean(value, **_kwargs):
-        return value in [True, False, 1, 0, '0', '1']
+        return value in boolean_values
+
+    def validate_checksum(self, value, params, **_kwargs):
+        self._assert_params_size(size=2, params=params, rule='checksum')
+        self._assert_with_method(hashlib.new, params[0])
+        if not self.validate_file(value):
+            return False
+        return file_digest(value, params[0]) in \
+            [checksum.lower() for checksum in params[1:]]
 
     def validate_confirmed(self, value, attribute, **_kwargs):
         return value == self._attribute_value(attribute + '_confirmation')
 
+    def validate_contains_bytes(self, value, params, **_kwargs):
+        self._assert_params_size(size=1, params=params, rule='contains_bytes')
+        if not self.validate_file(value):
+            return False
+        needle = params[0]
+        if needle.startswith('0x'):
+            self._assert_with_method(bytes.fromhex, needle[2:])
+            needle = bytes.fromhex(needle[2:])
+        else:
+            needle = needle.encode('utf-8')
+        return file_contains(value, needle)
+
     def validate_date(self, value, **_kwargs):
         return self._can_call_with_method(dateparse, value)
 
@@ -200,6 +530,7 @@ class RulesProcessor:
         if not self.validate_image(value):
             return False
         try:
+            from PIL import Image
             image = Image.open(value)
             w, h = image.size
             value.seek(0)
@@ -210,7 +541,7 @@ class RulesProcessor:
     @staticmethod
     def validate_distinct(value, **_kwargs):
         try:
-            lst = ast.literal_eval(str(value))
+            lst = RulesProcessor._as_list(value)
             if not isinstance(lst, list):
                 return False
             return len(set(lst)) == len(lst)
@@ -219,33 +550,35 @@ class RulesProcessor:
 
     @staticmethod
     def validate_email(value, **_kwargs):
-        pattern = re.compile("""
-            ^
-            [a-zA-Z0-9.!#$%&'*+/=?^_`{|}~-]
-            +@[a-zA-Z0-9]
-            (?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?
-            (?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*
-            $
-        """, re.VERBOSE | re.IGNORECASE | re.DOTALL)
-        return pattern.match(str(value)) is not None
+        return email_pattern.match(str(value)) is not None
 
-    @staticmethod
-    def validate_exists(value, **_kwargs):
-        return False
+    def validate_exists(self, value, attribute, params, rules, **_kwargs):
+        if self._lookup is None:
+            return False
+        self._assert_params_size(size=1, params=params, rule='exists')
+        table, column = self._lookup_target(attribute, params)
+        values = self._lookup_values(value, rules)
+        if values is None:
+            return False
+        exists = self._lookup_existence(table, column, values)
+        return len(values) > 0 and all(exists[str(v)] for v in values)
 
     def validate_extension(self, value, params, **_kwargs):
         if not self.validate_file(value):
             return False
         self._assert_params_size(size=1, params=params, rule='extension')
-        kind = filetype.guess(value.stream.read(512))
-        value.seek(0)
+        import filetype
+        kind = filetype.guess(file_head(value))
         if kind is None:
             return value.filename.split('.')[-1].lower() == params[0]
         return kind.extension in params
 
     @staticmethod
     def validate_file(value, **_kwargs):
-        return isinstance(value, FileStorage)
+        # no file can have been uploaded before werkzeug is loaded
+        datastructures = sys.modules.get('werkzeug.datastructures')
+        return datastructures is not None and \
+            isinstance(value, datastructures.FileStorage)
 
     def validate_filled(self, value, attribute, nullable, **_kwargs):
         if self.validate_present(attribute):
@@ -278,7 +611,7 @@ class RulesProcessor:
         self._assert_params_size(size=1, params=params, rule='in_array')
         other_value = self._attribute_value(params[0])
         try:
-            lst = ast.literal_eval(str(other_value))
+            lst = self._as_list(other_value)
             return value in lst
         except (ValueError, SyntaxError):
             return False
@@ -391,8 +724,8 @@ class RulesProcessor:
         if not self.validate_file(value):
             return False
         self._assert_params_size(size=1, params=params, rule='mime_types')
-        kind = filetype.guess(value.stream.read(512))
-        value.seek(0)
+        import filetype
+        kind = filetype.guess(file_head(value))
         if kind is None:
             return value.mimetype in params
         return kind.mime in params
@@ -407,7 +740,10 @@ class RulesProcessor:
         return not self.validate_in(value, params)
 
     def validate_not_regex(self, value, params, **_kwargs):
-        return not self.validate_regex(value, params)
+        self._assert_params_size(size=1, params=params, rule='not_regex')
+        is_match = self._match_regex(params[0], value)
+        # a match that ran out of time proves nothing either way
+        return is_match is not None and not is_match
 
     @staticmethod
     def validate_nullable(value, **_kwargs):
@@ -421,7 +757,7 @@ class RulesProcessor:
 
     def validate_present(self, attribute, **_kwargs):
         accessors = attribute.split('.')
-        request_param = self._request
+        request_param = self._current_context().request
         for accessor in accessors:
             if accessor not in request_param:
                 return False
@@ -430,8 +766,7 @@ class RulesProcessor:
 
     def validate_regex(self, value, params, **_kwargs):
         self._assert_params_size(size=1, params=params, rule='regex')
-        self._assert_with_method(re.compile, params[0])
-        return re.match(params[0], value)
+        return bool(self._match_regex(params[0], value))
 
     def validate_required(self, value, attribute, nullable, **_kwargs):
         if (not value and value != False and value != 0) and not nullable:
@@ -509,11 +844,19 @@ class RulesProcessor:
 
     @staticmethod
     def validate_timezone(value, **_kwargs):
+        import pytz
         return value in pytz.all_timezones
 
-    @staticmethod
-    def validate_unique(value, **_kwargs):
-        return False
+    def validate_unique(self, value, attribute, params, rules, **_kwargs):
+        if self._lookup is None:
+            return False
+        self._assert_params_size(size=1, params=params, rule='unique')
+        table, column = self._lookup_target(attribute, params)
+        values = self._lookup_values(value, rules)
+        if values is None:
+            return False
+        exists = self._lookup_existence(table, column, values)
+        return not any(exists[str(v)] for v in values)
 
     @staticmethod
     def validate_url(value, **_kwargs):
@@ -585,6 +928,285 @@ class RulesProcessor:
                 return True
         return False
 
+    def _compiled_plan(self):
+        plan = self._plan
+        if plan is None:
+            # concurrent calls wait for one compilation instead of racing
+            with self._plan_lock:
+                if self._plan is None:
+                    self._plan = self._compile_plan()
+                plan = self._plan
+        return plan
+
+    def _compile_plan(self):
+        plan = []
+        lookup_targets = []
+        for attribute, rules in self._rules.items():
+            should_bail = self._has_rule(rules, 'bail')
+            steps = []
+            for index, rule in enumerate(rules):
+                if self._regex_safety is not None and \
+                        rule['name'] in ['regex', 'not_regex'] and rule['params']:
+                    self._check_regex_safety(attribute, rule['params'][0])
+                if self._lookup is not None and \
+                        rule['name'] in ['exists', 'unique'] and rule['params']:
+                    table, column = self._lookup_target(attribute, rule['params'])
+                    lookup_targets.append((attribute, rules, table, column))
+                handler = self._get_rule_handler(rule['name'])
+                if self._result_cache is not None and \
+                        self._is_cacheable_rule(rule['name']):
+                    handler = cached(self._result_cache, rule['name'], handler)
+                if self._metrics is not None:
+                    handler = self._metrics.timed(rule['name'], handler)
+                if self._hooks is not None:
+                    handler = self._hooks.wrap_rule(rule['name'], handler)
+                is_io = self._io_executor is not None and not should_bail \
+                    and self._is_io_rule(rule['name'])
+                steps.append((
+                    index, rule, handler, is_io,
+                    asyncio.iscoroutinefunction(handler),
+                    self._is_io_rule(rule['name'])
+                    or rule['name'] in blocking_rules
+                ))
+            # with bail, cheap rules find a failure before expensive rules
+            # written after it run
+            if self._cost_table is not None:
+                steps.sort(key=lambda step: self._cost_table.cost(
+                    step[1]['name']))
+            plan.append((attribute, rules, should_bail, steps))
+        return plan, lookup_targets
+
+    def _generated_validator(self, plan):
+        # deadlines and attribute timings are checked between attributes,
+        # so those runs stay with the plan interpreter
+        if not self._codegen or self._deadline is not None or \
+                self._time_attributes:
+            return None
+        generated = self._generated
+        if generated is None or generated[0] is not plan:
+            with self._plan_lock:
+                generated = self._generated
+                if generated is None or generated[0] is not plan:
+                    from .codegen import generate_validator
+                    generated = (plan, generate_validator(self, plan))
+                    self._generated = generated
+        return generated[1]
+
+    def _check_rule_definition(self, rule):
+        custom_handler = self._custom_handlers.get('validate_' + rule['name'])
+        if custom_handler is not None:
+            self._assert_params_size(
+                size=custom_handler['params_count'], params=rule['params'],
+                rule=('custom rule validate_%s' % (rule['name'],)))
+            return
+        self._assert_params_size(size=rule_params.get(rule['name'], 0),
+                                 params=rule['params'], rule=rule['name'])
+        if rule['name'] in ['regex', 'not_regex']:
+            self._assert_with_method(re.compile, rule['params'][0])
+
+    def _check_regex_safety(self, attribute, pattern):
+        self._assert_with_method(re.compile, pattern)
+        risks = self._regex_risks.get(pattern)
+        if risks is None:
+            risks = self._regex_risks[pattern] = regex_risks(pattern)
+        try:
+            assert_safe_regex(pattern, attribute, risks)
+        except ValueError as error:
+            if self._regex_safety == 'reject':
+                raise
+            warnings.warn(str(error), RuntimeWarning)
+
+    def _match_regex(self, pattern, value):
+        self._assert_with_method(re.compile, pattern)
+        if self._regex_matcher is None:
+            return re.match(pattern, value) is not None
+        try:
+            return self._regex_matcher.match(pattern, value)
+        except RegexTimeout:
+            return None
+
+    def _is_io_rule(self, rule_name):
+        custom_handler = self._custom_handlers.get('validate_' + rule_name)
+        if custom_handler is not None:
+            return custom_handler['io']
+        return rule_name in io_rules
+
+    def _is_cacheable_rule(self, rule_name):
+        custom_handler = self._custom_handlers.get('validate_' + rule_name)
+        if custom_handler is not None:
+            return custom_handler['cacheable']
+        return rule_name in cacheable_rules
+
+    def _guard_attribute(self, attribute):
+        # checked before any rule gets to parse or match the value
+        max_length = self._max_lengths.get(attribute, self._max_length)
+        if max_length is None:
+            return None
+        value = self._attribute_value(attribute)
+        if isinstance(value, (str, bytes)) and len(value) > max_length:
+            return self._guard_validation(attribute, 'input_too_long')
+        return None
+
+    @staticmethod
+    def _guard_validation(attribute, rule):
+        return {
+            'attribute': attribute,
+            'rule': rule,
+            'is_valid': False,
+            'attribute_type': 'string',
+            'params': [],
+        }
+
+    def _prepare_step(self, attribute, rules, rule):
+        value = self._attribute_value(attribute)
+        is_nullable = self._is_attribute_nullable(
+            attribute=attribute,
+            params=rule['params'],
+            rules=rules,
+        )
+        validation = {
+            'attribute': attribute,
+            'rule': rule['name'],
+            'is_valid': False,
+            'attribute_type': self._get_type(value, rules),
+            'params': rule['params'],
+        }
+        kwargs = {
+            'value': value,
+            'attribute': attribute,
+            'params': rule['params'],
+            'nullable': is_nullable,
+            'rules': rules,
+        }
+        return validation, kwargs, value is None and is_nullable
+
+    def _run_in_executor(self, loop, previous, handler, kwargs):
+        async def run():
+            if previous is not None:
+                await asyncio.wait([previous])
+            return await loop.run_in_executor(
+                self._io_executor, bound(partial(handler, **kwargs)))
+        return asyncio.ensure_future(run())
+
+    @staticmethod
+    async def _join_async_rules(loop, pending, deadline):
+        timeout = None if deadline is None else max(0, deadline - loop.time())
+        done, _ = await asyncio.wait([task for task, _ in pending],
+                                     timeout=timeout)
+        passes = True
+        for task, validation in pending:
+            if task in done:
+                validation['is_valid'] = task.result()
+            else:
+                # out of time, count the rule as failed
+                task.cancel()
+            if not validation['is_valid']:
+                passes = False
+        return passes
+
+    @classmethod
+    def _call_handler(cls, handler, is_async, kwargs):
+        is_valid = handler(**kwargs)
+        if is_async:
+            is_valid = cls._run_coroutine(is_valid)
+        return is_valid
+
+    @staticmethod
+    def _run_coroutine(coroutine):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            loop.close()
+
+    def _join_io_rules(self, pending, deadline):
+        done, _ = wait_for_futures(
+            [future for future, _ in pending],
+            timeout=max(0, deadline - default_timer())
+        )
+        passes = True
+        for future, validation in pending:
+            if future in done:
+                validation['is_valid'] = future.result()
+            else:
+                # out of time, count the rule as failed
+                future.cancel()
+            if not validation['is_valid']:
+                passes = False
+        return passes
+
+    def _prefetch_lookups(self, lookup_targets):
+        # one query per table and column for the whole request
+        values_by_target = {}
+        for attribute, rules, table, column in lookup_targets:
+            # values the guards reject are never looked up
+            if self._guard_attribute(attribute) is not None:
+                continue
+            values = self._lookup_values(self._attribute_value(attribute),
+                                         rules)
+            if values:
+                values_by_target.setdefault((table, column), []).extend(
+                    values)
+        for (table, column), values in values_by_target.items():
+            self._lookup_existence(table, column, values)
+
+    def _lookup_existence(self, table, column, values):
+        exists = self._current_context().lookup_results.setdefault(
+            (table, column), {})
+        unchecked = {}
+        for value in values:
+            if str(value) not in exists:
+                unchecked[str(value)] = value
+        if unchecked:
+            existing = set(str(value) for value in self._lookup.existing(
+                table, column, list(unchecked.values())))
+            for key in unchecked:
+                exists[key] = key in existing
+        return exists
+
+    @staticmethod
+    def _lookup_target(attribute, params):
+        table = params[0]
+        column = params[1] if len(params) > 1 else attribute.split('.')[-1]
+        assert_identifier(table)
+        assert_identifier(column)
+        return table, column
+
+    @staticmethod
+    def _as_list(value):
+        # multi-valued form fields are lists already
+        if isinstance(value, list):
+            return value
+        return ast.literal_eval(str(value))
+
+    def _lookup_values(self, value, rules):
+        # None for values that fail without a query: anything but scalars,
+        # or more of them than the size rules let through
+        if value is None:
+            return []
+        if not isinstance(value, (list, tuple, set)):
+            return [value] if isinstance(value, lookup_value_types) else None
+        values = [item for item in value if item is not None]
+        if not all(isinstance(item, lookup_value_types) for item in values):
+            return None
+        max_count = self._max_count(rules)
+        if max_count is not None and len(values) > max_count:
+            return None
+        return values
+
+    @staticmethod
+    def _max_count(rules):
+        bounds = []
+        for rule in rules:
+            index = {'max': 0, 'size': 0, 'between': 1}.get(rule['name'])
+            if index is None or len(rule['params']) <= index:
+                continue
+            try:
+                bounds.append(float(rule['params'][index]))
+            except ValueError:
+                pass
+        return min(bounds) if bounds else None
+
     def _get_rule_handler(self, rule_name):
         handler_name = 'validate_' + rule_name
         if handler_name in self._custom_handlers:
@@ -598,12 +1220,11 @@ class RulesProcessor:
         rules = rules or {}
         value_type = self._get_type(value, rules)
         if value_type == 'array':
-            return len(ast.literal_eval(str(value)))
+            return len(self._as_list(value))
         elif value_type == 'numeric':
             return float(value)
         elif value_type == 'file':
-            value.seek(0, os.SEEK_END)
-            return round(value.tell() / 1024.0, 0)
+            return round(file_size(value) / 1024.0, 0)
         return len(str(value))
 
     def _get_type(self, value, rules=None):
@@ -644,9 +1265,13 @@ class RulesProcessor:
                 return True
         return False
 
+    def _current_context(self):
+        context = current_context()
+        return self._context if context is None else context
+
     def _attribute_value(self, attribute):
         accessors = attribute.split('.')
-        request_param = self._request
+        request_param = self._current_context().request
         for accessor in accessors:
             if accessor not in request_param:
                 return None
@@ -0,0 +1,100 @@
+from collections import deque
+from collections.abc import Mapping
+
+
+# the payloads slow enough to log are often pathological ones, so the
+# fingerprint stays small however deep or wide they are
+max_paths = 32
+max_depth = 8
+max_key_length = 24
+
+
+def shape_fingerprint(payload):
+    shapes, skipped = _collect_shapes(payload)
+    fingerprint = dict(
+        (path, '|'.join(
+            '%s(%s)' % (type_name, _describe_lengths(lengths))
+            if lengths else type_name
+            for type_name, lengths in sorted(types.items())
+        ))
+        for path, types in sorted(shapes.items())
+    )
+    if skipped:
+        fingerprint['…'] = '+%d more' % (skipped,)
+    return fingerprint
+
+
+def log_slow_validation(logger, request, elapsed, attribute_timings, payload):
+    logger.warning(
+        'Slow validation: %s took %.1fms (attributes: %s; payload shape: %s)',
+        request,
+        elapsed * 1000.0,
+        ', '.join(
+            '%s=%.1fms' % (attribute, seconds * 1000.0)
+            for attribute, seconds in sorted(
+                attribute_timings.items(), key=lambda item: -item[1])
+        ),
+        ', '.join(
+            '%s: %s' % (path, shape)
+            for path, shape in shape_fingerprint(payload).items()
+        ),
+    )
+
+
+def _collect_shapes(payload):
+    # breadth first, so the paths near the top are the ones kept
+    shapes = {}
+    skipped = 0
+    queue = deque([(payload, '', 1)])
+    while queue:
+        value, path, depth = queue.popleft()
+        types = shapes.get(path or '.')
+        if types is None:
+            if len(shapes) >= max_paths:
+                skipped += 1
+                continue
+            types = shapes[path or '.'] = {}
+        type_name = type(value).__name__
+        if isinstance(value, Mapping):
+            children = ((_join(path, _key(key)), item)
+                        for key, item in value.items())
+        elif isinstance(value, (list, tuple)):
+            children = ((_join(path, '*'), item) for item in value)
+        else:
+            children = None
+        if children is None and not isinstance(value, (str, bytes)):
+            types.setdefault(type_name, None)
+            continue
+        types[type_name] = _widen(types.get(type_name), len(value))
+        if children is None:
+            continue
+        if depth >= max_depth:
+            skipped += len(value)
+            continue
+        for child_path, item in children:
+            queue.append((item, child_path, depth + 1))
+    return shapes, skipped
+
+
+def _join(path, key):
+    return key if not path else path + '.' + key
+
+
+def _key(key):
+    key = str(key)
+    if len(key) > max_key_length:
+        return key[:max_key_length] + '…'
+    return key
+
+
+def _widen(lengths, length):
+    if lengths is None:
+        return (length, length)
+    return (min(lengths[0], length), max(lengths[1], length))
+
+
+def _describe_lengths(lengths):
+    lower, upper = lengths
+    if lower == upper:
+        return str(upper)
+    return '%d..%d' % (lower, upper)
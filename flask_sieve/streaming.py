@@ -0,0 +1,180 @@
+from flask import Request
+from werkzeug.formparser import FormDataParser, MultiPartParser
+from werkzeug.http import parse_options_header
+
+from flask_sieve.parser import Parser
+from flask_sieve.translator import Translator
+from flask_sieve.exceptions import ValidationException
+
+
+image_extensions = ['jpg', 'jpeg', 'gif', 'png', 'bmp', 'svg', 'tiff', 'tif']
+sniff_size = 512
+
+
+class UploadGuard:
+    def __init__(self, attribute, rules, translator):
+        self._attribute = attribute
+        self._translator = translator
+        self._max_bytes = None
+        self._max_rule = None
+        self._mime_types = None
+        self._extensions = None
+        self._image = False
+        for rule in rules:
+            if rule['name'] in ['max', 'size', 'between']:
+                # file sizes are compared in kilobytes, rounded
+                max_bytes = (float(rule['params'][-1]) + 0.5) * 1024
+                if self._max_bytes is None or max_bytes < self._max_bytes:
+                    self._max_bytes = max_bytes
+                    self._max_rule = rule
+            elif rule['name'] == 'mime_types':
+                self._mime_types = rule
+            elif rule['name'] == 'extension':
+                self._extensions = rule
+            elif rule['name'] == 'image':
+                self._image = True
+
+    def is_enabled(self):
+        return self._max_bytes is not None or self._image or \
+            self._mime_types is not None or self._extensions is not None
+
+    def start(self, filename, content_type):
+        if self._image and \
+                (filename or '').split('.')[-1] not in image_extensions:
+            self.fail({'name': 'image', 'params': []})
+        return _GuardedStream(self, filename, content_type)
+
+    def check_size(self, size):
+        if self._max_bytes is not None and size > self._max_bytes:
+            self.fail(self._max_rule)
+
+    def check_head(self, head, filename, content_type):
+        import filetype
+        kind = filetype.guess(head)
+        if self._mime_types is not None:
+            mime = kind.mime if kind is not None else \
+                parse_options_header(content_type or '')[0]
+            if mime not in self._mime_types['params']:
+                self.fail(self._mime_types)
+        if self._extensions is not None:
+            if kind is None:
+                is_valid = (filename or '').split('.')[-1].lower() == \
+                    self._extensions['params'][0]
+            else:
+                is_valid = kind.extension in self._extensions['params']
+            if not is_valid:
+                self.fail(self._extensions)
+
+    def fail(self, rule):
+        self._translator.set_validations({self._attribute: [{
+            'attribute': self._attribute,
+            'rule': rule['name'],
+            'is_valid': False,
+            'attribute_type': 'file',
+            'params': rule['params'],
+        }]})
+        raise ValidationException(self._translator.translated_errors())
+
+
+class _GuardedStream:
+    def __init__(self, guard, filename, content_type):
+        self._guard = guard
+        self._filename = filename
+        self._content_type = content_type
+        self._stream = None
+        self._size = 0
+        self._head = b''
+
+    def attach(self, stream):
+        self._stream = stream
+        return self
+
+    def write(self, data):
+        self._size += len(data)
+        self._guard.check_size(self._size)
+        if self._head is not None:
+            self._head += data[:sniff_size - len(self._head)]
+            if len(self._head) >= sniff_size:
+                head, self._head = self._head, None
+                self._guard.check_head(head, self._filename,
+                                       self._content_type)
+        return self._stream.write(data)
+
+    def seek(self, *args):
+        # the parser rewinds the stream once the part is complete
+        if self._head is not None:
+            head, self._head = self._head, None
+            self._guard.check_head(head, self._filename, self._content_type)
+        return self._stream.seek(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class _GuardedMultiPartParser(MultiPartParser):
+    def __init__(self, guards, *args, **kwargs):
+        super(_GuardedMultiPartParser, self).__init__(*args, **kwargs)
+        self._guards = guards
+
+    def start_file_streaming(self, event, total_content_length):
+        stream = super(_GuardedMultiPartParser, self).start_file_streaming(
+            event, total_content_length)
+        # every file of a field is guarded, a small first part must not
+        # let larger ones through
+        guard = self._guards.get(event.name)
+        if guard is None:
+            return stream
+        return guard.start(event.filename, event.headers.get('content-type')) \
+            .attach(stream)
+
+
+class _GuardedFormDataParser(FormDataParser):
+    upload_guards = None
+
+    def _parse_multipart(self, stream, mimetype, content_length, options):
+        if not self.upload_guards:
+            return super(_GuardedFormDataParser, self)._parse_multipart(
+                stream, mimetype, content_length, options)
+        parser = _GuardedMultiPartParser(
+            self.upload_guards,
+            stream_factory=self.stream_factory,
+            max_form_memory_size=self.max_form_memory_size,
+            max_form_parts=self.max_form_parts,
+            cls=self.cls,
+        )
+        boundary = options.get('boundary', '').encode('ascii')
+        if not boundary:
+            raise ValueError('Missing boundary')
+        form, files = parser.parse(stream, boundary, content_length)
+        return stream, form, files
+
+
+class StreamingRequestMixin:
+    form_data_parser_class = _GuardedFormDataParser
+    upload_guards = None
+
+    def set_upload_rules(self, rules, messages=None):
+        parser = Parser(rules)
+        translator = Translator(custom_messages=messages)
+        guards = {}
+        for attribute, attribute_rules in parser.parsed_rules().items():
+            guard = UploadGuard(attribute, attribute_rules, translator)
+            if guard.is_enabled():
+                guards[attribute] = guard
+        self.upload_guards = guards
+
+    def make_form_data_parser(self):
+        parser = super(StreamingRequestMixin, self).make_form_data_parser()
+        parser.upload_guards = self.upload_guards
+        return parser
+
+
+class StreamingRequest(StreamingRequestMixin, Request):
+    pass
+
+
+def streaming_request_class(request_class):
+    if issubclass(request_class, StreamingRequestMixin):
+        return request_class
+    return type('Streaming' + request_class.__name__,
+                (StreamingRequestMixin, request_class), {})
@@ -9,6 +9,7 @@ class Translator:
         self._validations = validations or {}
         self._custom_messages = custom_messages or {}
         self._handler_messages = handler_messages or {}
+        self._messages = self._merged_messages()
         self._size_rules = ['between', 'gt', 'gte',
                             'lt', 'lte', 'max', 'min', 'size']
 
@@ -17,13 +18,16 @@ class Translator:
 
     def set_handler_messages(self, messages):
         self._handler_messages = messages
+        self._messages = self._merged_messages()
 
     def set_validations(self, validations):
         self._validations = validations
 
-    def translated_errors(self):
+    def translated_errors(self, attributes_validations=None):
+        if attributes_validations is None:
+            attributes_validations = self._validations
         error_messages = {}
-        for attribute, validations in self._validations.items():
+        for attribute, validations in attributes_validations.items():
             translated = []
             for validation in validations:
                 if not validation['is_valid']:
@@ -57,6 +61,9 @@ class Translator:
         return message
 
     def _get_all_messages(self):
+        return self._messages
+
+    def _merged_messages(self):
         messages = {}
         messages.update(rule_messages)
         messages.update(self._handler_messages)
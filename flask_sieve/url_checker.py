@@ -0,0 +1,99 @@
+import threading
+
+from collections import OrderedDict
+from timeit import default_timer
+
+from urllib.parse import urlsplit
+
+
+class UrlChecker:
+    def __init__(self, timeout=5.0, ttl=300.0, max_entries=4096,
+                 pool_size=10, session=None):
+        self._timeout = timeout
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._session = session or self._make_session(pool_size)
+        self._lock = threading.Lock()
+        self._results = OrderedDict()
+        self._in_flight = {}
+
+    def is_active(self, url):
+        host = self._host(url)
+        if host is None:
+            return False
+        with self._lock:
+            cached = self._results.get(host)
+            if cached is not None and cached[0] > default_timer():
+                self._results.move_to_end(host)
+                return cached[1]
+            check = self._in_flight.get(host)
+            is_owner = check is None
+            if is_owner:
+                check = self._in_flight[host] = _InFlightCheck()
+        if not is_owner:
+            check.done.wait()
+            return check.result
+        try:
+            check.result = self._check(url)
+        finally:
+            with self._lock:
+                self._results[host] = \
+                    (default_timer() + self._ttl, check.result)
+                self._results.move_to_end(host)
+                while len(self._results) > self._max_entries:
+                    self._results.popitem(last=False)
+                del self._in_flight[host]
+            check.done.set()
+        return check.result
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+    def _check(self, url):
+        try:
+            self._session.options(url, timeout=self._timeout,
+                                  allow_redirects=False)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _host(url):
+        try:
+            parts = urlsplit(str(url))
+        except ValueError:
+            return None
+        if not parts.scheme or not parts.netloc:
+            return None
+        return '%s://%s' % (parts.scheme.lower(), parts.netloc.lower())
+
+    @staticmethod
+    def _make_session(pool_size):
+        import requests
+
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+
+class _InFlightCheck:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = False
+
+
+_default_checker = None
+_default_checker_lock = threading.Lock()
+
+
+def default_url_checker():
+    global _default_checker
+    if _default_checker is None:
+        with _default_checker_lock:
+            if _default_checker is None:
+                _default_checker = UrlChecker()
+    return _default_checker
@@ -0,0 +1,77 @@
+import threading
+
+try:
+    from contextvars import ContextVar, copy_context
+except ImportError:
+    # Python 3.6 has no contextvars, contexts are then kept per thread
+    ContextVar = copy_context = None
+
+
+# the rules and compiled plan of a processor are shared by every call, the
+# request and the results of one call live in its context
+class ValidationContext:
+    def __init__(self, request=None, source=None):
+        self.source = source
+        self.request = request
+        self.reset()
+
+    def reset(self):
+        self.validations = {}
+        self.attribute_timings = {}
+        self.lookup_results = {}
+        self.passes = None
+
+
+class _ThreadContextVar:
+    def __init__(self):
+        self._local = threading.local()
+
+    def get(self, default=None):
+        return getattr(self._local, 'value', default)
+
+    def set(self, value):
+        token = self.get()
+        self._local.value = value
+        return token
+
+    def reset(self, token):
+        self._local.value = token
+
+
+if ContextVar is not None:
+    _current = ContextVar('flask_sieve_validation_context')
+else:
+    _current = _ThreadContextVar()
+
+
+def current_context(default=None):
+    return _current.get(default)
+
+
+def activate(context):
+    return _current.set(context)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+def bound(fn):
+    # executor threads do not inherit the context of the submitting call,
+    # so the whole of it is copied over, Flask's app and request contexts
+    # included; each copy runs on one thread at a time, so bind per call
+    if copy_context is not None:
+        variables = copy_context()
+
+        def run_copied(*args, **kwargs):
+            return variables.run(fn, *args, **kwargs)
+        return run_copied
+    context = current_context()
+
+    def run(*args, **kwargs):
+        token = activate(context)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            deactivate(token)
+    return run
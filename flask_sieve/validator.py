@@ -1,27 +1,114 @@
-from functools import wraps
+import threading
 
-from flask import request as flask_request
+from functools import wraps
+from collections.abc import Mapping
 
+from flask_sieve.hooks import Hooks
+from flask_sieve.form_view import FormView
 from flask_sieve.parser import Parser
 from flask_sieve.translator import Translator
+from flask_sieve.payload_limits import rule_paths, body_size_bound, \
+    rejection
 from flask_sieve.rules_processor import RulesProcessor
+from flask_sieve.validation_context import ValidationContext
 
 
 class Validator:
     def __init__(self, rules=None, request=None, custom_handlers=None,
-            messages=None, **kwargs):
+            messages=None, metrics=None, hooks=None, name=None,
+            cost_table=None, io_executor=None, io_timeout=10.0, **kwargs):
+        self._name = name
         self._parser = Parser()
         self._translator = Translator(custom_messages=messages)
         self._processor = RulesProcessor()
+        self._processor.set_metrics(metrics)
+        self._processor.set_cost_table(cost_table)
+        self._processor.set_io_executor(io_executor, io_timeout)
+        self._hooks = Hooks(hooks)
+        self._processor.set_hooks(self._hooks)
         self._rules = rules or {}
+        self._parsed_rules = None
+        self._rules_lock = threading.Lock()
+        self._rule_paths = None
+        self._body_size_bounds = {}
         self._custom_handlers = custom_handlers or {}
-        self._request = self._parse_request(request or {})
+        self._payload_limits = None
+        self._decoders = {}
+        self._plan_cache = None
+        # parsed on first use, so limits can be checked before copying
+        self._context = ValidationContext(source=request or {})
 
     def set_rules(self, rules):
         self._rules = rules
+        self._parsed_rules = None
+        self._rule_paths = None
+        self._body_size_bounds = {}
 
     def set_request(self, request):
-        self._request = self._parse_request(request or {})
+        self._context = ValidationContext(source=request or {})
+
+    def set_payload_limits(self, limits):
+        self._payload_limits = limits
+
+    def set_decoders(self, decoders):
+        self._decoders = decoders or {}
+
+    def set_plan_cache(self, plan_cache):
+        self._plan_cache = plan_cache
+
+    def set_metrics(self, metrics):
+        self._processor.set_metrics(metrics)
+
+    def set_cost_table(self, cost_table):
+        self._processor.set_cost_table(cost_table)
+
+    def set_io_executor(self, executor, timeout=10.0):
+        self._processor.set_io_executor(executor, timeout)
+
+    def set_result_cache(self, result_cache):
+        self._processor.set_result_cache(result_cache)
+
+    def set_max_length(self, max_length):
+        self._processor.set_max_length(max_length)
+
+    def set_max_lengths(self, max_lengths):
+        self._processor.set_max_lengths(max_lengths)
+
+    def set_deadline(self, seconds):
+        self._processor.set_deadline(seconds)
+
+    def set_regex_safety(self, mode):
+        self._processor.set_regex_safety(mode)
+
+    def set_regex_matcher(self, matcher):
+        self._processor.set_regex_matcher(matcher)
+
+    def set_lookup(self, lookup):
+        self._processor.set_lookup(lookup)
+
+    def set_url_checker(self, url_checker):
+        self._processor.set_url_checker(url_checker)
+
+    def set_hooks(self, hooks):
+        self._hooks = Hooks(hooks)
+        self._processor.set_hooks(self._hooks)
+
+    def set_attribute_timing(self, enabled):
+        self._processor.set_attribute_timing(enabled)
+
+    def set_codegen(self, enabled):
+        self._processor.set_codegen(enabled)
+
+    def attribute_timings(self):
+        return self._context.attribute_timings
+
+    def payload(self):
+        return self._payload(self._context)
+
+    def register_hook(self, event, hook):
+        self._hooks.register(event, hook)
+        self._processor.set_hooks(self._hooks)
+        return hook
 
     def set_custom_messages(self, messages):
         self._translator.set_custom_messages(messages)
@@ -30,7 +117,8 @@ class Validator:
         for handler in handlers:
             self.register_rule_handler(**handler)
 
-    def register_rule_handler(self, handler, message, params_count=0):
+    def register_rule_handler(self, handler, message, params_count=0,
+                              io=False, cacheable=False):
         if not handler.__name__.startswith('validate_'):
             raise ValueError(
                 'Rule handlers must start with "validate_" name, %s provided'
@@ -39,7 +127,9 @@ class Validator:
         self._processor.register_rule_handler(
             handler=handler,
             message=message,
-            params_count=params_count
+            params_count=params_count,
+            io=io,
+            cacheable=cacheable
         )
         handler_messages = {}
         for handler_name, handler_dict in self._processor.custom_handlers().items():
@@ -50,29 +140,184 @@ class Validator:
         return not self.passes()
 
     def passes(self):
-        self._parser.set_rules(self._rules)
-        self._processor.set_rules(self._parser.parsed_rules())
-        self._processor.set_request(self._request)
-        return self._processor.passes()
+        return self._run(self._context)
+
+    async def passes_async(self, timeout=None):
+        return await self._run_async(self._context, timeout)
 
     def messages(self):
-        self._translator.set_validations(self._processor.validations())
-        return self._translator.translated_errors()
+        return self._translator.translated_errors(self._context.validations)
+
+    def validate(self, request):
+        # unlike passes(), safe to call from many threads at once
+        context = ValidationContext(source=request or {})
+        self._run(context)
+        return ValidationResult(context, self._translator)
+
+    async def validate_async(self, request, timeout=None):
+        context = ValidationContext(source=request or {})
+        await self._run_async(context, timeout)
+        return ValidationResult(context, self._translator)
+
+    def compile(self):
+        fingerprint = schema = None
+        if self._plan_cache is not None and self._parsed_rules is None:
+            fingerprint = self._plan_cache.fingerprint(
+                self._rules, self._processor.custom_handlers())
+            schema = self._plan_cache.load(fingerprint)
+        if schema is not None:
+            with self._rules_lock:
+                if self._parsed_rules is None:
+                    self._processor.load_schema(schema)
+                    self._rule_paths = rule_paths(self._rules.keys())
+                    self._parsed_rules = schema['rules']
+        self._compiled_rules()
+        self._processor.compile()
+        if fingerprint is not None and schema is None:
+            self._plan_cache.store(fingerprint, self._processor.schema())
+
+    def freeze(self):
+        self.compile()
+        self._parsed_rules = self._processor.freeze()
+        allowed, prefixes = self._rule_paths
+        self._rule_paths = (frozenset(allowed), frozenset(prefixes))
+
+    def _run(self, context):
+        if not self._prepare(context):
+            return False
+
+        def run():
+            return self._processor.run(context).passes
+        return self._hooks.wrap_request(self._name, run)()
 
-    @staticmethod
-    def _parse_request(request):
-        if isinstance(request, dict):
+    async def _run_async(self, context, timeout):
+        if not self._prepare(context):
+            return False
+
+        async def run(timeout=None):
+            await self._processor.run_async(context, timeout=timeout)
+            return context.passes
+        return await self._hooks.wrap_request(self._name, run)(
+            timeout=timeout)
+
+    def _prepare(self, context):
+        parsed_rules = self._compiled_rules()
+        rejections = {}
+        for validation in self._reject_payload(context, parsed_rules):
+            rejections.setdefault(
+                validation['attribute'], []).append(validation)
+        if rejections:
+            context.reset()
+            context.validations = rejections
+            context.passes = False
+            return False
+        self._payload(context)
+        return True
+
+    def _compiled_rules(self):
+        # rules are parsed and compiled once for every request validated
+        parsed_rules = self._parsed_rules
+        if parsed_rules is None:
+            with self._rules_lock:
+                if self._parsed_rules is None:
+                    self._parser.set_rules(self._rules)
+                    parsed_rules = self._parser.parsed_rules()
+                    self._processor.set_rules(parsed_rules)
+                    self._rule_paths = rule_paths(self._rules.keys())
+                    self._parsed_rules = parsed_rules
+                parsed_rules = self._parsed_rules
+        return parsed_rules
+
+    def _payload(self, context):
+        if context.request is None:
+            context.request = self._parse_request(context.source)
+        return context.request
+
+    def _reject_payload(self, context, parsed_rules):
+        limits = self._payload_limits
+        source = context.source
+        if context.request is None and not isinstance(source, Mapping):
+            # nothing of the body has been read yet
+            if limits is not None:
+                rejections = self._reject_unread_body(limits, parsed_rules,
+                                                      source)
+                if rejections:
+                    return rejections
+            if self._decoder(source) is not None:
+                try:
+                    payload = self._payload(context)
+                except ValueError:
+                    return [rejection('request', 'payload_undecodable')]
+                if not isinstance(payload, Mapping):
+                    return [rejection('request', 'payload_not_object')]
+        if limits is None:
+            return []
+        return limits.check(self._payload(context), self._rule_paths)
+
+    def _reject_unread_body(self, limits, parsed_rules, source):
+        # decoded bodies are bounded like JSON, which is never more compact
+        is_json = source.is_json or self._decoder(source) is not None
+        if is_json not in self._body_size_bounds:
+            self._body_size_bounds[is_json] = \
+                body_size_bound(parsed_rules, is_json)
+        rejections = limits.check_content_length(
+            source.content_length, self._body_size_bounds[is_json])
+        if not rejections and not is_json:
+            rejections = limits.check_form(source.form, source.files)
+        return rejections
+
+    def _decoder(self, request):
+        if not self._decoders:
+            return None
+        return self._decoders.get(getattr(request, 'mimetype', None))
+
+    def _parse_request(self, request):
+        if isinstance(request, Mapping):
             return request
+        decoder = self._decoder(request)
+        if decoder is not None:
+            return decoder(request.get_data())
         # instance of flask.request ...
         if request.is_json:
             return request.json
+        # a view over the multidicts keeps repeated fields without copying
+        if hasattr(request.form, 'getlist') and \
+                hasattr(request.files, 'getlist'):
+            return FormView(request.form, request.files)
         dict_request = {}
         dict_request.update(request.form.to_dict(flat=True))
         dict_request.update(request.files.to_dict(flat=True))
         return dict_request
 
 
+class ValidationResult:
+    def __init__(self, context, translator):
+        self._context = context
+        self._translator = translator
+
+    def passes(self):
+        return self._context.passes
+
+    def fails(self):
+        return not self._context.passes
+
+    def messages(self):
+        return self._translator.translated_errors(self._context.validations)
+
+    def payload(self):
+        return self._context.request
+
+    def attribute_timings(self):
+        return self._context.attribute_timings
+
+
+# request classes used with validate() and async_validate(), for preloading
+validated_requests = []
+
+
 def validate(Request):
+    validated_requests.append(Request)
+
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
@@ -81,3 +326,16 @@ def validate(Request):
             return fn(*args, **kwargs)
         return wrapper
     return decorator
+
+
+def async_validate(Request):
+    validated_requests.append(Request)
+
+    def decorator(fn):
+        @wraps(fn)
+        async def wrapper(*args, **kwargs):
+            req = Request()
+            await req.validate_async()
+            return await fn(*args, **kwargs)
+        return wrapper
+    return decorator
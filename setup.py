@@ -13,7 +13,8 @@ setup(
     maintainer='Edward Njoroge',
     maintainer_email='codingedward@gmail.com',
     install_requires=[
-        'Flask',
+        'Flask>=2.2.3',
+        'Werkzeug>=2.2.3',
         'Pillow',
         'python-dateutil',
         'pytz',
@@ -22,7 +23,6 @@ setup(
     ],
     classifiers=[
         'Development Status :: 5 - Production/Stable',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
         'Programming Language :: Python :: 3.9',
@@ -34,6 +34,6 @@ setup(
         'Source': 'https://github.com/codingedward/flask-sieve/',
         'Tracker': 'https://github.com/codingedward/flask-sieve/issues',
     },
-    python_requires='>=3.6',
+    python_requires='>=3.7',
     zip_safe=False
 )
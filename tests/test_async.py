@@ -0,0 +1,154 @@
+import time
+import asyncio
+import unittest
+
+from werkzeug.datastructures import FileStorage
+
+from flask_sieve.exceptions import ValidationException
+from flask_sieve.metrics import Metrics
+from flask_sieve.requests import JsonRequest
+from flask_sieve.validator import Validator, async_validate
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def validate_remote_lookup(value, **_kwargs):
+    await asyncio.sleep(0.2)
+    return value == 'ok'
+
+
+async def validate_hanging_lookup(value, **_kwargs):
+    await asyncio.sleep(1)
+    return True
+
+
+class JsonMockRequest:
+    def __init__(self, data=None):
+        self.json = data or {}
+        self.is_json = True
+
+
+class LookupRequest(JsonRequest):
+    def rules(self):
+        return {'name': ['required', 'remote_lookup']}
+
+    def custom_handlers(self):
+        return [{'handler': validate_remote_lookup, 'message': 'Not found'}]
+
+
+class TestAsync(unittest.TestCase):
+    def _validator(self, rules, request):
+        validator = Validator(rules=rules, request=request)
+        validator.set_custom_handlers([
+            {'handler': validate_remote_lookup, 'message': 'Not found'},
+            {'handler': validate_hanging_lookup, 'message': 'Timed out'},
+        ])
+        return validator
+
+    def test_awaits_coroutine_handlers_concurrently(self):
+        rules = dict(('field_%d' % i, ['required', 'remote_lookup'])
+                     for i in range(5))
+        request = dict((field, 'ok') for field in rules)
+        request['field_2'] = 'bad'
+        validator = self._validator(rules, request)
+        start = time.time()
+        self.assertFalse(run(validator.passes_async()))
+        self.assertLess(time.time() - start, 0.8)
+        self.assertDictEqual({'field_2': ['Not found']}, validator.messages())
+
+    def test_runs_coroutine_handlers_synchronously(self):
+        validator = self._validator({'field': ['remote_lookup']},
+                                    {'field': 'ok'})
+        self.assertTrue(validator.passes())
+        validator.set_request({'field': 'bad'})
+        self.assertTrue(validator.fails())
+
+    def test_fails_rules_past_the_timeout(self):
+        validator = self._validator({'field': ['hanging_lookup']},
+                                    {'field': 'ok'})
+        start = time.time()
+        self.assertFalse(run(validator.passes_async(timeout=0.1)))
+        self.assertLess(time.time() - start, 0.5)
+        self.assertDictEqual({'field': ['Timed out']}, validator.messages())
+
+    def test_runs_blocking_rules_in_executor(self):
+        with open('tests/files/image.png', 'rb') as stream:
+            image = FileStorage(stream=stream, filename='image.txt',
+                                content_type='text/plain')
+            validator = Validator(
+                rules={
+                    'image': ['file', 'mime_types:image/png', 'extension:png'],
+                    'starts_at': ['date', 'after:2018-01-01'],
+                },
+                request={'image': image, 'starts_at': '2019-01-01'},
+            )
+            self.assertTrue(run(validator.passes_async()))
+
+    def test_keeps_order_with_bail(self):
+        validator = self._validator(
+            {'field': ['bail', 'remote_lookup', 'hanging_lookup']},
+            {'field': 'bad'}
+        )
+        self.assertFalse(run(validator.passes_async(timeout=0.5)))
+        self.assertDictEqual({'field': ['Not found']}, validator.messages())
+
+    def test_times_attributes(self):
+        validator = self._validator(
+            {'name': ['required', 'remote_lookup'],
+             'other': ['bail', 'remote_lookup']},
+            {}
+        )
+        validator.set_attribute_timing(True)
+        result = run(validator.validate_async({'name': 'ok',
+                                               'other': 'ok'}))
+        self.assertTrue(result.passes())
+        self.assertEqual(['name', 'other'],
+                         sorted(result.attribute_timings()))
+        self.assertGreaterEqual(result.attribute_timings()['other'], 0.2)
+
+    def test_records_metrics_and_hooks_for_coroutines(self):
+        metrics = Metrics()
+        calls = []
+        validator = self._validator({'field': ['remote_lookup']},
+                                    {'field': 'ok'})
+        validator.set_metrics(metrics)
+        validator.register_hook('after_rule', lambda **kwargs: calls.append(kwargs))
+        self.assertTrue(run(validator.passes_async()))
+        counters = metrics.as_dict()['rules']['remote_lookup']
+        self.assertEqual(0, counters['failures'])
+        self.assertGreaterEqual(counters['seconds'], 0.2)
+        self.assertIs(True, calls[0]['result'])
+
+    def test_validates_form_requests(self):
+        request = LookupRequest(request=JsonMockRequest({'name': 'ok'}))
+        self.assertTrue(run(request.validate_async()))
+        request = LookupRequest(request=JsonMockRequest({'name': 'bad'}))
+        with self.assertRaises(ValidationException):
+            run(request.validate_async())
+
+    def test_async_validate_decorator(self):
+        class PassingRequest:
+            async def validate_async(self):
+                return True
+
+        class FailingRequest:
+            async def validate_async(self):
+                raise ValueError()
+
+        @async_validate(PassingRequest)
+        async def passing_endpoint():
+            return 'ok'
+
+        @async_validate(FailingRequest)
+        async def failing_endpoint():
+            return 'ok'
+
+        self.assertEqual('ok', run(passing_endpoint()))
+        with self.assertRaises(ValueError):
+            run(failing_endpoint())
@@ -0,0 +1,147 @@
+import unittest
+
+from flask import Flask
+
+from flask_sieve import Sieve, JsonRequest
+from flask_sieve.validator import Validator
+from flask_sieve.cost_table import CostTable
+
+
+rule_sets = [
+    {'name': ['required', 'string', 'max:10'],
+     'email': ['required', 'email'],
+     'age': ['sometimes', 'integer', 'between:18,99'],
+     'role': ['in:admin,editor'],
+     'banned': ['not_in:root,admin']},
+    {'code': ['bail', 'required', 'regex:^[a-z]+$', 'min:3'],
+     'tag': ['nullable', 'not_regex:^x', 'size:4']},
+    {'nickname': ['required_with:age', 'string'],
+     'reason': ['required_if:status,closed', 'max:5'],
+     'status': ['sometimes', 'required_unless:kind,draft', 'in:open,closed'],
+     'age': ['nullable', 'integer'],
+     'kind': ['boolean'],
+     'terms': ['accepted']},
+    {'user.name': ['required', 'alpha', 'min:2'],
+     'user.address.city': ['sometimes', 'string', 'max:3'],
+     'price': ['sometimes', 'numeric', 'max:9.5', 'min:0.5'],
+     'items': ['sometimes', 'array', 'size:2']},
+]
+
+payloads = [
+    {},
+    {'name': 'ab', 'email': 'a@b.co', 'age': '20', 'role': 'admin',
+     'banned': 'bob'},
+    {'name': 'a name that is long', 'email': 'not email', 'age': '12',
+     'role': 'root', 'banned': 'root'},
+    {'name': '', 'email': None, 'age': None, 'role': None, 'banned': None},
+    {'name': 0, 'email': 5, 'age': 'x', 'role': 'editor'},
+    {'code': 'abcd', 'tag': 'abcd'},
+    {'code': 'Ab', 'tag': 'xbcd'},
+    {'code': 'ab', 'tag': None},
+    {'code': '', 'tag': 'ab'},
+    {'nickname': 'n', 'age': '3', 'status': 'closed', 'reason': 'too long',
+     'kind': '1', 'terms': 'yes'},
+    {'age': '3', 'status': 'closed', 'kind': 'maybe', 'terms': 'no'},
+    {'status': None, 'kind': 0, 'reason': 'ok', 'terms': True},
+    {'age': None, 'status': 'other', 'kind': 'draft'},
+    {'user': {'name': 'Al', 'address': {'city': 'Rome'}}, 'price': '3.5',
+     'items': ['a', 'b']},
+    {'user': {'name': 'A1'}, 'price': '10', 'items': ['a']},
+    {'user': {'address': None}, 'price': 'cheap', 'items': 'nope'},
+    {'user': 'flat', 'price': '0.1', 'items': []},
+]
+
+
+def validate_even(value, **_kwargs):
+    return str(value).isdigit() and int(value) % 2 == 0
+
+
+async def validate_odd(value, **_kwargs):
+    return str(value).isdigit() and int(value) % 2 == 1
+
+
+def validate_required_if(value, **_kwargs):
+    return value is not None
+
+
+def outcome(validator, payload):
+    try:
+        result = validator.validate(payload)
+        return (result.passes(), result.messages(),
+                result._context.validations)
+    except Exception as error:
+        return type(error)
+
+
+class TestCodegen(unittest.TestCase):
+    def _validators(self, rules, configure=None):
+        validators = []
+        for codegen in [False, True]:
+            validator = Validator(rules=rules)
+            validator.set_codegen(codegen)
+            if configure is not None:
+                configure(validator)
+            validators.append(validator)
+        return validators
+
+    def assertSameOutcomes(self, rules, configure=None):
+        interpreted, generated = self._validators(rules, configure)
+        for payload in payloads:
+            self.assertEqual(outcome(interpreted, payload),
+                             outcome(generated, payload), payload)
+        self.assertIsNotNone(generated._processor._generated[1])
+
+    def test_matches_the_interpreter(self):
+        for rules in rule_sets:
+            self.assertSameOutcomes(rules)
+
+    def test_matches_the_interpreter_with_ordering_and_limits(self):
+        def configure(validator):
+            validator.set_cost_table(CostTable())
+            validator.set_max_length(6)
+            validator.set_max_lengths({'email': 30})
+        for rules in rule_sets:
+            self.assertSameOutcomes(rules, configure)
+
+    def test_leaves_missing_parameters_to_the_handlers(self):
+        for rules in [{'name': ['max']}, {'name': ['min']},
+                      {'name': ['between:1']}, {'name': ['size']}]:
+            self.assertSameOutcomes(rules)
+
+    def test_calls_custom_and_async_handlers(self):
+        def configure(validator):
+            validator.register_rule_handler(
+                handler=validate_even, message='Must be even')
+            validator.register_rule_handler(
+                handler=validate_odd, message='Must be odd')
+        rules = {'age': ['sometimes', 'even'], 'name': ['odd'],
+                 'code': ['bail', 'required', 'even']}
+        self.assertSameOutcomes(rules, configure)
+
+    def test_falls_back_to_the_interpreter(self):
+        validator = Validator(rules={'name': ['required']})
+        validator.set_codegen(True)
+        validator.set_deadline(1.0)
+        self.assertFalse(validator.validate({}).passes())
+        self.assertIsNone(validator._processor._generated)
+        validator.set_deadline(None)
+        validator.register_rule_handler(
+            handler=validate_required_if, message='Required')
+        validator.set_rules({'age': ['required_if:name,x']})
+        self.assertTrue(validator.validate({'age': '2'}).passes())
+        self.assertIsNone(validator._processor._generated[1])
+
+    def test_generated_validator_is_shared_per_request_class(self):
+        class PostRequest(JsonRequest):
+            def rules(self):
+                return rule_sets[0]
+
+        app = Flask(__name__)
+        app.config['SIEVE_PRELOAD'] = [PostRequest]
+        app.config['SIEVE_CODEGEN'] = True
+        sieve = Sieve(app)
+        validator = list(sieve.validators.values())[0]
+        generated = validator._processor._generated[1]
+        self.assertIn('def generated_validator', generated.source)
+        validator.validate(payloads[1])
+        self.assertIs(generated, validator._processor._generated[1])
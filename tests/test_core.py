@@ -0,0 +1,38 @@
+import sys
+import subprocess
+import unittest
+
+import flask_sieve
+
+
+class TestCore(unittest.TestCase):
+    def test_validates_without_importing_flask(self):
+        output = subprocess.check_output([sys.executable, '-c', '''
+import sys
+from flask_sieve.core import Validator
+validator = Validator(rules={'email': ['required', 'email'], 'age': ['integer']},
+                      request={'email': 'a@b.com', 'age': 'x'})
+print(validator.passes(), validator.messages())
+print(sorted(name for name in ['flask', 'werkzeug', 'requests', 'PIL']
+             if name in sys.modules))
+'''])
+        self.assertEqual(
+            "False {'age': ['The age must be an integer.']}\n[]\n",
+            output.decode('utf-8'))
+
+    def test_loads_the_flask_integration_without_filetype(self):
+        output = subprocess.check_output([sys.executable, '-c', '''
+import sys
+from flask import Flask
+from flask_sieve import Sieve
+Sieve(Flask(__name__))
+print('filetype' in sys.modules)
+'''])
+        self.assertEqual('False\n', output.decode('utf-8'))
+
+    def test_package_exports_the_flask_integration(self):
+        from flask_sieve.extension import Sieve
+        self.assertIs(Sieve, flask_sieve.Sieve)
+        self.assertIn('JsonRequest', dir(flask_sieve))
+        with self.assertRaises(AttributeError):
+            flask_sieve.Missing
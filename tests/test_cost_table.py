@@ -0,0 +1,104 @@
+import unittest
+
+from flask_sieve.cost_table import CostTable
+from flask_sieve.metrics import Metrics
+from flask_sieve.parser import Parser
+from flask_sieve.rules_processor import RulesProcessor
+
+
+class TestCostTable(unittest.TestCase):
+    def setUp(self):
+        self._calls = []
+        self._table = CostTable()
+        self._processor = RulesProcessor()
+        self._processor.set_cost_table(self._table)
+        for name in ['slow_lookup', 'tracked_string']:
+            self._processor.register_rule_handler(
+                handler=self._tracking_handler(name),
+                message=None,
+            )
+
+    def _tracking_handler(self, name):
+        def handler(value, **_kwargs):
+            self._calls.append(name)
+            return value == 'ok'
+        handler.__name__ = 'validate_' + name
+        return handler
+
+    def _validate(self, rules, request):
+        self._processor.set_rules(Parser(rules).parsed_rules())
+        self._processor.set_request(request)
+        return self._processor.passes()
+
+    def test_orders_rules_by_cost(self):
+        self.assertTrue(self._table.cost('string') < self._table.cost('regex'))
+        self.assertTrue(self._table.cost('regex') < self._table.cost('image'))
+        self.assertTrue(self._table.cost('image') < self._table.cost('active_url'))
+        self.assertEqual(self._table.cost('active_url'),
+                         self._table.cost('custom'))
+
+    def test_runs_cheap_rules_first(self):
+        self._table.set_cost('tracked_string', 0)
+        self._validate(
+            rules={'field': ['slow_lookup', 'tracked_string']},
+            request={'field': 'ok'},
+        )
+        self.assertEqual(['tracked_string', 'slow_lookup'], self._calls)
+
+    def test_keeps_reported_order(self):
+        self._table.set_cost('tracked_string', 0)
+        self.assertFalse(self._validate(
+            rules={'field': ['slow_lookup', 'tracked_string', 'max:1']},
+            request={'field': 'bad'},
+        ))
+        self.assertEqual(
+            ['slow_lookup', 'tracked_string', 'max'],
+            [v['rule'] for v in self._processor.validations()['field']]
+        )
+
+    def test_keeps_written_order_with_bail(self):
+        self._table.set_cost('tracked_string', 0)
+        self.assertFalse(self._validate(
+            rules={'field': ['bail', 'slow_lookup', 'tracked_string']},
+            request={'field': 'bad'},
+        ))
+        self.assertEqual(['tracked_string', 'slow_lookup'], self._calls)
+        self.assertEqual(
+            ['bail', 'slow_lookup'],
+            [v['rule'] for v in self._processor.validations()['field']]
+        )
+
+    def test_skips_rules_written_after_a_failure_with_bail(self):
+        self._table.set_cost('tracked_string', 0)
+        self.assertFalse(self._validate(
+            rules={'field': ['bail', 'tracked_string', 'slow_lookup']},
+            request={'field': 'bad'},
+        ))
+        self.assertEqual(['tracked_string'], self._calls)
+        self.assertEqual(
+            ['bail', 'tracked_string'],
+            [v['rule'] for v in self._processor.validations()['field']]
+        )
+
+    def test_raises_errors_in_written_order_with_bail(self):
+        rules = {'field': ['bail', 'required', 'regex:^a']}
+        self._table.set_cost('regex', 0)
+        self.assertFalse(self._validate(rules=rules, request={}))
+        self.assertEqual(
+            ['bail', 'required'],
+            [v['rule'] for v in self._processor.validations()['field']]
+        )
+        self.assertTrue(self._validate(rules=rules, request={'field': 'ab'}))
+        with self.assertRaises(TypeError):
+            self._validate(rules=rules, request={'field': 1})
+
+    def test_learns_costs_from_metrics(self):
+        metrics = Metrics()
+        for _ in range(10):
+            metrics.record_rule('slow_lookup', 0.000001, True)
+            metrics.record_rule('string', 1.0, True)
+        self._table.learn(metrics, min_calls=10)
+        self.assertAlmostEqual(0.000001, self._table.cost('slow_lookup'))
+        self.assertAlmostEqual(1.0, self._table.cost('string'))
+        self._table.learn(Metrics(), min_calls=10)
+        self.assertAlmostEqual(1.0, self._table.cost('string'))
@@ -0,0 +1,103 @@
+import io
+import json
+import unittest
+
+from flask import Flask
+
+from flask_sieve import Sieve, FormRequest, JsonRequest, validate
+from flask_sieve.decoders import NdjsonDecoder, default_decoders, \
+    iter_decoded_items
+
+
+def decode_pairs(data):
+    # a stand-in binary format: key=value pairs separated by NUL bytes
+    pairs = [pair.split(b'=', 1) for pair in data.split(b'\0') if pair]
+    if any(len(pair) != 2 for pair in pairs):
+        raise ValueError('Malformed pair')
+    return dict((key.decode(), value.decode()) for key, value in pairs)
+
+
+class TestDecoders(unittest.TestCase):
+    def test_decodes_ndjson(self):
+        body = b'{"id": 1}\n\n{"id": 2}\n'
+        self.assertEqual([{'id': 1}, {'id': 2}], NdjsonDecoder()(body))
+        self.assertEqual([(0, {'id': 1}), (1, {'id': 2})],
+                         list(NdjsonDecoder.iter_items(io.BytesIO(body))))
+        self.assertRaises(ValueError, NdjsonDecoder(), b'{"id": \n')
+
+    def test_registers_ndjson_by_default(self):
+        self.assertIsInstance(default_decoders()['application/x-ndjson'],
+                              NdjsonDecoder)
+
+    def test_iterates_items_of_whole_body_decoders(self):
+        items = iter_decoded_items(json.loads, io.BytesIO(b'[1, 2]'))
+        self.assertEqual([(0, 1), (1, 2)], list(items))
+        self.assertRaises(ValueError, iter_decoded_items, json.loads,
+                          io.BytesIO(b'{}'))
+
+
+class TestDecodedRequests(unittest.TestCase):
+    def setUp(self):
+        self._app = Flask(__name__)
+        self._sieve = Sieve(self._app)
+        self._sieve.register_decoder('application/x-pairs', decode_pairs)
+
+        class SignupRequest(JsonRequest):
+            def rules(self):
+                return {'email': ['required', 'email']}
+
+        class ImportRequest(JsonRequest):
+            streaming = True
+
+            def rules(self):
+                return {'id': ['required', 'integer']}
+
+        class ContactRequest(FormRequest):
+            def rules(self):
+                return {'name': ['required']}
+
+        for path, request_class in [('/signup', SignupRequest),
+                                    ('/import', ImportRequest),
+                                    ('/contact', ContactRequest)]:
+            self._app.add_url_rule(
+                path, path, validate(request_class)(lambda: 'ok'),
+                methods=['POST'])
+        self._client = self._app.test_client()
+
+    def _post(self, path, data, content_type='application/x-pairs'):
+        return self._client.post(path, data=data, content_type=content_type)
+
+    def test_validates_registered_formats(self):
+        self.assertEqual(200, self._post('/signup', b'email=a@b.com')
+                         .status_code)
+        self.assertEqual(200, self._post('/contact', b'name=Joe\0x=1')
+                         .status_code)
+        response = self._post('/signup', b'email=invalid')
+        self.assertEqual({'email': ['The email must be a valid email address.']},
+                         response.get_json()['errors'])
+
+    def test_rejects_bodies_that_do_not_decode(self):
+        response = self._post('/signup', b'email')
+        self.assertEqual({'request': ['The request could not be decoded.']},
+                         response.get_json()['errors'])
+
+    def test_rejects_unknown_formats_for_json_requests(self):
+        response = self._post('/signup', b'email=a@b.com', 'text/plain')
+        self.assertEqual({'request': 'Request must be valid JSON'},
+                         response.get_json()['errors'])
+
+    def test_requires_an_object(self):
+        response = self._post('/signup', b'{"id": 1}\n',
+                              'application/x-ndjson')
+        self.assertEqual({'request': ['The request must be an object.']},
+                         response.get_json()['errors'])
+
+    def test_streams_ndjson_records(self):
+        response = self._post('/import', b'{"id": 1}\n{"id": "x"}\n',
+                              'application/x-ndjson')
+        self.assertEqual({'1.id': ['The id must be an integer.']},
+                         response.get_json()['errors'])
+        response = self._post('/import', b'{"id": 1}\n{"id": \n',
+                              'application/x-ndjson')
+        self.assertEqual({'request': 'Request must be a valid array of records'},
+                         response.get_json()['errors'])
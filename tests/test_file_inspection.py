@@ -0,0 +1,70 @@
+import io
+import hashlib
+import tempfile
+import unittest
+
+from werkzeug.datastructures import FileStorage
+
+from flask_sieve import file_inspection
+from flask_sieve.file_inspection import file_descriptor, file_size, \
+    file_head, file_view, file_digest, file_contains
+
+
+class TestFileInspection(unittest.TestCase):
+    def setUp(self):
+        self._data = b'header' + b'x' * 200000 + b'needle' + b'y' * 100
+        self._disk = tempfile.TemporaryFile()
+        self._disk.write(self._data)
+        self._disk.seek(0)
+
+    def tearDown(self):
+        self._disk.close()
+
+    def _files(self):
+        spooled = tempfile.SpooledTemporaryFile(max_size=10)
+        spooled.write(self._data)
+        spooled.seek(0)
+        return [
+            FileStorage(stream=self._disk, filename='disk.bin'),
+            FileStorage(stream=io.BytesIO(self._data), filename='memory.bin'),
+            FileStorage(stream=spooled, filename='spooled.bin'),
+        ]
+
+    def test_uses_descriptors_of_files_on_disk(self):
+        self.assertIsNotNone(file_descriptor(self._files()[0]))
+        self.assertIsNone(file_descriptor(self._files()[1]))
+
+    def test_leaves_spooled_files_in_memory(self):
+        spooled = tempfile.SpooledTemporaryFile(max_size=1024)
+        spooled.write(b'small')
+        value = FileStorage(stream=spooled, filename='small.bin')
+        self.assertIsNone(file_descriptor(value))
+        self.assertEqual(5, file_size(value))
+        self.assertFalse(spooled._rolled)
+
+    def test_maps_files_on_disk(self):
+        with file_view(self._files()[0]) as view:
+            self.assertEqual(len(self._data), len(view))
+        with file_view(self._files()[1]) as view:
+            self.assertIsNone(view)
+
+    def test_inspects_every_kind_of_stream(self):
+        digest = hashlib.sha256(self._data).hexdigest()
+        for value in self._files():
+            self.assertEqual(len(self._data), file_size(value))
+            self.assertEqual(b'header', file_head(value, size=6))
+            self.assertEqual(digest, file_digest(value, 'sha256'))
+            self.assertTrue(file_contains(value, b'needle'))
+            self.assertFalse(file_contains(value, b'missing'))
+            self.assertEqual(0, value.stream.tell())
+
+    def test_finds_bytes_across_chunks(self):
+        chunk_size = file_inspection.chunk_size
+        file_inspection.chunk_size = 4
+        try:
+            value = FileStorage(stream=io.BytesIO(b'abcdefgh'))
+            self.assertTrue(file_contains(value, b'cdef'))
+            self.assertTrue(file_contains(value, b'defg'))
+            self.assertFalse(file_contains(value, b'hx'))
+        finally:
+            file_inspection.chunk_size = chunk_size
@@ -0,0 +1,76 @@
+import io
+import unittest
+
+from flask import Flask
+from werkzeug.datastructures import FileStorage, MultiDict
+
+from flask_sieve import Sieve, FormRequest, validate
+from flask_sieve.form_view import FormView
+
+
+class TestFormView(unittest.TestCase):
+    def setUp(self):
+        self._avatar = FileStorage(stream=io.BytesIO(b'x'), filename='a.png')
+        self._view = FormView(
+            MultiDict([('name', 'Joe'), ('tags', 'a'), ('tags', 'b'),
+                       ('avatar', 'shadowed')]),
+            MultiDict([('avatar', self._avatar)]),
+        )
+
+    def test_single_values_are_scalars(self):
+        self.assertEqual('Joe', self._view['name'])
+
+    def test_repeated_values_are_lists(self):
+        self.assertEqual(['a', 'b'], self._view['tags'])
+
+    def test_files_shadow_form_fields(self):
+        self.assertIs(self._avatar, self._view['avatar'])
+
+    def test_behaves_as_a_mapping(self):
+        self.assertIn('tags', self._view)
+        self.assertNotIn('missing', self._view)
+        self.assertRaises(KeyError, lambda: self._view['missing'])
+        self.assertEqual(3, len(self._view))
+        self.assertEqual(['avatar', 'name', 'tags'], sorted(self._view))
+        self.assertIsNone(self._view.get('missing'))
+
+    def test_array_rules_use_repeated_fields(self):
+        app = Flask(__name__)
+        Sieve(app)
+
+        class TagsRequest(FormRequest):
+            def rules(self):
+                return {'tags': ['array', 'max:2', 'distinct']}
+
+        @app.route('/', methods=('POST',))
+        @validate(TagsRequest)
+        def tags():
+            return 'ok'
+
+        client = app.test_client()
+        response = client.post('/', data={'tags': ['a', 'b']})
+        self.assertEqual(200, response.status_code)
+        response = client.post('/', data={'tags': ['a', 'a']})
+        self.assertEqual(400, response.status_code)
+        response = client.post('/', data={'tags': ['a', 'b', 'c']})
+        self.assertEqual(400, response.status_code)
+
+    def test_single_values_are_validated_as_sent(self):
+        app = Flask(__name__)
+        Sieve(app)
+
+        class TagsRequest(FormRequest):
+            def rules(self):
+                return {'tags': ['array', 'distinct', 'max:2']}
+
+        @app.route('/', methods=('POST',))
+        @validate(TagsRequest)
+        def tags():
+            return 'ok'
+
+        client = app.test_client()
+        # a single value is a string, parsed by the array rules as a literal
+        for tags, status_code in [('[1, 2]', 200), ('[1, 2, 3]', 400),
+                                  ('[1, 1]', 400), ('a', 400)]:
+            response = client.post('/', data={'tags': tags})
+            self.assertEqual(status_code, response.status_code, tags)
@@ -0,0 +1,71 @@
+import unittest
+
+from flask_sieve.hooks import Hooks
+from flask_sieve.validator import Validator
+
+
+class TestHooks(unittest.TestCase):
+    def setUp(self):
+        self._calls = []
+        self._validator = Validator(
+            rules={'email': ['required', 'email']},
+            request={'email': 'invalid_email'},
+            name='SignupRequest',
+        )
+
+    def record(self, event):
+        def hook(**kwargs):
+            self._calls.append((event, kwargs))
+        return hook
+
+    def test_fires_request_hooks(self):
+        self._validator.register_hook('before_request', self.record('before'))
+        self._validator.register_hook('after_request', self.record('after'))
+        self.assertTrue(self._validator.fails())
+        self.assertEqual(['before', 'after'],
+                         [event for event, _ in self._calls])
+        before, after = [kwargs for _, kwargs in self._calls]
+        self.assertEqual('SignupRequest', before['request'])
+        self.assertIsNone(before['elapsed'])
+        self.assertIsNone(before['result'])
+        self.assertFalse(after['result'])
+        self.assertGreaterEqual(after['elapsed'], 0)
+
+    def test_fires_rule_hooks(self):
+        self._validator.register_hook('before_rule', self.record('before'))
+        self._validator.register_hook('after_rule', self.record('after'))
+        self.assertTrue(self._validator.fails())
+        self.assertEqual(
+            [('before', 'required'), ('after', 'required'),
+             ('before', 'email'), ('after', 'email')],
+            [(event, kwargs['rule']) for event, kwargs in self._calls]
+        )
+        _, after_email = self._calls[-1]
+        self.assertEqual('email', after_email['attribute'])
+        self.assertFalse(after_email['result'])
+
+    def test_inherits_hooks(self):
+        hooks = Hooks()
+        hooks.register('after_rule', self.record('after'))
+        validator = Validator(
+            rules={'name': ['required']},
+            request={'name': 'Joe'},
+            hooks=hooks,
+        )
+        validator.register_hook('after_request', self.record('request'))
+        self.assertTrue(validator.passes())
+        self.assertEqual(['after', 'request'],
+                         [event for event, _ in self._calls])
+        self.assertEqual([], hooks.registered('after_request'))
+
+    def test_does_not_wrap_without_hooks(self):
+        def validate_odd(**_kwargs):
+            return True
+        hooks = Hooks()
+        self.assertIs(validate_odd, hooks.wrap_rule('odd', validate_odd))
+        hooks.register('before_request', self.record('before'))
+        self.assertIs(validate_odd, hooks.wrap_rule('odd', validate_odd))
+
+    def test_rejects_unknown_events(self):
+        with self.assertRaises(ValueError):
+            Hooks().register('before_everything', self.record('before'))
@@ -0,0 +1,88 @@
+import time
+import asyncio
+import unittest
+
+from flask_sieve.validator import Validator
+
+
+class TestInputGuards(unittest.TestCase):
+    def setUp(self):
+        self._calls = []
+
+    def _validator(self, rules, request):
+        validator = Validator(rules=rules, request=request)
+
+        def validate_tracked(value, **_kwargs):
+            self._calls.append(value)
+            return True
+
+        def validate_slow(**_kwargs):
+            time.sleep(0.05)
+            return True
+
+        validator.register_rule_handler(handler=validate_tracked, message=None)
+        validator.register_rule_handler(handler=validate_slow, message=None)
+        return validator
+
+    def test_rejects_long_values_before_rules_run(self):
+        validator = self._validator(
+            rules={'bio': ['tracked', 'email'], 'name': ['tracked']},
+            request={'bio': 'x' * 101, 'name': 'Joe'},
+        )
+        validator.set_max_length(100)
+        self.assertTrue(validator.fails())
+        self.assertEqual(['Joe'], self._calls)
+        self.assertDictEqual({'bio': ['The bio is too long.']},
+                             validator.messages())
+
+    def test_applies_per_field_limits(self):
+        validator = self._validator(
+            rules={'bio': ['tracked'], 'name': ['tracked']},
+            request={'bio': 'x' * 500, 'name': 'Joseph'},
+        )
+        validator.set_max_length(1000)
+        validator.set_max_lengths({'name': 5})
+        self.assertTrue(validator.fails())
+        self.assertDictEqual({'name': ['The name is too long.']},
+                             validator.messages())
+
+    def test_guards_asynchronous_validation(self):
+        validator = self._validator(rules={'bio': ['tracked']},
+                                    request={'bio': 'x' * 10})
+        validator.set_max_length(5)
+        loop = asyncio.new_event_loop()
+        try:
+            self.assertFalse(loop.run_until_complete(validator.passes_async()))
+        finally:
+            loop.close()
+        self.assertEqual([], self._calls)
+
+    def test_stops_at_the_deadline(self):
+        rules = dict(('field_%d' % i, ['slow']) for i in range(10))
+        validator = self._validator(rules=rules,
+                                    request=dict((f, 1) for f in rules))
+        validator.set_deadline(0.075)
+        start = time.time()
+        self.assertTrue(validator.fails())
+        self.assertLess(time.time() - start, 0.3)
+        messages = validator.messages()
+        self.assertEqual(1, len(messages))
+        self.assertIn('could not be validated in time', str(messages))
+
+    def test_stops_asynchronous_validation_at_the_deadline(self):
+        rules = dict(('field_%d' % i, ['slow']) for i in range(10))
+        validator = self._validator(rules=rules,
+                                    request=dict((f, 1) for f in rules))
+        validator.set_deadline(0.075)
+        start = time.time()
+        self.assertFalse(asyncio.run(validator.passes_async()))
+        self.assertLess(time.time() - start, 0.3)
+        self.assertIn('could not be validated in time',
+                      str(validator.messages()))
+
+    def test_passes_within_limits(self):
+        validator = self._validator(rules={'bio': ['tracked']},
+                                    request={'bio': 'x' * 10})
+        validator.set_max_length(10)
+        validator.set_deadline(10)
+        self.assertTrue(validator.passes())
@@ -0,0 +1,103 @@
+import time
+import asyncio
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask, current_app
+
+from flask_sieve.validator import Validator
+
+
+def validate_slow_lookup(value, **_kwargs):
+    time.sleep(0.2)
+    return value == 'ok'
+
+
+def validate_hanging_lookup(value, **_kwargs):
+    time.sleep(1)
+    return True
+
+
+def validate_app_lookup(value, **_kwargs):
+    return value == current_app.name
+
+
+class TestIoRules(unittest.TestCase):
+    def setUp(self):
+        self._executor = ThreadPoolExecutor(max_workers=5)
+        self._rules = dict(('field_%d' % i, ['required', 'slow_lookup'])
+                           for i in range(5))
+
+    def tearDown(self):
+        self._executor.shutdown(wait=True)
+
+    def _validator(self, request, io_timeout=10.0, executor=True):
+        validator = Validator(
+            rules=self._rules,
+            request=request,
+            io_executor=self._executor if executor else None,
+            io_timeout=io_timeout,
+        )
+        validator.set_custom_handlers([{
+            'handler': validate_slow_lookup,
+            'message': 'Lookup failed',
+            'io': True,
+        }, {
+            'handler': validate_hanging_lookup,
+            'message': 'Lookup timed out',
+            'io': True,
+        }, {
+            'handler': validate_app_lookup,
+            'message': 'Not this app',
+            'io': True,
+        }])
+        return validator
+
+    def test_runs_io_rules_concurrently(self):
+        request = dict((field, 'ok') for field in self._rules)
+        start = time.time()
+        self.assertTrue(self._validator(request).passes())
+        self.assertLess(time.time() - start, 0.8)
+
+    def test_joins_io_results_into_validations(self):
+        request = dict((field, 'ok') for field in self._rules)
+        request['field_3'] = 'bad'
+        validator = self._validator(request)
+        self.assertTrue(validator.fails())
+        self.assertDictEqual({'field_3': ['Lookup failed']},
+                             validator.messages())
+
+    def test_fails_io_rules_past_the_deadline(self):
+        self._rules = {'field': ['required', 'hanging_lookup']}
+        validator = self._validator({'field': 'ok'}, io_timeout=0.1)
+        start = time.time()
+        self.assertTrue(validator.fails())
+        self.assertLess(time.time() - start, 0.5)
+        self.assertDictEqual({'field': ['Lookup timed out']},
+                             validator.messages())
+
+    def test_runs_sequentially_without_executor(self):
+        self._rules = {'field': ['slow_lookup']}
+        self.assertTrue(self._validator({'field': 'ok'},
+                                        executor=False).passes())
+
+    def test_runs_io_rules_in_order_with_bail(self):
+        self._rules = {'field': ['bail', 'slow_lookup', 'hanging_lookup']}
+        validator = self._validator({'field': 'bad'}, io_timeout=0.1)
+        self.assertTrue(validator.fails())
+        self.assertDictEqual({'field': ['Lookup failed']},
+                             validator.messages())
+
+    def test_runs_io_rules_in_the_app_context(self):
+        self._rules = {'field': ['app_lookup'], 'other': ['app_lookup']}
+        app = Flask('lookup_app')
+        with app.app_context():
+            validator = self._validator({'field': 'lookup_app',
+                                         'other': 'other_app'})
+            self.assertTrue(validator.fails())
+            self.assertDictEqual({'other': ['Not this app']},
+                                 validator.messages())
+            self.assertFalse(asyncio.run(validator.passes_async()))
+            self.assertDictEqual({'other': ['Not this app']},
+                                 validator.messages())
@@ -0,0 +1,110 @@
+import io
+import json
+import unittest
+
+from flask import Flask
+
+from flask_sieve import Sieve, JsonRequest, validate
+from flask_sieve.json_stream import JsonArrayReader, iter_json_array
+
+
+class CountingStream(io.BytesIO):
+    def __init__(self, data):
+        super(CountingStream, self).__init__(data)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super(CountingStream, self).read(size)
+
+
+class TestJsonArrayReader(unittest.TestCase):
+    def test_yields_items_across_chunks(self):
+        items = [{'id': i, 'name': 'é' * i, 'score': 12345.5e3}
+                 for i in range(20)] + [123456789, True, None, [1, [2]], 'x']
+        body = json.dumps(items, indent=2).encode('utf-8')
+        for chunk_size in [1, 2, 3, 7, 1024]:
+            self.assertEqual(items, [item for _, item in iter_json_array(
+                io.BytesIO(body), chunk_size=chunk_size)])
+
+    def test_reads_empty_arrays(self):
+        self.assertEqual([], list(iter_json_array(io.BytesIO(b' [ ] '))))
+
+    def test_rejects_invalid_arrays(self):
+        for body in [b'', b'{}', b'[1,]', b'[1 2]', b'[1', b'[1] x']:
+            with self.assertRaises(ValueError):
+                list(iter_json_array(io.BytesIO(body), chunk_size=2))
+
+    def test_fails_invalid_items_without_reading_on(self):
+        stream = CountingStream(b'[x' + b' ' * 10 ** 7 + b']')
+        with self.assertRaises(ValueError):
+            list(iter_json_array(stream))
+        self.assertLess(stream.tell(), 200 * 1024)
+
+    def test_reads_large_items_in_growing_chunks(self):
+        item = {'name': 'x' * 4 * 10 ** 6, 'tags': ['a'] * 1000}
+        stream = CountingStream(json.dumps([item, 1]).encode('utf-8'))
+        self.assertEqual([item, 1], [value for _, value in iter_json_array(
+            stream, chunk_size=64 * 1024)])
+        self.assertLess(stream.reads, 20)
+
+    def test_keeps_only_the_current_item_buffered(self):
+        body = b'[' + b','.join([b'{"name": "%s"}' % (b'x' * 100,)] * 1000) \
+            + b']'
+        reader = JsonArrayReader(io.BytesIO(body), chunk_size=64)
+        largest = 0
+        for _ in reader:
+            largest = max(largest, len(reader._buffer))
+        self.assertLess(largest, 300)
+
+
+class TestStreamingJsonRequest(unittest.TestCase):
+    def setUp(self):
+        self._app = Flask(__name__)
+        Sieve(self._app)
+        accepted = self._accepted = []
+
+        class BulkRequest(JsonRequest):
+            streaming = True
+
+            def rules(self):
+                return {'name': ['required', 'string'], 'age': ['sometimes', 'integer']}
+
+            def accept(self, index, item):
+                accepted.append((index, item))
+
+        @self._app.route('/', methods=('POST',))
+        @validate(BulkRequest)
+        def bulk():
+            return 'ok'
+
+        self._client = self._app.test_client()
+
+    def test_validates_each_item(self):
+        response = self._client.post('/', json=[
+            {'name': 'Joe', 'age': 3}, {'age': 'x'}, 7, {'name': 'Ann'},
+        ])
+        self.assertEqual(400, response.status_code)
+        self.assertEqual({
+            '1.name': ['The name field is required.',
+                       'The name must be a string.'],
+            '1.age': ['The age must be an integer.'],
+            '2': ['Item must be a JSON object'],
+        }, response.get_json()['errors'])
+        self.assertEqual([(0, {'name': 'Joe', 'age': 3}),
+                          (3, {'name': 'Ann'})], self._accepted)
+
+    def test_passes_valid_arrays(self):
+        response = self._client.post('/', json=[{'name': 'Joe'}])
+        self.assertEqual(200, response.status_code)
+
+    def test_rejects_bodies_that_are_not_arrays(self):
+        response = self._client.post('/', json={'name': 'Joe'})
+        self.assertEqual({'request': 'Request must be a valid JSON array'},
+                         response.get_json()['errors'])
+
+    def test_stops_after_too_many_errors(self):
+        response = self._client.post('/', json=[{'age': 'x'}] * 1000)
+        errors = response.get_json()['errors']
+        self.assertEqual(JsonRequest.max_stream_errors + 1, len(errors))
+        self.assertIn('request', errors)
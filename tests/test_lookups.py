@@ -0,0 +1,203 @@
+import os
+import shutil
+import asyncio
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from flask_sieve.lookups import DatabaseLookup, make_lookup
+from flask_sieve.validator import Validator
+
+
+class CountingConnection:
+    def __init__(self, connection):
+        self.connection = connection
+        self.queries = []
+
+    def cursor(self):
+        cursor = self.connection.cursor()
+        queries = self.queries
+
+        class CountingCursor:
+            def execute(self, sql, params):
+                queries.append((sql, list(params)))
+                return cursor.execute(sql, params)
+
+            def fetchall(self):
+                return cursor.fetchall()
+
+            def close(self):
+                cursor.close()
+
+        return CountingCursor()
+
+
+class TestLookups(unittest.TestCase):
+    def setUp(self):
+        connection = sqlite3.connect(':memory:')
+        connection.execute('CREATE TABLE users (id INTEGER, email TEXT)')
+        connection.executemany('INSERT INTO users VALUES (?, ?)', [
+            (1, 'a@b.com'), (2, 'c@d.com'), (3, 'e@f.com'),
+        ])
+        self.connection = CountingConnection(connection)
+
+    def _validator(self, rules, request):
+        validator = Validator(rules=rules, request=request)
+        validator.set_lookup(self.connection)
+        return validator
+
+    def test_database_lookup(self):
+        lookup = DatabaseLookup(self.connection, batch_size=2)
+        self.assertEqual(
+            ['a@b.com', 'e@f.com'],
+            sorted(lookup.existing('users', 'email',
+                                   ['a@b.com', 'x@y.com', 'e@f.com']))
+        )
+        self.assertEqual(2, len(self.connection.queries))
+
+    def test_opens_a_connection_per_thread(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'users.db')
+        with sqlite3.connect(path) as connection:
+            connection.execute('CREATE TABLE users (id INTEGER)')
+            connection.executemany('INSERT INTO users VALUES (?)',
+                                   [(1,), (2,)])
+        connection.close()
+        opened = []
+
+        def connect():
+            opened.append(threading.get_ident())
+            return sqlite3.connect(path)
+
+        validator = Validator(rules={'user_id': ['exists:users,id']})
+        validator.set_lookup(DatabaseLookup(connect=connect))
+
+        def passes(user_id):
+            return validator.validate({'user_id': user_id}).passes()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(passes, ['1', '2', '3'] * 20))
+        self.assertEqual([True, True, False] * 20, results)
+        self.assertEqual(len(set(opened)), len(opened))
+        self.assertLessEqual(len(opened), 4)
+        with self.assertRaises(ValueError):
+            DatabaseLookup()
+
+    def test_rejects_invalid_identifiers(self):
+        lookup = DatabaseLookup(self.connection)
+        with self.assertRaises(ValueError):
+            lookup.existing('users; DROP TABLE users', 'email', ['a'])
+        with self.assertRaises(ValueError):
+            self._validator(
+                rules={'email': ['exists:users,email--']},
+                request={'email': 'a@b.com'},
+            ).passes()
+
+    def test_validates_exists(self):
+        validator = self._validator(
+            rules={'user_id': ['exists:users,id'], 'email': ['exists:users']},
+            request={'user_id': '2', 'email': 'a@b.com'},
+        )
+        self.assertTrue(validator.passes())
+        validator.set_request({'user_id': '9', 'email': 'a@b.com'})
+        self.assertTrue(validator.fails())
+        self.assertDictEqual({'user_id': ['The selected user id is invalid.']},
+                             validator.messages())
+
+    def test_validates_unique(self):
+        validator = self._validator(
+            rules={'email': ['unique:users,email']},
+            request={'email': 'new@b.com'},
+        )
+        self.assertTrue(validator.passes())
+        validator.set_request({'email': 'c@d.com'})
+        self.assertTrue(validator.fails())
+        self.assertDictEqual({'email': ['The email has already been taken.']},
+                             validator.messages())
+
+    def test_batches_lookups_per_table_and_column(self):
+        validator = self._validator(
+            rules={
+                'owner_id': ['exists:users,id'],
+                'member_ids': ['exists:users,id'],
+                'backup_email': ['exists:users,email'],
+                'email': ['unique:users,email'],
+            },
+            request={
+                'owner_id': 1,
+                'member_ids': [1, 2, 3],
+                'backup_email': 'a@b.com',
+                'email': 'new@b.com',
+            },
+        )
+        self.assertTrue(validator.passes())
+        self.assertEqual(2, len(self.connection.queries))
+        self.assertIn('IN (?, ?, ?)', self.connection.queries[0][0])
+
+    def test_fails_values_that_are_not_scalars_without_querying(self):
+        validator = self._validator(
+            rules={'user_id': ['required', 'integer', 'exists:users,id'],
+                   'email': ['unique:users,email']},
+            request={},
+        )
+        for value in [{'a': 1}, [{'a': 1}], [[1]]]:
+            validator.set_request({'user_id': value, 'email': [value]})
+            self.assertTrue(validator.fails())
+            self.assertEqual(['The selected user id is invalid.'],
+                             validator.messages()['user_id'][-1:])
+            self.assertIn('email', validator.messages())
+        self.assertEqual([], self.connection.queries)
+
+    def test_skips_values_over_the_size_rules(self):
+        validator = self._validator(
+            rules={'member_ids': ['array', 'max:2', 'exists:users,id'],
+                   'email': ['exists:users,email']},
+            request={'member_ids': list(range(1000)), 'email': 'a@b.com'},
+        )
+        validator.set_max_length(5)
+        self.assertTrue(validator.fails())
+        self.assertEqual([], self.connection.queries)
+        validator.set_request({'member_ids': [1, 2], 'email': 'a@b.com'})
+        self.assertTrue(validator.fails())
+        self.assertEqual(['email'], list(validator.messages()))
+        self.assertEqual([[1, 2]], [params for _, params
+                                    in self.connection.queries])
+
+    def test_validates_asynchronously_with_a_connection(self):
+        validator = self._validator(
+            rules={'user_id': ['exists:users,id'],
+                   'email': ['unique:users,email']},
+            request={'user_id': '2', 'email': 'c@d.com'},
+        )
+        self.assertFalse(asyncio.run(validator.passes_async()))
+        self.assertDictEqual({'email': ['The email has already been taken.']},
+                             validator.messages())
+        self.assertEqual(2, len(self.connection.queries))
+
+    def test_fails_without_a_lookup(self):
+        validator = Validator(rules={'id': ['exists:users']},
+                              request={'id': 1})
+        self.assertTrue(validator.fails())
+
+    def test_makes_lookups_from_callables(self):
+        calls = []
+
+        def lookup(table, column, values):
+            calls.append((table, column, sorted(values)))
+            return [value for value in values if value == 'known']
+
+        validator = Validator(
+            rules={'first': ['exists:tags,name'], 'second': ['exists:tags,name']},
+            request={'first': 'known', 'second': 'unknown'},
+        )
+        validator.set_lookup(lookup)
+        self.assertTrue(validator.fails())
+        self.assertEqual([('tags', 'name', ['known', 'unknown'])], calls)
+        self.assertDictEqual({'second': ['The selected second is invalid.']},
+                             validator.messages())
+        with self.assertRaises(ValueError):
+            make_lookup(42)
@@ -0,0 +1,77 @@
+import gc
+import threading
+import unittest
+
+from flask_sieve.metrics import Metrics
+from flask_sieve.validator import Validator
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self._metrics = Metrics()
+
+    def test_records_rules_and_requests(self):
+        self._metrics.record_rule('email', 0.5, True)
+        self._metrics.record_rule('email', 0.25, False)
+        self._metrics.record_request('SignupRequest', 1.0, False)
+        self.assertDictEqual({
+            'rules': {
+                'email': {'calls': 2, 'failures': 1, 'seconds': 0.75},
+            },
+            'requests': {
+                'SignupRequest': {'calls': 1, 'failures': 1, 'seconds': 1.0},
+            },
+        }, self._metrics.as_dict())
+
+    def test_merges_counters_across_threads(self):
+        def record():
+            for _ in range(100):
+                self._metrics.record_rule('string', 0.0, True)
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(800, self._metrics.as_dict()['rules']['string']['calls'])
+
+    def test_folds_counters_of_finished_threads(self):
+        def record():
+            self._metrics.record_rule('string', 0.5, False)
+        for _ in range(200):
+            thread = threading.Thread(target=record)
+            thread.start()
+            thread.join()
+        gc.collect()
+        self.assertLessEqual(len(self._metrics._thread_counters), 1)
+        self.assertDictEqual(
+            {'calls': 200, 'failures': 200, 'seconds': 100.0},
+            self._metrics.as_dict()['rules']['string'])
+
+    def test_resets_counters(self):
+        self._metrics.record_rule('email', 0.5, True)
+        self._metrics.reset()
+        self.assertDictEqual({'rules': {}, 'requests': {}},
+                             self._metrics.as_dict())
+
+    def test_renders_prometheus_text(self):
+        self._metrics.record_rule('email', 0.5, False)
+        self._metrics.record_request('Sign"up', 1.0, True)
+        text = self._metrics.prometheus_text()
+        self.assertIn('# TYPE sieve_rule_calls_total counter', text)
+        self.assertIn('sieve_rule_calls_total{rule="email"} 1', text)
+        self.assertIn('sieve_rule_failures_total{rule="email"} 1', text)
+        self.assertIn('sieve_rule_seconds_total{rule="email"} 0.5', text)
+        self.assertIn('sieve_request_failures_total{request="Sign\\"up"} 0',
+                      text)
+
+    def test_times_validator_rules(self):
+        validator = Validator(
+            rules={'email': ['required', 'email']},
+            request={'email': 'invalid_email'},
+            metrics=self._metrics,
+        )
+        self.assertTrue(validator.fails())
+        rules = self._metrics.as_dict()['rules']
+        self.assertEqual(1, rules['required']['calls'])
+        self.assertEqual(0, rules['required']['failures'])
+        self.assertEqual(1, rules['email']['failures'])
@@ -0,0 +1,197 @@
+import io
+import unittest
+
+from flask import Flask
+from werkzeug.datastructures import FileStorage
+
+from flask_sieve import Sieve, FormRequest, JsonRequest, validate
+from flask_sieve.validator import Validator
+from flask_sieve.payload_limits import PayloadLimits, rule_paths, \
+    body_size_bound
+
+
+class TestPayloadLimits(unittest.TestCase):
+    def test_limits_depth(self):
+        limits = PayloadLimits(max_depth=2)
+        self.assertEqual([], limits.check({'a': {'b': 1}}))
+        rejections = limits.check({'a': {'b': {'c': 1}}})
+        self.assertEqual([('request', 'payload_too_deep')],
+                         [(r['attribute'], r['rule']) for r in rejections])
+
+    def test_limits_keys_across_the_payload(self):
+        limits = PayloadLimits(max_keys=3)
+        self.assertEqual([], limits.check({'a': 1, 'b': {'c': 1}}))
+        rejections = limits.check({'a': 1, 'b': {'c': 1, 'd': 1}})
+        self.assertEqual('payload_too_many_keys', rejections[0]['rule'])
+
+    def test_limits_array_length(self):
+        limits = PayloadLimits(max_array_len=2)
+        self.assertEqual([], limits.check({'tags': [1, 2]}))
+        rejections = limits.check({'author': {'tags': [1, 2, 3]}})
+        self.assertEqual(('author.tags', 'payload_array_too_long'),
+                         (rejections[0]['attribute'], rejections[0]['rule']))
+
+    def test_rejects_keys_without_rules_in_strict_mode(self):
+        limits = PayloadLimits(strict_keys=True)
+        paths = rule_paths(['name', 'author.email', 'meta'])
+        payload = {
+            'name': 'x', 'admin': True,
+            'author': {'email': 'a@b.com', 'role': 'owner'},
+            'meta': {'anything': 'goes'},
+        }
+        rejections = limits.check(payload, paths)
+        self.assertEqual(['admin', 'author.role'],
+                         [r['attribute'] for r in rejections])
+        self.assertEqual([], PayloadLimits().check(payload, paths))
+
+
+class TestValidatorPayloadLimits(unittest.TestCase):
+    def test_rejects_before_rules_run(self):
+        calls = []
+
+        def validate_tracked(value, **_kwargs):
+            calls.append(value)
+            return True
+
+        validator = Validator(rules={'name': ['tracked']},
+                              request={'name': 'x', 'role': 'admin'})
+        validator.register_rule_handler(handler=validate_tracked, message=None)
+        validator.set_payload_limits(PayloadLimits(strict_keys=True))
+        self.assertTrue(validator.fails())
+        self.assertEqual([], calls)
+        self.assertDictEqual({'role': ['The role field is not allowed.']},
+                             validator.messages())
+
+    def test_counts_form_fields_before_copying(self):
+        app = Flask(__name__)
+        app.config['SIEVE_MAX_FILES'] = 1
+        Sieve(app)
+
+        class UploadRequest(FormRequest):
+            def rules(self):
+                return {'avatar': ['file']}
+
+        @app.route('/', methods=('POST',))
+        @validate(UploadRequest)
+        def upload():
+            return 'ok'
+
+        def files(count):
+            return [FileStorage(stream=io.BytesIO(b'avatar'),
+                                filename='avatar.png') for _ in range(count)]
+
+        client = app.test_client()
+        response = client.post('/', data={'avatar': files(1)})
+        self.assertEqual(200, response.status_code)
+        response = client.post('/', data={'avatar': files(2)})
+        self.assertEqual(400, response.status_code)
+        self.assertEqual({'request': ['The request has too many files.']},
+                         response.get_json()['errors'])
+
+    def test_configured_from_the_app(self):
+        app = Flask(__name__)
+        app.config['SIEVE_MAX_DEPTH'] = 2
+        app.config['SIEVE_STRICT_KEYS'] = True
+        Sieve(app)
+
+        class PostRequest(JsonRequest):
+            def rules(self):
+                return {'title': ['required'], 'author.name': ['required']}
+
+        @app.route('/', methods=('POST',))
+        @validate(PostRequest)
+        def post():
+            return 'ok'
+
+        client = app.test_client()
+        response = client.post('/', json={'title': 'x',
+                                          'author': {'name': 'y'}})
+        self.assertEqual(200, response.status_code)
+        response = client.post('/', json={'title': 'x', 'draft': True,
+                                          'author': {'name': 'y'}})
+        self.assertEqual({'draft': ['The draft field is not allowed.']},
+                         response.get_json()['errors'])
+        response = client.post('/', json={'title': {'a': {'b': 1}}})
+        self.assertEqual({'request': ['The request is nested too deeply.']},
+                         response.get_json()['errors'])
+
+
+class TestBodySizeBound(unittest.TestCase):
+    def _parsed(self, rules):
+        return dict((attribute, [
+            {'name': rule.split(':')[0],
+             'params': rule.split(':')[1].split(',') if ':' in rule else []}
+            for rule in attribute_rules
+        ]) for attribute, attribute_rules in rules.items())
+
+    def test_bounds_declared_fields(self):
+        bound = body_size_bound(self._parsed({
+            'name': ['required', 'string', 'max:10'],
+            'author.active': ['boolean'],
+            'kind': ['in:post,page'],
+        }), is_json=True)
+        # values, then keys: 12 bytes a character plus quotes and separators
+        self.assertEqual(2 + (122 + 54) + (62 + 78 + 78) + (50 + 54), bound)
+
+    def test_unbounded_fields_disable_the_bound(self):
+        self.assertIsNone(body_size_bound(self._parsed({
+            'name': ['string', 'max:10'], 'bio': ['string'],
+        }), is_json=True))
+        self.assertIsNone(body_size_bound(self._parsed({
+            'count': ['integer', 'max:10'],
+        }), is_json=True))
+
+    def test_bounds_files_in_kilobytes(self):
+        bound = body_size_bound(self._parsed({
+            'avatar': ['file', 'max:2'],
+        }), is_json=False)
+        self.assertEqual(2 + 3 * 1024 + 1024 + 78, bound)
+        self.assertIsNone(body_size_bound(self._parsed({
+            'avatar': ['file', 'max:2'],
+        }), is_json=True))
+
+
+class TestContentLengthRejection(unittest.TestCase):
+    def setUp(self):
+        self._app = Flask(__name__)
+        self._app.config['SIEVE_STRICT_KEYS'] = True
+        self._app.config['SIEVE_BODY_SIZE_SLACK'] = 2.0
+        Sieve(self._app)
+
+    def test_rejects_json_bodies_before_parsing(self):
+        class NameRequest(JsonRequest):
+            def rules(self):
+                return {'name': ['required', 'string', 'max:10']}
+
+        @self._app.route('/', methods=('POST',))
+        @validate(NameRequest)
+        def name():
+            return 'ok'
+
+        client = self._app.test_client()
+        response = client.post('/', json={'name': 'Joe'})
+        self.assertEqual(200, response.status_code)
+        # not even valid JSON, which parsing it would have reported
+        response = client.post('/', data='{"name": "%s' % ('x' * 5000),
+                               content_type='application/json')
+        self.assertEqual({'request': ['The request is too large.']},
+                         response.get_json()['errors'])
+
+    def test_rejects_uploads_before_parsing(self):
+        class UploadRequest(FormRequest):
+            def rules(self):
+                return {'avatar': ['file', 'max:1']}
+
+        @self._app.route('/', methods=('POST',))
+        @validate(UploadRequest)
+        def upload():
+            return 'ok'
+
+        client = self._app.test_client()
+        response = client.post('/', data={'avatar': FileStorage(
+            stream=io.BytesIO(b'x' * 512), filename='avatar.png')})
+        self.assertEqual(200, response.status_code)
+        response = client.post('/', data={'avatar': FileStorage(
+            stream=io.BytesIO(b'x' * 20000), filename='avatar.png')})
+        self.assertEqual({'request': ['The request is too large.']},
+                         response.get_json()['errors'])
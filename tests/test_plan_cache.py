@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from unittest import mock
+
+from flask import Flask
+
+import flask_sieve.plan_cache
+from flask_sieve import Sieve, JsonRequest
+from flask_sieve.plan_cache import PlanCache
+
+
+code_rules = {'code': ['required', 'regex:^(a+)+$'], 'age': ['integer']}
+
+
+class CodeRequest(JsonRequest):
+    def rules(self):
+        return code_rules
+
+
+def validate_custom(value, **_kwargs):
+    return True
+
+
+def validate_other(value, **_kwargs):
+    return True
+
+
+class TestPlanCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def _sieve(self):
+        app = Flask(__name__)
+        app.config['SIEVE_PRELOAD'] = [CodeRequest]
+        app.config['SIEVE_PLAN_CACHE_DIR'] = self.directory
+        app.config['SIEVE_REGEX_SAFETY'] = 'warn'
+        with self.assertWarns(RuntimeWarning):
+            return Sieve(app)
+
+    def test_later_boots_load_the_compiled_plans(self):
+        first = self._sieve()
+        self.assertEqual(1, len(os.listdir(self.directory)))
+        with mock.patch('flask_sieve.rules_processor.regex_risks') as risks, \
+                mock.patch('flask_sieve.parser.Parser.parsed_rules') as parse:
+            second = self._sieve()
+        self.assertFalse(risks.called)
+        self.assertFalse(parse.called)
+        for payload in [{'code': 'aaa', 'age': '1'}, {'code': 'b', 'age': 'x'}]:
+            self.assertEqual(
+                list(first.validators.values())[0].validate(payload)
+                .messages(),
+                list(second.validators.values())[0].validate(payload)
+                .messages())
+
+    def test_fingerprint_follows_rules_version_and_handlers(self):
+        handlers = {'validate_custom': {
+            'handler': validate_custom, 'params_count': 0, 'io': False,
+            'cacheable': False}}
+        rules = {'field': ['custom']}
+        fingerprint = PlanCache.fingerprint(rules, handlers)
+        self.assertEqual(fingerprint, PlanCache.fingerprint(
+            {'field': ['custom']}, dict(handlers)))
+        self.assertNotEqual(fingerprint, PlanCache.fingerprint(
+            {'field': ['custom', 'string']}, handlers))
+        self.assertNotEqual(fingerprint, PlanCache.fingerprint(rules, {
+            'validate_custom': dict(handlers['validate_custom'],
+                                    handler=validate_other)}))
+        self.assertNotEqual(fingerprint, PlanCache.fingerprint(rules, {
+            'validate_custom': dict(handlers['validate_custom'],
+                                    params_count=1)}))
+        with mock.patch.object(flask_sieve.plan_cache, '__version__', '0.0'):
+            self.assertNotEqual(fingerprint,
+                                PlanCache.fingerprint(rules, handlers))
+
+    def test_unreadable_cache_is_ignored(self):
+        cache = PlanCache(self.directory)
+        cache.store('key', {'rules': {}})
+        cache.flush()
+        for name in os.listdir(self.directory):
+            with open(os.path.join(self.directory, name), 'wb') as broken:
+                broken.write(b'not marshal data')
+        self.assertIsNone(PlanCache(self.directory).load('key'))
+        self._sieve()
+        self.assertIsNotNone(PlanCache(self.directory).load(
+            PlanCache.fingerprint(code_rules, {})))
@@ -0,0 +1,157 @@
+import gc
+import sys
+import unittest
+
+from flask import Flask
+
+from flask_sieve import Sieve, FormRequest, JsonRequest, validate
+from flask_sieve import validator as validator_module
+
+
+class PostRequest(JsonRequest):
+    def rules(self):
+        return {'title': ['required', 'string', 'max:80'],
+                'slug': ['sometimes', 'regex:^[a-z-]+$']}
+
+
+class TestPreload(unittest.TestCase):
+    def _app(self, preload):
+        app = Flask(__name__)
+        app.config['SIEVE_PRELOAD'] = preload
+        return app
+
+    def test_compiles_listed_requests_at_boot(self):
+        sieve = Sieve(self._app([PostRequest]))
+        self.assertEqual(1, len(sieve.validators))
+        validator = list(sieve.validators.values())[0]
+        self.assertIsNotNone(validator._processor._plan)
+
+    def test_discovers_requests_used_with_validate(self):
+        registered = list(validator_module.validated_requests)
+        self.addCleanup(validator_module.validated_requests.__setitem__,
+                        slice(None), registered)
+        del validator_module.validated_requests[:]
+
+        class CommentRequest(FormRequest):
+            def rules(self):
+                return {'body': ['required']}
+
+        validate(CommentRequest)
+        validate(CommentRequest)
+        sieve = Sieve(self._app(True))
+        self.assertEqual([CommentRequest],
+                         [key[0] for key in sieve.validators])
+
+    def test_raises_rule_definition_errors_at_boot(self):
+        for rules in [{'age': ['between:1']}, {'age': ['unknown_rule']},
+                      {'code': ['regex:[a-']}]:
+            class BrokenRequest(JsonRequest):
+                def rules(self):
+                    return rules
+
+            with self.assertRaises(ValueError):
+                Sieve(self._app([BrokenRequest]))
+
+    def test_checks_params_of_custom_rules(self):
+        def validate_prefixed(value, params, **_kwargs):
+            return value.startswith(params[0])
+
+        class PrefixRequest(JsonRequest):
+            def rules(self):
+                return {'code': ['prefixed']}
+
+            def custom_handlers(self):
+                return [{'handler': validate_prefixed, 'message': 'Bad',
+                         'params_count': 1}]
+
+        with self.assertRaises(ValueError):
+            Sieve(self._app([PrefixRequest]))
+
+    def test_requests_share_the_preloaded_validator(self):
+        app = self._app([PostRequest])
+        sieve = Sieve(app)
+
+        @app.route('/', methods=('POST',))
+        @validate(PostRequest)
+        def post():
+            return 'ok'
+
+        client = app.test_client()
+        self.assertEqual(200, client.post('/', json={'title': 'x'})
+                         .status_code)
+        response = client.post('/', json={'slug': 'No'})
+        self.assertEqual(400, response.status_code)
+        self.assertEqual(['title', 'slug'],
+                         sorted(response.get_json()['errors'], reverse=True))
+        self.assertEqual(1, len(sieve.validators))
+
+    def test_shares_validators_of_handlers_made_per_call(self):
+        class PerCallRequest(JsonRequest):
+            def rules(self):
+                return {'code': ['required', 'upper']}
+
+            def custom_handlers(self):
+                def validate_upper(value, **_kwargs):
+                    return value.isupper()
+                return [{'handler': validate_upper, 'message': 'Bad'}]
+
+        class ClosureRequest(PerCallRequest):
+            def custom_handlers(self):
+                suffix = 'X'
+
+                def validate_upper(value, **_kwargs):
+                    return value.isupper() and value.endswith(suffix)
+                return [{'handler': validate_upper, 'message': 'Bad'}]
+
+        app = self._app(False)
+        sieve = Sieve(app)
+        for request_class in [PerCallRequest, ClosureRequest]:
+            @app.route('/' + request_class.__name__, methods=('POST',),
+                       endpoint=request_class.__name__)
+            @validate(request_class)
+            def post():
+                return 'ok'
+
+        client = app.test_client()
+        for code, status_code in [('AX', 200), ('ax', 400), ('AB', 200)]:
+            response = client.post('/PerCallRequest', json={'code': code})
+            self.assertEqual(status_code, response.status_code)
+        for code, status_code in [('AX', 200), ('AB', 400)]:
+            response = client.post('/ClosureRequest', json={'code': code})
+            self.assertEqual(status_code, response.status_code)
+        self.assertEqual([PerCallRequest],
+                         [key[0] for key in sieve.validators])
+
+
+class TestFreeze(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SIEVE_PRELOAD'] = [PostRequest]
+        self.sieve = Sieve(self.app)
+        self.validator = list(self.sieve.validators.values())[0]
+        self.addCleanup(gc.unfreeze)
+
+    def test_finalizes_plans_into_immutable_structures(self):
+        self.sieve.freeze()
+        plan, lookup_targets = self.validator._processor._compiled_plan()
+        self.assertIsInstance(plan, tuple)
+        self.assertIsInstance(lookup_targets, tuple)
+        for attribute, rules, _, steps in plan:
+            self.assertIs(sys.intern(attribute), attribute)
+            self.assertIsInstance(rules, tuple)
+            self.assertIsInstance(steps, tuple)
+            for rule in rules:
+                self.assertIs(sys.intern(rule['name']), rule['name'])
+                self.assertIsInstance(rule['params'], tuple)
+        self.assertIsInstance(self.validator._rule_paths[0], frozenset)
+        self.assertGreater(gc.get_freeze_count(), 0)
+
+    def test_frozen_validators_give_the_same_results(self):
+        payloads = [{'title': 'x'}, {'title': 'x' * 81, 'slug': 'No'}, {}]
+        before = [self.validator.validate(payload).messages()
+                  for payload in payloads]
+        self.sieve.freeze()
+        after = [self.validator.validate(payload).messages()
+                 for payload in payloads]
+        self.assertEqual(before, after)
+        self.assertEqual({}, after[0])
@@ -0,0 +1,136 @@
+import time
+import threading
+import unittest
+import warnings
+
+from flask_sieve.validator import Validator
+from flask_sieve.regex_safety import RegexMatcher, RegexTimeout, \
+    assert_safe_regex, regex_risks
+
+
+class TestRegexRisks(unittest.TestCase):
+    def test_flags_nested_quantifiers(self):
+        for pattern in [r'(a+)+$', r'(a*)*b', r'^(\w+\s?)*$', r'(?:\d+)+x']:
+            self.assertEqual(['nested quantifiers'], regex_risks(pattern))
+
+    def test_flags_overlapping_alternation(self):
+        for pattern in [r'(foo|\w+)*', r'(\.|[^"])*"', r'(x|[a-z]y)*z',
+                        r'(a|aa)+$', r'(aa?)+$']:
+            self.assertEqual(['overlapping alternation'], regex_risks(pattern))
+
+    def test_accepts_linear_patterns(self):
+        for pattern in [r'^\d+$', r'[^@]+@[^@]+', r'^([a-z0-9]+\.)*[a-z]+$',
+                        r'(ab|cd)*', r'^(a|b)*$', r'(xa+)*', r'(.*a){3}',
+                        r'(a|ab)+$', r'(xa?)+$']:
+            self.assertEqual([], regex_risks(pattern))
+
+    def test_assert_safe_regex(self):
+        assert_safe_regex(r'^\d+$')
+        self.assertRaises(ValueError, assert_safe_regex, r'(a+)+$')
+
+
+class TestRegexSafetyMode(unittest.TestCase):
+    def test_warns_when_compiling_rules(self):
+        validator = Validator(rules={'name': ['regex:(a+)+$']},
+                              request={'name': 'aaa'})
+        validator.set_regex_safety('warn')
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.assertTrue(validator.passes())
+        self.assertEqual(1, len(caught))
+        self.assertIn('name', str(caught[0].message))
+
+    def test_warns_by_default(self):
+        validator = Validator(rules={'name': [r'regex:^(\w+\s?)*$']},
+                              request={'name': 'a b'})
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            validator.compile()
+            self.assertTrue(validator.passes())
+        self.assertEqual(1, len(caught))
+        self.assertIn('for name risks', str(caught[0].message))
+        validator = Validator(rules={'name': [r'regex:^(\w+\s?)*$']},
+                              request={'name': 'a b'})
+        validator.set_regex_safety(False)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.assertTrue(validator.passes())
+        self.assertEqual([], caught)
+
+    def test_rejects_when_compiling_rules(self):
+        validator = Validator(rules={'name': ['not_regex:(a*)*b']},
+                              request={'name': 'aaa'})
+        validator.set_regex_safety('reject')
+        self.assertRaises(ValueError, validator.passes)
+
+    def test_leaves_safe_patterns_alone(self):
+        validator = Validator(rules={'name': ['regex:^a+$']},
+                              request={'name': 'aaa'})
+        validator.set_regex_safety('reject')
+        self.assertTrue(validator.passes())
+
+    def test_rejects_unknown_modes(self):
+        validator = Validator(rules={}, request={})
+        self.assertRaises(ValueError, validator.set_regex_safety, 'ignore')
+
+
+class TestRegexMatcher(unittest.TestCase):
+    def setUp(self):
+        self._matcher = RegexMatcher(timeout=0.5)
+
+    def tearDown(self):
+        self._matcher.close()
+
+    def test_matches(self):
+        self.assertTrue(self._matcher.match(r'^\d+$', '123'))
+        self.assertFalse(self._matcher.match(r'^\d+$', 'abc'))
+
+    def test_times_out_and_recovers(self):
+        matcher = RegexMatcher(timeout=0.2)
+        try:
+            self.assertRaises(RegexTimeout, matcher.match,
+                              r'^(a+)+$', 'a' * 40 + '!')
+            self.assertTrue(matcher.match(r'^a+$', 'aaa'))
+        finally:
+            matcher.close()
+
+    def test_timeouts_do_not_hold_up_other_matches(self):
+        matcher = RegexMatcher(timeout=0.5, max_workers=2)
+        try:
+            self.assertTrue(matcher.match(r'^x', 'x'))
+            timed_out = []
+
+            def match_slowly():
+                try:
+                    matcher.match(r'(a+)+$', 'a' * 40 + '!')
+                except RegexTimeout:
+                    timed_out.append(True)
+            thread = threading.Thread(target=match_slowly)
+            thread.start()
+            time.sleep(0.05)
+            start = time.time()
+            self.assertTrue(matcher.match(r'^x', 'x'))
+            self.assertLess(time.time() - start, 0.3)
+            thread.join()
+            self.assertEqual([True], timed_out)
+        finally:
+            matcher.close()
+
+    def test_timed_out_rules_fail(self):
+        matcher = RegexMatcher(timeout=0.2)
+        try:
+            for rule in ['regex:^(a+)+$', 'not_regex:^(a+)+$']:
+                validator = Validator(rules={'name': [rule]},
+                                      request={'name': 'a' * 40 + '!'})
+                validator.set_regex_safety(None)
+                validator.set_regex_matcher(matcher)
+                self.assertTrue(validator.fails())
+        finally:
+            matcher.close()
+
+    def test_matched_rules_use_the_matcher(self):
+        validator = Validator(rules={'name': ['regex:^a+$'],
+                                     'code': ['not_regex:^a+$']},
+                              request={'name': 'aaa', 'code': 'bbb'})
+        validator.set_regex_matcher(self._matcher)
+        self.assertTrue(validator.passes())
@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import unittest
+import multiprocessing
+
+from flask_sieve.result_cache import LRUResultCache, SQLiteResultCache, \
+    result_cache_key
+from flask_sieve.validator import Validator
+
+
+def _write_from_child(path):
+    SQLiteResultCache(path).set('key', True)
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'results.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_lru_cache(self):
+        cache = LRUResultCache(max_entries=2)
+        cache.set('a', True)
+        cache.set('b', False)
+        self.assertTrue(cache.get('a'))
+        cache.set('c', True)
+        self.assertIsNone(cache.get('b'))
+        self.assertTrue(cache.get('a'))
+        self.assertTrue(cache.get('c'))
+
+    def test_lru_cache_expires(self):
+        cache = LRUResultCache(ttl=0)
+        cache.set('a', True)
+        self.assertIsNone(cache.get('a'))
+
+    def test_sqlite_cache(self):
+        cache = SQLiteResultCache(self.path)
+        self.assertIsNone(cache.get('a'))
+        cache.set('a', True)
+        cache.set('b', False)
+        self.assertTrue(cache.get('a'))
+        self.assertFalse(cache.get('b'))
+        cache.clear()
+        self.assertIsNone(cache.get('a'))
+
+    def test_sqlite_cache_expires_and_evicts(self):
+        cache = SQLiteResultCache(self.path, ttl=0)
+        cache.set('a', True)
+        self.assertIsNone(cache.get('a'))
+        cache = SQLiteResultCache(self.path, max_entries=2, evict_every=3)
+        for key in ['a', 'b', 'c']:
+            cache.set(key, True)
+        self.assertIsNone(cache.get('a'))
+        self.assertTrue(cache.get('c'))
+
+    def test_sqlite_cache_is_shared_across_processes(self):
+        process = multiprocessing.Process(target=_write_from_child,
+                                          args=(self.path,))
+        process.start()
+        process.join()
+        self.assertTrue(SQLiteResultCache(self.path).get('key'))
+
+    def test_keys_values_by_rule_params_and_type(self):
+        key = result_cache_key('lookup', 'handler', ['a'], '1')
+        self.assertEqual(key, result_cache_key('lookup', 'handler', ['a'], '1'))
+        self.assertNotEqual(key, result_cache_key('lookup', 'handler', ['a'], 1))
+        self.assertNotEqual(key, result_cache_key('lookup', 'handler', ['b'], '1'))
+        self.assertNotEqual(key, result_cache_key('other', 'handler', ['a'], '1'))
+        self.assertIsNone(result_cache_key('lookup', 'handler', [], object()))
+
+    def test_caches_cacheable_rules(self):
+        calls = []
+
+        def validate_lookup(value, **_kwargs):
+            calls.append(value)
+            return value == 'known'
+
+        validator = Validator(rules={'field': ['lookup']},
+                              request={'field': 'known'})
+        validator.register_rule_handler(handler=validate_lookup,
+                                        message='Unknown', cacheable=True)
+        validator.set_result_cache(SQLiteResultCache(self.path))
+        self.assertTrue(validator.passes())
+        self.assertTrue(validator.passes())
+        validator.set_request({'field': 'unknown'})
+        self.assertTrue(validator.fails())
+        self.assertTrue(validator.fails())
+        self.assertEqual(['known', 'unknown'], calls)
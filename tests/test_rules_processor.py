@@ -1,4 +1,5 @@
 import json
+import hashlib
 import unittest
 
 from werkzeug.datastructures import FileStorage
@@ -190,6 +191,44 @@ class TestRulesProcessor(unittest.TestCase):
         )
 
 
+    def test_validates_checksum(self):
+        with open('tests/files/image.png', 'rb') as image:
+            checksum = hashlib.sha256(image.read()).hexdigest()
+        self.assert_passes(
+            rules={'field': ['checksum:sha256,%s' % (checksum,)]},
+            request={'field': self.image_file}
+        )
+        self.assert_passes(
+            rules={'field': ['checksum:sha256,abc,%s' % (checksum.upper(),)]},
+            request={'field': self.image_file}
+        )
+        self.assert_fails(
+            rules={'field': ['checksum:sha256,abc']},
+            request={'field': self.image_file}
+        )
+        self.assert_fails(
+            rules={'field': ['checksum:sha256,%s' % (checksum,)]},
+            request={'field': 'image.png'}
+        )
+
+    def test_validates_contains_bytes(self):
+        self.assert_passes(
+            rules={'field': ['contains_bytes:PNG']},
+            request={'field': self.image_file}
+        )
+        self.assert_passes(
+            rules={'field': ['contains_bytes:0x89504e47']},
+            request={'field': self.image_file}
+        )
+        self.assert_fails(
+            rules={'field': ['contains_bytes:GIF89a']},
+            request={'field': self.image_file}
+        )
+        self.assert_fails(
+            rules={'field': ['contains_bytes:PNG']},
+            request={'field': 'PNG'}
+        )
+
     def test_validates_confirmed(self):
         self.assert_passes(
             rules={'field': ['confirmed']},
@@ -1037,6 +1076,17 @@ class TestRulesProcessor(unittest.TestCase):
             request={'field': 2}
         )
 
+    def test_file_size_rules_rewind_the_stream(self):
+        misnamed_file = FileStorage(
+            stream=self.stream,
+            filename='image.txt',
+            content_type='text/plain',
+        )
+        self.assert_passes(
+            rules={'field': ['max:1000', 'mime_types:image/png']},
+            request={'field': misnamed_file}
+        )
+
     def test_get_rule_handler(self):
         handler = self.processor._get_rule_handler('ip')
         self.assertEqual(handler.__name__, 'validate_ip')
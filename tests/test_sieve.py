@@ -2,7 +2,7 @@ import unittest
 
 from flask import Flask
 
-from flask_sieve import Sieve
+from flask_sieve import Sieve, JsonRequest, validate
 from flask_sieve.exceptions import ValidationException
 
 
@@ -35,3 +35,81 @@ class TestSieve(unittest.TestCase):
             )
         self.assertEqual(400, status)
         self.assertIn('Test error', str(response.get_json()))
+
+    def test_collects_metrics_when_enabled(self):
+        app = Flask(__name__)
+        app.config['SIEVE_METRICS'] = True
+        app.config['SIEVE_METRICS_ENDPOINT'] = '/metrics'
+        sieve = Sieve(app)
+
+        class SignupRequest(JsonRequest):
+            def rules(self):
+                return {'email': ['required', 'email']}
+
+        @app.route('/', methods=('POST',))
+        @validate(SignupRequest)
+        def signup():
+            return 'ok'
+
+        client = app.test_client()
+        client.post('/', json={'email': 'invalid'})
+        client.post('/', json={'email': 'a@b.com'})
+        metrics = sieve.metrics.as_dict()
+        self.assertEqual(2, metrics['requests']['SignupRequest']['calls'])
+        self.assertEqual(1, metrics['requests']['SignupRequest']['failures'])
+        self.assertEqual(2, metrics['rules']['email']['calls'])
+
+        response = client.get('/metrics')
+        self.assertEqual(200, response.status_code)
+        self.assertIn('sieve_rule_calls_total{rule="email"} 2',
+                      response.get_data(as_text=True))
+        response = client.get('/metrics',
+                              environ_base={'REMOTE_ADDR': '10.0.0.1'})
+        self.assertEqual(404, response.status_code)
+
+    def test_metrics_are_disabled_by_default(self):
+        app = Flask(__name__)
+        sieve = Sieve(app)
+        self.assertIsNone(sieve.metrics)
+        self.assertIs(sieve, app.extensions['sieve'])
+
+    def test_registers_hooks_for_requests(self):
+        app = Flask(__name__)
+        sieve = Sieve(app)
+        calls = []
+        sieve.register_hook('after_request',
+                            lambda **kwargs: calls.append(kwargs))
+
+        class SignupRequest(JsonRequest):
+            def rules(self):
+                return {'email': ['required', 'email']}
+
+        @app.route('/', methods=('POST',))
+        @validate(SignupRequest)
+        def signup():
+            return 'ok'
+
+        app.test_client().post('/', json={'email': 'a@b.com'})
+        self.assertEqual(1, len(calls))
+        self.assertEqual('SignupRequest', calls[0]['request'])
+        self.assertTrue(calls[0]['result'])
+
+    def test_logs_slow_validations(self):
+        app = Flask(__name__)
+        app.config['SIEVE_SLOW_VALIDATION_MS'] = 0
+        Sieve(app)
+
+        class SignupRequest(JsonRequest):
+            def rules(self):
+                return {'email': ['required', 'email']}
+
+        @app.route('/', methods=('POST',))
+        @validate(SignupRequest)
+        def signup():
+            return 'ok'
+
+        with self.assertLogs(app.logger, level='WARNING') as logs:
+            app.test_client().post('/', json={'email': 'a@b.com'})
+        self.assertIn('Slow validation: SignupRequest', logs.output[0])
+        self.assertIn('email=', logs.output[0])
+        self.assertIn('email: str(7)', logs.output[0])
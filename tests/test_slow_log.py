@@ -0,0 +1,69 @@
+import logging
+import unittest
+
+from flask_sieve.slow_log import shape_fingerprint, log_slow_validation
+
+
+class TestSlowLog(unittest.TestCase):
+    def test_fingerprints_payload_shape(self):
+        payload = {
+            'email': 'secret@example.com',
+            'age': 42,
+            'tags': ['a', 'bcd'],
+            'profile': {'bio': None, 'links': [{'url': 'x'}, {'url': 'yz'}]},
+        }
+        self.assertDictEqual({
+            '.': 'dict(4)',
+            'age': 'int',
+            'email': 'str(18)',
+            'profile': 'dict(2)',
+            'profile.bio': 'NoneType',
+            'profile.links': 'list(2)',
+            'profile.links.*': 'dict(1)',
+            'profile.links.*.url': 'str(1..2)',
+            'tags': 'list(2)',
+            'tags.*': 'str(1..3)',
+        }, shape_fingerprint(payload))
+
+    def test_fingerprint_has_no_values(self):
+        fingerprint = shape_fingerprint({'password': 'hunter2', 'pin': 1234})
+        self.assertNotIn('hunter2', str(fingerprint))
+        self.assertNotIn('1234', str(fingerprint))
+
+    def test_merges_mixed_types(self):
+        self.assertEqual('int|str(2)',
+                         shape_fingerprint({'ids': [1, '22']})['ids.*'])
+
+    def test_bounds_deep_and_wide_payloads(self):
+        deep = {}
+        node = deep
+        for _ in range(900):
+            node['key'] = {}
+            node = node['key']
+        wide = dict(('key%d' % (index,) + 'x' * 100, index)
+                    for index in range(10000))
+        for payload in [deep, wide, {'deep': deep, 'wide': wide},
+                        [[[[[[[[[[[1]]]]]]]]]]]]:
+            logger = logging.getLogger('flask_sieve.tests')
+            with self.assertLogs(logger, level='WARNING') as logs:
+                log_slow_validation(logger=logger, request='DeepRequest',
+                                    elapsed=1.0, attribute_timings={},
+                                    payload=payload)
+            self.assertLess(len(logs.output[0]), 4000)
+            self.assertIn('…: +', logs.output[0])
+
+    def test_logs_slow_validation(self):
+        logger = logging.getLogger('flask_sieve.tests')
+        with self.assertLogs(logger, level='WARNING') as logs:
+            log_slow_validation(
+                logger=logger,
+                request='SignupRequest',
+                elapsed=0.25,
+                attribute_timings={'email': 0.05, 'tags': 0.2},
+                payload={'email': 'a@b.com', 'tags': '[1, 2]'},
+            )
+        output = logs.output[0]
+        self.assertIn('SignupRequest took 250.0ms', output)
+        self.assertIn('tags=200.0ms, email=50.0ms', output)
+        self.assertIn('email: str(7)', output)
+        self.assertNotIn('a@b.com', output)
@@ -0,0 +1,104 @@
+import io
+import unittest
+
+from flask import Flask, request
+from werkzeug.datastructures import FileStorage
+
+from flask_sieve import Sieve, FormRequest, validate
+from flask_sieve.streaming import StreamingRequest, StreamingRequestMixin
+from flask_sieve.exceptions import ValidationException
+
+
+png_header = b'\x89PNG\r\n\x1a\n' + b'\x00' * 600
+
+
+class CountingStream(io.BytesIO):
+    def __init__(self, data):
+        super(CountingStream, self).__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = super(CountingStream, self).read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+class TestStreamingUploads(unittest.TestCase):
+    def setUp(self):
+        self._app = Flask(__name__)
+        self._app.config['SIEVE_STREAMING_UPLOADS'] = True
+        Sieve(self._app)
+
+        class UploadRequest(FormRequest):
+            def rules(self):
+                return {
+                    'avatar': ['file', 'max:2', 'mime_types:image/png'],
+                    'name': ['required'],
+                }
+
+        @self._app.route('/', methods=('POST',))
+        @validate(UploadRequest)
+        def upload():
+            return 'ok'
+
+        self._client = self._app.test_client()
+
+    def _post(self, data, filename='avatar.png', content_type='image/png'):
+        return self._client.post('/', data={
+            'name': 'Joe',
+            'avatar': FileStorage(stream=io.BytesIO(data), filename=filename,
+                                  content_type=content_type),
+        })
+
+    def test_installs_a_streaming_request_class(self):
+        self.assertTrue(
+            issubclass(self._app.request_class, StreamingRequestMixin))
+
+    def test_accepts_valid_uploads(self):
+        self.assertEqual(200, self._post(png_header).status_code)
+
+    def test_aborts_oversized_uploads(self):
+        response = self._post(png_header + b'\x00' * 10 ** 6)
+        self.assertEqual(400, response.status_code)
+        self.assertEqual(
+            {'avatar': ['The avatar may not be greater than 2 kilobytes.']},
+            response.get_json()['errors'])
+
+    def test_aborts_on_sniffed_mime_type(self):
+        response = self._post(b'GIF89a' + b'\x00' * 600)
+        self.assertEqual(
+            {'avatar': ['The avatar must be a file of type: image/png.']},
+            response.get_json()['errors'])
+
+    def test_stops_reading_the_body(self):
+        app = Flask(__name__)
+        app.request_class = StreamingRequest
+        body = (b'--x\r\nContent-Disposition: form-data; name="avatar"; '
+                b'filename="a.png"\r\nContent-Type: image/png\r\n\r\n'
+                + png_header + b'\x00' * 10 ** 6 + b'\r\n--x--\r\n')
+        stream = CountingStream(body)
+        with app.test_request_context(
+                '/', method='POST', input_stream=stream,
+                content_type='multipart/form-data; boundary=x',
+                content_length=len(body)):
+            request.set_upload_rules({'avatar': ['max:2']})
+            with self.assertRaises(ValidationException):
+                request.files
+        self.assertLess(stream.bytes_read, 200 * 1024)
+
+    def test_guards_every_file_of_a_field(self):
+        app = Flask(__name__)
+        app.request_class = StreamingRequest
+        part = (b'--x\r\nContent-Disposition: form-data; name="avatar"; '
+                b'filename="a.png"\r\nContent-Type: image/png\r\n\r\n')
+        body = (part + b'\x00' * 10 + b'\r\n' + part + png_header
+                + b'\x00' * 3 * 10 ** 6 + b'\r\n--x--\r\n')
+        stream = CountingStream(body)
+        with app.test_request_context(
+                '/', method='POST', input_stream=stream,
+                content_type='multipart/form-data; boundary=x',
+                content_length=len(body)):
+            request.set_upload_rules({'avatar': ['max:2']})
+            with self.assertRaises(ValidationException):
+                request.files
+        self.assertLess(stream.bytes_read, 200 * 1024)
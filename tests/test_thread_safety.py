@@ -0,0 +1,161 @@
+import sys
+import time
+import asyncio
+import threading
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from flask_sieve.validator import Validator
+
+
+def validate_yielding(value, **_kwargs):
+    # give other threads a chance to run between rules
+    time.sleep(0)
+    return True
+
+
+async def validate_awaiting(value, **_kwargs):
+    await asyncio.sleep(0)
+    return value != 'bad'
+
+
+def validate_remote(value, **_kwargs):
+    time.sleep(0.001)
+    return value != 'bad'
+
+
+def payload(index):
+    # every other call carries its own invalid fields
+    if index % 2:
+        return {'name': 'user-%d' % index, 'email': 'not an email',
+                'age': str(index)}
+    return {'name': 'user-%d' % index, 'email': 'user%d@b.com' % index,
+            'age': str(index), 'nickname': 'n'}
+
+
+def expected_messages(index):
+    if index % 2:
+        return {
+            'email': ['The email must be a valid email address.'],
+            'nickname': ['The nickname field is required when age is '
+                         'present.', 'The nickname must be a string.'],
+        }
+    return {}
+
+
+class TestThreadSafety(unittest.TestCase):
+    def setUp(self):
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.validator = Validator(rules={
+            'name': ['required', 'string', 'yielding'],
+            'email': ['required', 'email', 'yielding'],
+            'age': ['required', 'integer'],
+            'nickname': ['required_with:age', 'string'],
+        })
+        self.validator.register_rule_handler(
+            handler=validate_yielding, message='Never fails')
+
+    def tearDown(self):
+        sys.setswitchinterval(self._switch_interval)
+
+    def test_shares_one_validator_between_threads(self):
+        start = threading.Barrier(8)
+
+        def validate(worker):
+            start.wait()
+            results = []
+            for call in range(50):
+                index = worker * 50 + call
+                result = self.validator.validate(payload(index))
+                results.append((index, result.passes(), result.messages(),
+                                result.payload()))
+            return results
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(validate, range(8)))
+        for worker_results in results:
+            for index, passes, messages, request in worker_results:
+                self.assertEqual(not index % 2, passes)
+                self.assertEqual(expected_messages(index), messages)
+                self.assertEqual(payload(index), request)
+
+    def test_compiles_rules_once_under_concurrent_first_calls(self):
+        compilations = []
+        processor = self.validator._processor
+        compile_plan = processor._compile_plan
+
+        def counting_compile_plan():
+            compilations.append(1)
+            time.sleep(0.01)
+            return compile_plan()
+        processor._compile_plan = counting_compile_plan
+        start = threading.Barrier(8)
+
+        def validate(index):
+            start.wait()
+            return self.validator.validate(payload(index)).passes()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            passes = list(executor.map(validate, range(8)))
+        self.assertEqual([not index % 2 for index in range(8)], passes)
+        self.assertEqual(1, len(compilations))
+
+    def test_interleaved_coroutines_keep_their_own_results(self):
+        validator = Validator(rules={
+            'name': ['required', 'awaiting'],
+            'code': ['required_with:name', 'awaiting'],
+        })
+        validator.register_rule_handler(handler=validate_awaiting,
+                                        message='Bad value')
+        requests = [{'name': 'bad' if index % 3 == 0 else 'ok',
+                     'code': 'ok'} for index in range(60)]
+
+        async def validate_all():
+            return await asyncio.gather(*[
+                validator.validate_async(request) for request in requests])
+
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(validate_all())
+        finally:
+            loop.close()
+        for index, result in enumerate(results):
+            if index % 3 == 0:
+                self.assertEqual({'name': ['Bad value']}, result.messages())
+            else:
+                self.assertTrue(result.passes())
+                self.assertEqual({}, result.messages())
+
+    def test_io_rules_read_the_request_of_their_own_call(self):
+        with ThreadPoolExecutor(max_workers=4) as io_executor:
+            validator = Validator(rules={
+                'name': ['remote'],
+                'code': ['required_if:name,bad', 'remote'],
+            }, io_executor=io_executor)
+            validator.register_rule_handler(handler=validate_remote,
+                                            message='Bad value', io=True)
+
+            def validate(index):
+                name = 'bad' if index % 2 else 'ok'
+                return index, validator.validate({'name': name})
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(validate, range(40)))
+        for index, result in results:
+            if index % 2:
+                self.assertEqual({
+                    'name': ['Bad value'],
+                    'code': ['The code field is required when name is bad.'],
+                }, result.messages())
+            else:
+                self.assertEqual({}, result.messages())
+
+    def test_legacy_calls_still_report_the_last_request(self):
+        self.validator.set_request(payload(1))
+        self.assertTrue(self.validator.fails())
+        self.assertEqual(expected_messages(1), self.validator.messages())
+        self.validator.set_request(payload(2))
+        self.assertTrue(self.validator.passes())
+        self.assertEqual({}, self.validator.messages())
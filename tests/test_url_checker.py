@@ -0,0 +1,94 @@
+import time
+import threading
+import unittest
+
+try:
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer as ThreadingHTTPServer
+
+from flask_sieve.url_checker import UrlChecker
+from flask_sieve.validator import Validator
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_OPTIONS(self):
+        self.server.calls += 1
+        time.sleep(self.server.delay)
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *_args):
+        pass
+
+
+class TestUrlChecker(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.server.calls = 0
+        self.server.delay = 0
+        self.url = 'http://127.0.0.1:%d' % self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.checker = UrlChecker(timeout=1.0, ttl=60.0)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_checks_active_urls(self):
+        self.assertTrue(self.checker.is_active(self.url + '/path'))
+        self.assertFalse(self.checker.is_active('not a url'))
+
+    def test_caches_results_per_host(self):
+        self.assertTrue(self.checker.is_active(self.url + '/a'))
+        self.assertTrue(self.checker.is_active(self.url + '/b'))
+        self.assertEqual(1, self.server.calls)
+        self.checker.clear()
+        self.assertTrue(self.checker.is_active(self.url + '/a'))
+        self.assertEqual(2, self.server.calls)
+
+    def test_caches_negative_results(self):
+        self.server.delay = 0.5
+        checker = UrlChecker(timeout=0.1, ttl=60.0)
+        self.assertFalse(checker.is_active(self.url))
+        self.server.delay = 0
+        self.assertFalse(checker.is_active(self.url))
+        self.assertEqual(1, self.server.calls)
+
+    def test_expires_results(self):
+        checker = UrlChecker(timeout=1.0, ttl=0)
+        self.assertTrue(checker.is_active(self.url))
+        self.assertTrue(checker.is_active(self.url))
+        self.assertEqual(2, self.server.calls)
+
+    def test_times_out_slow_hosts(self):
+        self.server.delay = 0.5
+        checker = UrlChecker(timeout=0.1)
+        start = time.time()
+        self.assertFalse(checker.is_active(self.url))
+        self.assertLess(time.time() - start, 0.45)
+
+    def test_coalesces_concurrent_checks(self):
+        self.server.delay = 0.2
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(
+                self.checker.is_active(self.url + '/concurrent')))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([True] * 8, results)
+        self.assertEqual(1, self.server.calls)
+
+    def test_validator_uses_url_checker(self):
+        validator = Validator(rules={'field': ['active_url']},
+                              request={'field': self.url})
+        validator.set_url_checker(self.checker)
+        self.assertTrue(validator.passes())
+        validator.set_request({'field': 'http://'})
+        self.assertTrue(validator.fails())